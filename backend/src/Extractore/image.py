@@ -1,5 +1,7 @@
 import io
 import os
+import logging
+import threading
 from PIL import Image
 import requests
   
@@ -30,8 +32,14 @@ class ImageChartDataExtractor():
     Returns:
         None
     """
+    PROMPT = "Generate underlying data table of the table/chart/figure below:"
+
     # Define the constructor
-    def __init__(self, model_name="google/pix2struct-base") -> None:
+    def __init__(self, model_name="google/pix2struct-base", num_threads: int = None) -> None:
+        # Limit intra-op threads on CPU so parallel extraction workers do not oversubscribe cores
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.model_name = model_name
         # Initialize the Pix2StructProcessor and Pix2StructForConditionalGeneration
         self.processor = Pix2StructProcessor.from_pretrained(model_name)
         self.model = Pix2StructForConditionalGeneration.from_pretrained(model_name)
@@ -39,6 +47,8 @@ class ImageChartDataExtractor():
         self.device = "cuda:0" if torch.cuda.is_available() else "cpu"
         # Move the model to the selected device
         self.model.to(self.device)
+        self.model.eval()
+        self.logger = logging.getLogger("uvicorn")
         
     # Define the method to extract table from image
     def extract_chart_data_from_image(self, img) -> str:
@@ -51,12 +61,57 @@ class ImageChartDataExtractor():
         Returns:
             str: The decoded data table extracted from the image.
         """
-        # Preprocess the image and generate the underlying data table
-        inputs = self.processor(images=img, text="Generate underlying data table of the table/chart/figure below:", return_tensors="pt").to(self.device)
+        return self.extract_chart_data_from_images([img], batch_size=1)[0]
+
+    def extract_chart_data_from_images(self, imgs, batch_size: int = 8) -> list:
+        """
+        Extracts the underlying data tables from several images, batch_size images per forward pass.
+
+        Parameters:
+            imgs (List[PIL.Image.Image]): The images from which to extract the tables.
+            batch_size (int): Number of images generated together.
+
+        Returns:
+            List[str]: One decoded data table per image, "" when an image could not be processed.
+        """
+        results = []
+        for i in range(0, len(imgs), batch_size):
+            batch = [ img.convert("RGB") for img in imgs[i:i+batch_size] ]
+            try:
+                results.extend(self.generate_batch(batch))
+            except Exception as e:
+                if len(batch) == 1:
+                    self.logger.error(f"Chart extraction failed for one image: {e}")
+                    results.append("")
+                    continue
+                # retry one by one so a single bad image does not drop the whole batch
+                self.logger.warning(f"Chart extraction batch failed, retrying per image: {e}")
+                results.extend(self.extract_chart_data_from_images(batch, batch_size=1))
+        return results
+
+    def generate_batch(self, imgs) -> list:
+        # Preprocess the images and generate the underlying data tables
+        inputs = self.processor(images=imgs, text=[self.PROMPT] * len(imgs), return_tensors="pt").to(self.device)
         # Generate predictions using the model
-        predictions = self.model.generate(**inputs, max_new_tokens=512)
+        with torch.inference_mode():
+            predictions = self.model.generate(**inputs, max_new_tokens=512)
         # Decode the predictions and remove special tokens
-        return self.processor.decode(predictions[0], skip_special_tokens=True)
+        return self.processor.batch_decode(predictions, skip_special_tokens=True)
+
+
+_chart_data_extractors = {}
+_chart_data_extractors_lock = threading.Lock()
+
+def get_chart_data_extractor(model_name="google/pix2struct-base", num_threads: int = None) -> ImageChartDataExtractor:
+    """Return the process-wide ImageChartDataExtractor, loading the weights on first use only."""
+    extractor = _chart_data_extractors.get(model_name)
+    if extractor is not None:
+        return extractor
+
+    with _chart_data_extractors_lock:
+        if model_name not in _chart_data_extractors:
+            _chart_data_extractors[model_name] = ImageChartDataExtractor(model_name=model_name, num_threads=num_threads)
+        return _chart_data_extractors[model_name]
         
         
 from transformers import AutoImageProcessor, TableTransformerModel
@@ -0,0 +1,134 @@
+import os
+import hashlib
+import logging
+import tempfile
+import time
+
+class ImageTextCache():
+    """
+    Disk cache of text extracted from images (chart data or OCR).
+
+    Entries are keyed by the sha256 of the image bytes plus the model name and the
+    extraction mode, so the same logo or diagram is only run through the model once.
+    Files are written atomically, which keeps the cache safe to share between the
+    processes of the extraction pool. When the cache grows above max_size_mb the
+    least recently used entries (oldest mtime, refreshed on every hit) are removed,
+    at most once every evict_interval seconds across all the processes sharing it.
+    """
+
+    ENTRY_SUFFIX = ".txt"
+    TMP_SUFFIX = ".tmp"
+    # a write in progress never takes this long, older temp files are left by a crash
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, cache_dir: str, max_size_mb: int = 512, evict_interval: int = 300) -> None:
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.evict_interval = evict_interval
+        # its mtime is the time of the last eviction pass
+        self.evict_marker_path = os.path.join(cache_dir, ".last_evict")
+        self.logger = logging.getLogger("uvicorn")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(blob: bytes, model_name: str, mode: str) -> str:
+        blob_hash = hashlib.sha256(blob).hexdigest()
+        return hashlib.sha256(f"{mode}:{model_name}:{blob_hash}".encode()).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self.ENTRY_SUFFIX}")
+
+    def get(self, key: str):
+        path = self.get_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"Image cache read failed for {key}: {e}")
+            return None
+
+        try:
+            # refresh the mtime so eviction keeps frequently reused images
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def set(self, key: str, text: str):
+        path = self.get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=self.TMP_SUFFIX)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Image cache write failed for {key}: {e}")
+
+    def claim_eviction(self, now: float) -> bool:
+        """True when no eviction pass ran in the last evict_interval seconds; claims the next one."""
+        try:
+            if now - os.stat(self.evict_marker_path).st_mtime < self.evict_interval:
+                return False
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+
+        try:
+            with open(self.evict_marker_path, "a"):
+                pass
+            os.utime(self.evict_marker_path, (now, now))
+        except OSError as e:
+            self.logger.warning(f"Image cache eviction marker update failed: {e}")
+        return True
+
+    def evict(self, force: bool = False):
+        """
+        Remove the oldest entries until the cache is back under 90% of its size limit.
+        Does nothing when the last pass is younger than evict_interval, unless forced.
+        """
+        now = time.time()
+        if not self.claim_eviction(now) and not force:
+            return 0
+
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(self.TMP_SUFFIX):
+                    # another process may still be writing it
+                    try:
+                        if now - os.stat(path).st_mtime > self.STALE_TMP_SECONDS:
+                            os.remove(path)
+                    except OSError:
+                        pass
+                    continue
+                if not name.endswith(self.ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return 0
+
+        target_size = int(self.max_size_bytes * 0.9)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+
+        return removed
@@ -0,0 +1,40 @@
+import fitz
+from langchain_core.documents import Document
+
+class PDFPageStreamer():
+    """
+    PDF loader built directly on PyMuPDF that yields one page at a time.
+
+    Only the current page is held in memory, and MuPDF's object store is shrunk every
+    store_shrink_interval pages, so memory stays flat whatever the document length.
+    Pages carry the same metadata keys as langchain's PyMuPDFLoader.
+    """
+
+    def __init__(self, file_path: str, store_shrink_interval: int = 50) -> None:
+        self.file_path = file_path
+        self.store_shrink_interval = store_shrink_interval
+
+    def lazy_load(self):
+        with fitz.open(self.file_path) as pdf:
+            base_metadata = {
+                "source": self.file_path,
+                "file_path": self.file_path,
+                "total_pages": pdf.page_count,
+                "format": pdf.metadata.get("format") if pdf.metadata else None,
+            }
+
+            for page_number in range(pdf.page_count):
+                page = pdf.load_page(page_number)
+                text = page.get_text()
+                del page
+
+                yield Document(
+                    page_content=text,
+                    metadata={**base_metadata, "page": page_number},
+                )
+
+                if (page_number + 1) % self.store_shrink_interval == 0:
+                    fitz.TOOLS.store_shrink(100)
+
+    def load(self):
+        return list(self.lazy_load())
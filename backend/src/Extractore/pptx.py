@@ -3,6 +3,7 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 
 import io
 import os
+import logging
 import shutil
 import pandas as pd
 import numpy as np
@@ -18,7 +19,8 @@ from typing import List
 from .common_functions import *
 
 # from ..utils.common_functions import *
-from .image import extract_text_from_ocr, ImageChartDataExtractor
+from .image import extract_text_from_ocr, get_chart_data_extractor
+from .image_cache import ImageTextCache
 class Entity:
     """
     Represents an entity with chart type, text, position, and size.
@@ -68,7 +70,17 @@ class Slide:
         
         
 class PPTExtractor():
-    def __init__(self, file_path, extraction_method: str = "slide", ocr_engine: str = "tesseract",extract_from_image: bool = True,chart_from_image : bool = True) -> None:
+
+    ENTITY_LABELS = {
+        "text": "Slide Text",
+        "table": "Slide Table",
+        "chart": "Slide Chart",
+        "image": "Slide OCR",
+    }
+
+    def __init__(self, file_path, extraction_method: str = "slide", ocr_engine: str = "tesseract",extract_from_image: bool = True,chart_from_image : bool = True,
+                 image_model_name: str = "google/pix2struct-base", image_batch_size: int = 8, image_num_threads: int = None,
+                 image_cache: ImageTextCache = None) -> None:
         """
         Initializes a PPTExtractor object.
 
@@ -76,6 +88,10 @@ class PPTExtractor():
         - file_path (str): The path to the PPT file.
         - extraction_method (str, optional): The method to extract content from slides. Defaults to "slide".
         - ocr_engine (str, optional): The OCR engine to use for image text extraction. Defaults to "tesseract".
+        - image_model_name (str, optional): Pix2Struct model used for chart images. Defaults to "google/pix2struct-base".
+        - image_batch_size (int, optional): Number of pictures per Pix2Struct forward pass. Defaults to 8.
+        - image_num_threads (int, optional): torch CPU threads for the image model. Defaults to torch's choice.
+        - image_cache (ImageTextCache, optional): cache of text already extracted from images. Defaults to None.
         """
         self.file_path = file_path
         self.extraction_method = extraction_method
@@ -83,11 +99,19 @@ class PPTExtractor():
         self.slides = []
         self.extract_from_image = extract_from_image
         self.chart_from_image = chart_from_image
+        self.image_model_name = image_model_name
+        self.image_batch_size = image_batch_size
+        self.image_num_threads = image_num_threads
+        self.image_cache = image_cache
+        self.logger = logging.getLogger("uvicorn")
 
     def extract(self,maintain_order : bool = False):
         """
         Extracts content from the PPT file.
 
+        Pictures are collected while walking the slides and sent to the image model
+        in batches afterwards; slide texts are assembled once every picture has text.
+
         Raises:
         - Exception: If the PPT file is not found.
         """
@@ -105,42 +129,33 @@ class PPTExtractor():
         self.slide_height = presentation.slide_height
         self.slide_width = presentation.slide_width
         self.entities = []
-        self.deplot = ImageChartDataExtractor()
-        
+
+        # pass 1: walk the shapes, picture entities are left without text
+        parsed_slides = []
+        pending_images = []
         for slide_number, slide in enumerate(presentation.slides):
             try:
                 slide_number += 1
                 entities = []
-                slide_wise_text = ''
-                slide_wise_table = ''
-                slide_wise_chart = ''
-                slide_wise_ocr = ''
+                slide_images = []
 
                 slide_title = ""
                 try:
                     slide_title += slide.shapes.title.text
                 except:
                     pass
-                
-                
-                slide_text = "Slide Number : "+str(slide_number)
-                slide_text += "\nSlide Title : "+str(slide_title)
-                
-                # Extract text from shapes
+
                 for shape in slide.shapes:
+                    # Extract text from shapes
                     if shape.has_text_frame:
                         for paragraph in shape.text_frame.paragraphs:
                             for run in paragraph.runs:
-                                slide_wise_text += run.text
-                                slide_text += "\nSlide Text : "+run.text
                                 entities.append(Entity("text", run.text, shape.left, shape.top, shape.width, shape.height))
                     
                     # Extract table from shapes
                     if shape.has_table:
                         table = shape.table
                         table_str = convert_pptx_table_to_prettytable(table)
-                        slide_wise_table += " \n " + table_str + " \n "
-                        slide_text += "\nSlide Table : "+table_str
                         entities.append(Entity("table", table_str, shape.left, shape.top, shape.width, shape.height))
                     
                     # Extract chart from shapes
@@ -153,24 +168,114 @@ class PPTExtractor():
                             chart_text += "Chart Title : " + chart.chart_title.text_frame.text
                         chart_text += "\nChart Type : " + str(chart.chart_type) + "\n"
                         chart_text += chart_str
-                        slide_wise_chart += " \n " + chart_text + " \n "
-                        slide_text += "\nSlide Chart : "+chart_text
                         entities.append(Entity("chart", chart_text, shape.left, shape.top, shape.width, shape.height))
                     
-                    # Extract OCR text from images
+                    # Collect images, their text is extracted in batches below
                     if shape.shape_type == MSO_SHAPE_TYPE.PICTURE and self.extract_from_image:
-                        if self.chart_from_image:
-                            text = self.deplot.extract_chart_data_from_image(Image.open(io.BytesIO(shape.image.blob))) 
-                            # text = self.deplot.extract_chart_data_from_image(io.BytesIO(shape.image.blob)) 
-                        else:
-                            text = extract_text_from_ocr(Image.open(io.BytesIO(shape.image.blob)))
-                            # text = extract_text_from_ocr(io.BytesIO(shape.image.blob))
-                        slide_wise_ocr += text + " \n "
-                        slide_text += "\nSlide OCR : "+text
-                        entities.append(Entity("image", text, shape.left, shape.top, shape.width, shape.height))
-
-                if not maintain_order:
-                    slide_text = f"""
+                        entity = Entity("image", None, shape.left, shape.top, shape.width, shape.height)
+                        entities.append(entity)
+                        slide_images.append((entity, shape.image.blob))
+
+                pending_images.extend(slide_images)
+                parsed_slides.append((slide_number, slide_title, entities))
+            except Exception as e:
+                self.logger.warning(f"Ignoring slide {slide_number}: {e}")
+
+        # pass 2: one model call per batch of pictures instead of one per picture
+        self.extract_images_text(pending_images)
+
+        # pass 3: assemble the slide texts
+        for slide_number, slide_title, entities in parsed_slides:
+            try:
+                slide_text = self.build_slide_text(slide_number, slide_title, entities, maintain_order)
+                self.logger.debug(f"Slide {slide_number}: {slide_text}")
+                self.slides.append(Slide(slide_number, slide_title, slide_text, entities))
+            except Exception as e:
+                self.logger.warning(f"Ignoring slide {slide_number}: {e}")
+
+    def extract_images_text(self, pending_images):
+        """
+        Fills the text of the collected picture entities.
+
+        Identical pictures are only processed once, and results found in the
+        image cache (when one is configured) skip the model entirely.
+
+        Args:
+        - pending_images (List[Tuple[Entity, bytes]]): picture entities with their image blobs.
+        """
+        if not pending_images:
+            return
+
+        if self.chart_from_image:
+            model_name, mode = self.image_model_name, "chart"
+        else:
+            model_name, mode = self.ocr_engine, "ocr"
+
+        # group entities by image content, a logo repeated on every slide is one entry
+        entities_by_key = {}
+        blobs_by_key = {}
+        for entity, blob in pending_images:
+            key = ImageTextCache.make_key(blob, model_name=model_name, mode=mode)
+            entities_by_key.setdefault(key, []).append(entity)
+            blobs_by_key[key] = blob
+
+        texts_by_key = {}
+        if self.image_cache is not None:
+            for key in blobs_by_key:
+                cached_text = self.image_cache.get(key)
+                if cached_text is not None:
+                    texts_by_key[key] = cached_text
+
+        missing_keys = [ key for key in blobs_by_key if key not in texts_by_key ]
+
+        if missing_keys and self.chart_from_image:
+            deplot = get_chart_data_extractor(model_name=self.image_model_name, num_threads=self.image_num_threads)
+            for i in range(0, len(missing_keys), self.image_batch_size):
+                batch_keys = missing_keys[i:i+self.image_batch_size]
+                # decode one batch at a time to keep memory bounded on image-heavy decks
+                images = [ Image.open(io.BytesIO(blobs_by_key[key])) for key in batch_keys ]
+                texts = deplot.extract_chart_data_from_images(images, batch_size=self.image_batch_size)
+                texts_by_key.update(zip(batch_keys, texts))
+        elif missing_keys:
+            for key in missing_keys:
+                try:
+                    texts_by_key[key] = extract_text_from_ocr(io.BytesIO(blobs_by_key[key]), ocr_engine=self.ocr_engine)
+                except Exception as e:
+                    # a picture the OCR engine can not read only loses its own text
+                    self.logger.warning(f"Ignoring image text, OCR failed: {e}")
+                    texts_by_key[key] = ""
+
+        if self.image_cache is not None and missing_keys:
+            for key in missing_keys:
+                # empty text is also what a failed image returns, do not pin it in the cache
+                if texts_by_key[key]:
+                    self.image_cache.set(key, texts_by_key[key])
+            self.image_cache.evict()
+
+        for key, entities in entities_by_key.items():
+            for entity in entities:
+                entity.text = texts_by_key[key]
+
+    def build_slide_text(self, slide_number: int, slide_title: str, entities: List[Entity], maintain_order: bool = False) -> str:
+        """
+        Builds the text of a slide from its entities.
+
+        Args:
+        - maintain_order (bool, optional): Keep the shapes order instead of grouping by entity type.
+        """
+        if maintain_order:
+            slide_text = "Slide Number : "+str(slide_number)
+            slide_text += "\nSlide Title : "+str(slide_title)
+            for entity in entities:
+                slide_text += "\n" + self.ENTITY_LABELS[entity.chart_type] + " : " + entity.text
+            return slide_text
+
+        slide_wise_text = ''.join(e.text for e in entities if e.chart_type == "text")
+        slide_wise_table = ''.join(" \n " + e.text + " \n " for e in entities if e.chart_type == "table")
+        slide_wise_chart = ''.join(" \n " + e.text + " \n " for e in entities if e.chart_type == "chart")
+        slide_wise_ocr = ''.join(e.text + " \n " for e in entities if e.chart_type == "image")
+
+        return f"""
                     Slide Number {slide_number}
                     Slide Title : {slide_title}
                     Slide Text : {slide_wise_text}
@@ -181,10 +286,3 @@ class PPTExtractor():
                     Slide Image OCR Text : 
                     {slide_wise_ocr}
                     """
-                print("slide_Number: ", slide_number)
-                print("slide_Number: ", slide_text)
-                self.slides.append(Slide(slide_number, slide_title, slide_text, entities))
-            except Exception as e:
-                print("Ignoring slide ", slide_number, " Error ", e)
-        
-        
\ No newline at end of file
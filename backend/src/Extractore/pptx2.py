@@ -23,8 +23,8 @@ def count_tokens(text):
     return len(tokenizer.tokenize(text))
 
 class PPTSummarizer(PPTExtractor):
-    def __init__(self, file_path, extraction_method: str = "slide", ocr_engine: str = "tesseract") -> None:
-        super().__init__(file_path, extraction_method, ocr_engine)
+    def __init__(self, file_path, extraction_method: str = "slide", ocr_engine: str = "tesseract", **extractor_kwargs) -> None:
+        super().__init__(file_path, extraction_method, ocr_engine, **extractor_kwargs)
         super().extract()
 
     def summarize(self, summarize_method="slide", slide_number=0, summarize_model="mistral-small:22b-instruct-2409-q5_K_M", system_prompt="Tu reçois les informations d'une diapositive PowerPoint, telles que le texte, les tableaux, les graphiques ou le texte extrait d’images (OCR). Génère un résumé concis et précis de la diapositive, en citant les sources utilisées (tableaux/graphiques) si applicable."):
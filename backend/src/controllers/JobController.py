@@ -0,0 +1,141 @@
+from .BaseController import BaseController
+from .NLPController import NLPController
+from .ProcessController import ProcessController
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models import ResponseSignal
+
+class JobController(BaseController):
+    """Background job handlers, built once at startup with the app-level clients."""
+
+    def __init__(self, db_client, vectordb_client, generation_client,
+                 embedding_client, template_parser,
+                 process_executor=None, processing_max_workers: int = None,
+                 process_manager=None,
+                 embedding_cache=None, answer_cache=None):
+        super().__init__()
+
+        self.db_client = db_client
+        self.vectordb_client = vectordb_client
+        self.generation_client = generation_client
+        self.embedding_client = embedding_client
+        self.template_parser = template_parser
+        self.process_executor = process_executor
+        self.processing_max_workers = processing_max_workers
+        self.process_manager = process_manager
+        self.embedding_cache = embedding_cache
+        self.answer_cache = answer_cache
+
+    def get_nlp_controller(self):
+        return NLPController(
+            vectordb_client=self.vectordb_client,
+            generation_client=self.generation_client,
+            embedding_client=self.embedding_client,
+            template_parser=self.template_parser,
+            embedding_cache=self.embedding_cache,
+            answer_cache=self.answer_cache,
+        )
+
+    async def run_process_job(self, task_args: dict, progress):
+
+        project_id = task_args["project_id"]
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        asset_model = await AssetModel.create_instance(db_client=self.db_client)
+        project_assets = await asset_model.get_project_file_assets(
+            asset_project_id=project.project_id,
+            asset_name=task_args.get("file_id"),
+        )
+
+        if project_assets is None:
+            return {"failed": True, "signal": ResponseSignal.FILE_ID_ERROR.value}
+
+        if len(project_assets) == 0:
+            return {"failed": True, "signal": ResponseSignal.NO_FILES_ERROR.value}
+
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        nlp_controller = self.get_nlp_controller()
+
+        if task_args.get("do_reset") == 1:
+            _ = await nlp_controller.reset_vector_db_collection(project=project)
+            _ = await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
+
+        chunk_size = task_args.get("chunk_size", 100)
+        overlap_size = task_args.get("overlap_size", 20)
+
+        process_controller = ProcessController(project_id=project.project_id)
+        project_files_ids, asset_configs = await process_controller.get_changed_assets(
+            assets=project_assets,
+            asset_model=asset_model,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            force=task_args.get("do_reset") == 1,
+        )
+
+        await progress.report(done=0, total=len(project_files_ids), stage="processing", force=True)
+
+        process_result = await process_controller.process_assets(
+            project_files_ids=project_files_ids,
+            chunk_model=chunk_model,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            progress_callback=progress.advance,
+            executor=self.process_executor,
+            max_in_flight=self.processing_max_workers,
+            queue_manager=self.process_manager,
+            nlp_controller=nlp_controller,
+            asset_model=asset_model,
+            asset_configs=asset_configs,
+        )
+
+        if process_result is None:
+            return {"failed": True, "signal": ResponseSignal.PROCESSING_FAILED.value}
+
+        no_records, no_files = process_result
+
+        return {
+            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+            "inserted_chunks": no_records,
+            "processed_files": no_files,
+            "skipped_files": len(project_assets) - len(project_files_ids),
+        }
+
+    async def run_index_job(self, task_args: dict, progress):
+
+        project_id = task_args["project_id"]
+
+        project_model = await ProjectModel.create_instance(db_client=self.db_client)
+        project = await project_model.get_project_or_create_one(project_id=project_id)
+
+        if not project:
+            return {"failed": True, "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value}
+
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        asset_model = await AssetModel.create_instance(db_client=self.db_client)
+        total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
+
+        await progress.report(done=0, total=total_chunks_count, stage="indexing", force=True)
+
+        nlp_controller = self.get_nlp_controller()
+        inserted_items_count, index_info = await nlp_controller.index_project(
+            project=project,
+            chunk_model=chunk_model,
+            asset_model=asset_model,
+            do_reset=task_args.get("do_reset", 0),
+            fetch_batch_size=task_args.get("batch_size") or self.app_settings.INDEXING_FETCH_BATCH_SIZE,
+            embed_batch_size=self.app_settings.INDEXING_EMBED_BATCH_SIZE,
+            queue_size=self.app_settings.INDEXING_QUEUE_SIZE,
+            progress_callback=progress.advance,
+        )
+
+        if inserted_items_count is None:
+            return {"failed": True, "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value}
+
+        return {
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": inserted_items_count,
+            "index_info": index_info,
+        }
@@ -1,26 +1,42 @@
 from .BaseController import BaseController
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.vectordb.VectorDBEnums import SearchModeEnums
+from stores.llm.PromptBuilder import RAGPromptBuilder
 from typing import List
+import asyncio
+import inspect
 import json
-from sentence_transformers import SentenceTransformer
+import logging
 
 class NLPController(BaseController):
 
     def __init__(self, vectordb_client, generation_client, 
-                 embedding_client, template_parser):
+                 embedding_client, template_parser, embedding_cache=None,
+                 answer_cache=None, reranker=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        self.embedding_cache = embedding_cache
+        self.answer_cache = answer_cache
+        self.reranker = reranker
+
+        self.logger = logging.getLogger("uvicorn")
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
     
+    async def invalidate_answer_cache(self, project_id: int):
+        # cached answers were built from the previous chunks / collection
+        if self.answer_cache is not None:
+            await self.answer_cache.ainvalidate(project_id=project_id)
+
     async def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
+        await self.invalidate_answer_cache(project_id=project.project_id)
         return await self.vectordb_client.delete_collection(collection_name=collection_name)
     
     async def get_vector_db_collection_info(self, project: Project):
@@ -31,6 +47,16 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
     
+    @staticmethod
+    def get_vector_metadata(chunk) -> dict:
+        # asset_id travels with the vector so searches can be restricted to assets,
+        # chunk_order lets providers without a chunks join (Qdrant) return it
+        return {
+            **(chunk.chunk_metadata or {}),
+            "asset_id": chunk.chunk_asset_id,
+            "chunk_order": chunk.chunk_order,
+        }
+
     async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: List[int], 
                                    do_reset: bool = False):
@@ -40,17 +66,12 @@ class NLPController(BaseController):
 
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
-        metadata = [ c.chunk_metadata for c in  chunks]
+        metadata = [ self.get_vector_metadata(c) for c in chunks ]
         
-        # Vérification du provider d'embedding
-        if self.embedding_client.embedding_model_id == "hugging_face" :
-            # Utiliser sentence-transformers pour Hugging Face
-            model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
-            vectors = model.encode(texts)
-        else:
-            # Code normal pour OpenAI/Cohere
-            vectors = self.embedding_client.embed_text(text=texts, 
-                                                      document_type=DocumentTypeEnum.DOCUMENT.value)
+        vectors = await self.embed_chunks(chunks=chunks)
+
+        if not vectors:
+            return False
 
         # step3: create collection if not exists
         _ = await self.vectordb_client.create_collection(
@@ -70,82 +91,411 @@ class NLPController(BaseController):
 
         return True
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def embed_texts(self, texts: List[str], document_type: str):
+        """Embed texts through the embedding cache when one is configured."""
+
+        async def embed_func(missing_texts):
+            # "hugging_face" embeddings are served by the shared LocalEmbeddingEngine of the provider
+            return await self.embedding_client.aembed_text(text=missing_texts,
+                                                           document_type=document_type)
+
+        if self.embedding_cache is None:
+            return await embed_func(texts)
+
+        return await self.embedding_cache.aembed(texts=texts, document_type=document_type,
+                                                 embed_func=embed_func)
+
+    async def embed_chunks(self, chunks: List[DataChunk]):
+        texts = [ c.chunk_text for c in chunks ]
+
+        vectors = await self.embed_texts(texts=texts, document_type=DocumentTypeEnum.DOCUMENT.value)
+
+        if not vectors or len(vectors) != len(texts):
+            return None
+
+        return vectors
+
+    async def index_project_pipelined(self, project: Project, chunks_batches,
+                                      embed_batch_size: int = 96, queue_size: int = 4,
+                                      progress_callback=None):
+        """
+        Index an async iterator of chunk batches with three overlapping stages:
+        DB reader -> embedding -> vector writer, joined by bounded queues.
+        Returns the number of inserted chunks, or None when a stage failed.
+        """
 
-        # step1: get collection name
-        query_vector = None
         collection_name = self.create_collection_name(project_id=project.project_id)
 
-        # step2: get text embedding vector
-        vectors = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        fetch_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+        inserted_items_count = 0
+
+        async def read_stage():
+            async for page_chunks in chunks_batches:
+                await fetch_queue.put(page_chunks)
+            await fetch_queue.put(None)
+
+        async def embed_stage():
+            # re-slice pages so every embedding call gets a full batch
+            pending = []
+            while True:
+                page_chunks = await fetch_queue.get()
+                if page_chunks is not None:
+                    pending.extend(page_chunks)
+
+                while len(pending) >= embed_batch_size or (page_chunks is None and len(pending)):
+                    batch, pending = pending[:embed_batch_size], pending[embed_batch_size:]
+                    vectors = await self.embed_chunks(chunks=batch)
+                    if vectors is None:
+                        raise RuntimeError(f"Embedding failed for collection: {collection_name}")
+                    await write_queue.put((batch, vectors))
+
+                if page_chunks is None:
+                    await write_queue.put(None)
+                    return
+
+        async def write_stage():
+            nonlocal inserted_items_count
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    return
+
+                batch, vectors = item
+                is_inserted = await self.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=[ c.chunk_text for c in batch ],
+                    metadata=[ self.get_vector_metadata(c) for c in batch ],
+                    vectors=vectors,
+                    record_ids=[ c.chunk_id for c in batch ],
+                )
+                if not is_inserted:
+                    raise RuntimeError(f"Insert failed for collection: {collection_name}")
+
+                inserted_items_count += len(batch)
+                if progress_callback:
+                    result = progress_callback(len(batch))
+                    if inspect.isawaitable(result):
+                        await result
+
+        tasks = [
+            asyncio.create_task(read_stage()),
+            asyncio.create_task(embed_stage()),
+            asyncio.create_task(write_stage()),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            self.logger.error(f"Error while indexing project {project.project_id}: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return None
+
+        return inserted_items_count
+
+    async def delete_vectors_by_chunk_ids(self, project_id: int, chunk_ids: List[int]):
+        collection_name = self.create_collection_name(project_id=project_id)
+        await self.invalidate_answer_cache(project_id=project_id)
+        return await self.vectordb_client.delete_by_record_ids(
+            collection_name=collection_name,
+            record_ids=chunk_ids,
+        )
+
+    async def index_project(self, project: Project, chunk_model, asset_model, do_reset: int = 0,
+                            fetch_batch_size: int = 500, embed_batch_size: int = 96,
+                            queue_size: int = 4, progress_callback=None):
+        """
+        Push the project chunks into its vector collection. Without do_reset only the chunks
+        of assets processed since their last push are pushed: an asset is marked with the
+        processing_fingerprint its chunks were pushed for, and re-processing it changes or
+        clears that mark, whatever the order its chunks were committed in.
+        Returns (inserted_items_count, index_info); the count is None on failure.
+        """
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        _ = await self.vectordb_client.create_collection(
+            collection_name=collection_name,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=do_reset,
+        )
+
+        assets = await asset_model.get_project_file_assets(asset_project_id=project.project_id)
+
+        # asset_id -> processing_fingerprint to mark once pushed (None: processed before
+        # fingerprints existed, pushed every time until it is processed again)
+        pending_assets = {}
+        for asset in assets:
+            asset_config = asset.asset_config or {}
+            processing_fingerprint = asset_config.get("processing_fingerprint")
+            if do_reset or processing_fingerprint is None \
+                    or asset_config.get("indexed_fingerprint") != processing_fingerprint:
+                pending_assets[asset.asset_id] = processing_fingerprint
+
+        if not do_reset:
+            # vectors left by an interrupted push (or the previous layout) are replaced
+            for asset_id in pending_assets:
+                stale_chunk_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset_id)
+                if len(stale_chunk_ids):
+                    _ = await self.vectordb_client.delete_by_record_ids(collection_name=collection_name,
+                                                                        record_ids=stale_chunk_ids)
+
+        # a full push drops the vector index and builds it once at the end,
+        # an incremental one keeps it and lets the new rows be added to it
+        full_push = do_reset or not any(
+            (asset.asset_config or {}).get("indexed_fingerprint") for asset in assets
+        )
+        _ = await self.vectordb_client.begin_bulk_load(collection_name=collection_name,
+                                                       drop_index=full_push)
+
+        inserted_items_count = None
+        try:
+            inserted_items_count = await self.index_project_pipelined(
+                project=project,
+                chunks_batches=chunk_model.iter_project_chunks(project_id=project.project_id,
+                                                               batch_size=fetch_batch_size,
+                                                               asset_ids=list(pending_assets)),
+                embed_batch_size=embed_batch_size,
+                queue_size=queue_size,
+                progress_callback=progress_callback,
+            )
+        finally:
+            index_info = await self.vectordb_client.end_bulk_load(collection_name=collection_name)
+            # a failed push (None) may still have written part of the chunks
+            if do_reset or inserted_items_count != 0:
+                await self.invalidate_answer_cache(project_id=project.project_id)
+
+        if inserted_items_count is not None:
+            for asset_id, processing_fingerprint in pending_assets.items():
+                if processing_fingerprint is not None:
+                    _ = await asset_model.mark_asset_indexed(asset_id=asset_id,
+                                                             processing_fingerprint=processing_fingerprint)
+
+        return inserted_items_count, index_info
+
+    async def embed_query(self, text: str):
+        vectors = await self.embed_texts(texts=[text], document_type=DocumentTypeEnum.QUERY.value)
 
         if not vectors or len(vectors) == 0:
-            return False
-        
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+            return None
+
+        return vectors[0]
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10,
+                                          query_vector: list = None, search_mode: str = None,
+                                          filters: dict = None, include_text: bool = True):
+
+        # step1: get collection name
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step2: get text embedding vector
+        if query_vector is None:
+            query_vector = await self.embed_query(text=text)
 
         if not query_vector:
             return False    
 
-        # step3: do semantic search
-        results = await self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=query_vector,
-            limit=limit
-        )
+        # a reranker picks the best `limit` chunks out of a wider candidate set
+        do_rerank = self.reranker is not None and include_text
+        top_k = limit
+        if do_rerank:
+            limit = max(limit, self.app_settings.RERANKER_CANDIDATES)
+
+        # step3: do semantic (or hybrid semantic + full-text) search
+        search_mode = search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        if search_mode == SearchModeEnums.HYBRID.value:
+            results = await self.vectordb_client.search_hybrid(
+                collection_name=collection_name,
+                vector=query_vector,
+                text=text,
+                limit=limit,
+                filters=filters,
+                include_text=include_text,
+            )
+        else:
+            results = await self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=limit,
+                filters=filters,
+                include_text=include_text,
+            )
 
         if not results:
             return False
 
+        # step4: rerank the candidates with the cross-encoder
+        if do_rerank:
+            results = await self.reranker.arerank(query=text, documents=results, top_k=top_k)
+
         return results
     
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-        
-        answer, full_prompt, chat_history = None, None, None
+    async def search_projects_collections(self, projects: List[Project], text: str, limit: int = 10,
+                                          search_mode: str = None, filters: dict = None,
+                                          include_text: bool = True):
+        """
+        Search several projects at once: the query is embedded once, every collection is
+        searched with it and the hits are merged by score (each tagged with its project_id).
+        """
+
+        query_vector = await self.embed_query(text=text)
+        if not query_vector:
+            return False
+
+        do_rerank = self.reranker is not None and include_text
+        candidates_limit = max(limit, self.app_settings.RERANKER_CANDIDATES) if do_rerank else limit
+
+        # collection_name -> project_id
+        collections = {
+            self.create_collection_name(project_id=project.project_id): project.project_id
+            for project in projects
+        }
+
+        search_mode = search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        if search_mode == SearchModeEnums.HYBRID.value:
+            # rank fusion is per collection, the searches run concurrently
+            collections_results = await asyncio.gather(*[
+                self.vectordb_client.search_hybrid(
+                    collection_name=collection_name,
+                    vector=query_vector,
+                    text=text,
+                    limit=candidates_limit,
+                    filters=filters,
+                    include_text=include_text,
+                )
+                for collection_name in collections
+            ])
+            results_by_collection = dict(zip(collections, collections_results))
+        else:
+            results_by_collection = await self.vectordb_client.search_by_vector_many(
+                collection_names=list(collections),
+                vector=query_vector,
+                limit=candidates_limit,
+                filters=filters,
+                include_text=include_text,
+            )
+
+        if not results_by_collection:
+            return False
+
+        results = sorted(
+            [
+                doc.model_copy(update={"project_id": collections[collection_name]})
+                for collection_name, docs in results_by_collection.items()
+                for doc in (docs or [])
+            ],
+            key=lambda doc: -doc.score,
+        )
+
+        if not results:
+            return False
+
+        if do_rerank:
+            return await self.reranker.arerank(query=text, documents=results, top_k=limit)
+
+        return results[:limit]
+
+    async def construct_rag_prompt(self, project: Project, query: str, limit: int = 10,
+                                   query_vector: list = None, search_mode: str = None,
+                                   filters: dict = None):
+
+        full_prompt, chat_history = None, None
 
         # step1: retrieve related documents
         retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
+            query_vector=query_vector,
+            search_mode=search_mode,
+            filters=filters,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return None, full_prompt, chat_history
         
-        # step2: Construct LLM prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
-
-        documents_prompts = "\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    # "chunk_text": self.generation_client.process_text(doc.text),
-                    "chunk_text": doc.text,
-            })
-            for idx, doc in enumerate(retrieved_documents)
-        ])
-
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": query
-        })
+        # step2: Construct LLM prompt, within the token budget and without near-duplicate chunks
+        prompt_builder = RAGPromptBuilder(
+            template_parser=self.template_parser,
+            count_tokens=self.generation_client.count_tokens,
+            max_prompt_tokens=self.app_settings.RAG_PROMPT_MAX_TOKENS,
+            min_document_tokens=self.app_settings.RAG_PROMPT_MIN_DOCUMENT_TOKENS,
+            dedup_threshold=self.app_settings.RAG_PROMPT_DEDUP_THRESHOLD,
+        )
+        rag_prompt = prompt_builder.build(query=query, documents=retrieved_documents)
+
+        if not rag_prompt.documents:
+            return None, full_prompt, chat_history
 
         # step3: Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
-                prompt=system_prompt,
+                prompt=rag_prompt.system_prompt,
                 role=self.generation_client.enums.SYSTEM.value,
             )
         ]
 
-        full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
+        full_prompt = rag_prompt.full_prompt
+        retrieved_documents = rag_prompt.documents
+
+        return retrieved_documents, full_prompt, chat_history
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10,
+                                  search_mode: str = None, filters: dict = None):
+        
+        answer = None
+        query_vector = None
+        search_mode = search_mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+
+        # near-identical questions on an unchanged project reuse the stored answer,
+        # filtered questions are too specific to be worth caching
+        use_answer_cache = self.answer_cache is not None and not filters
+        if use_answer_cache:
+            cache_generation = self.answer_cache.get_generation(
+                project_id=project.project_id,
+                shared_generation=getattr(project, "answer_cache_generation", None),
+            )
+            query_vector = await self.embed_query(text=query)
+            if query_vector:
+                cached = self.answer_cache.lookup(project_id=project.project_id,
+                                                  query_vector=query_vector, limit=limit,
+                                                  search_mode=search_mode,
+                                                  generation=cache_generation)
+                if cached is not None:
+                    return cached.answer, cached.full_prompt, cached.chat_history
+
+        retrieved_documents, full_prompt, chat_history = await self.construct_rag_prompt(
+            project=project,
+            query=query,
+            limit=limit,
+            query_vector=query_vector,
+            search_mode=search_mode,
+            filters=filters,
+        )
+
+        if not retrieved_documents:
+            return answer, full_prompt, chat_history
 
         # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        answer = await self.generation_client.agenerate_text(
             prompt=full_prompt,
             chat_history=chat_history
         )
 
+        if answer and use_answer_cache and query_vector:
+            self.answer_cache.store(project_id=project.project_id, query=query,
+                                    query_vector=query_vector, limit=limit,
+                                    search_mode=search_mode, answer=answer, full_prompt=full_prompt,
+                                    chat_history=chat_history, generation=cache_generation)
+
         return answer, full_prompt, chat_history
 
+    def stream_rag_answer(self, full_prompt: str, chat_history: list):
+        # tokens are yielded as soon as the provider produces them
+        return self.generation_client.astream_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
@@ -1,12 +1,23 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os
+import asyncio
+import hashlib
+import inspect
+import itertools
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from langchain_community.document_loaders import TextLoader
-from langchain_community.document_loaders import PyMuPDFLoader
 from models import ProcessingEnum
+from models.db_schemes import DataChunk
 from typing import List
 from dataclasses import dataclass
 from Extractore.pptx2 import PPTSummarizer
+from Extractore.image_cache import ImageTextCache
+from Extractore.pdf import PDFPageStreamer
+from helpers.token_chunker import TokenChunker, get_tokenizer
 from langchain_core.documents import Document
 
 @dataclass
@@ -14,13 +25,108 @@ class Document:
     page_content: str
     metadata: dict
 
+def extract_file_chunks(project_id: str, file_id: str, chunk_size: int, overlap_size: int,
+                        chunk_queue, batch_size: int = 500):
+    """
+    Load and chunk one file, putting lists of at most batch_size (page_content, metadata)
+    tuples on chunk_queue as they are produced, then None once done (even on error).
+    Module-level so it can be pickled into a process pool; returns the number of chunks,
+    None when the file cannot be read.
+    """
+    try:
+        process_controller = ProcessController(project_id=project_id)
+
+        file_content = process_controller.get_file_content(file_id=file_id)
+        if file_content is None:
+            return None
+
+        file_chunks = process_controller.iter_file_chunks(
+            file_content=file_content,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size
+        )
+
+        chunks_count = 0
+        batch = []
+        for chunk in file_chunks:
+            batch.append((chunk.page_content, chunk.metadata))
+            if len(batch) >= batch_size:
+                # blocks while the consumer is behind, which bounds the memory held
+                chunk_queue.put(batch)
+                chunks_count += len(batch)
+                batch = []
+
+        if batch:
+            chunk_queue.put(batch)
+            chunks_count += len(batch)
+
+        return chunks_count
+    finally:
+        chunk_queue.put(None)
+
+def drain_chunk_queue(chunk_queue, max_idle: float = 60.0):
+    """Read a chunk queue until its end marker so an abandoned producer never blocks on put."""
+    idle = 0.0
+    while idle < max_idle:
+        try:
+            if chunk_queue.get(timeout=1.0) is None:
+                return
+            idle = 0.0
+        except queue.Empty:
+            idle += 1.0
+
+class LoopChunkQueue:
+    """
+    Chunk queue for extraction threads of this process: put() hands each batch to an
+    asyncio.Queue through loop.call_soon_threadsafe and blocks the worker thread while
+    maxsize batches are pending, so the consumer awaits batches without holding a thread.
+    Once closed, put() drops its batch instead of blocking.
+    """
+
+    def __init__(self, loop, maxsize: int = 0):
+        self.loop = loop
+        self.queue = asyncio.Queue()
+        self.slots = threading.Semaphore(maxsize) if maxsize > 0 else None
+        self.closed = False
+
+    def put(self, item):
+        if self.closed:
+            return
+        # the end marker is never held back so the consumer always sees it
+        if item is not None and self.slots is not None:
+            self.slots.acquire()
+            if self.closed:
+                return
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+        except RuntimeError:
+            # the event loop is gone, nobody reads this queue anymore
+            self.closed = True
+
+    async def get(self):
+        item = await self.queue.get()
+        if item is not None and self.slots is not None:
+            self.slots.release()
+        return item
+
+    def close(self):
+        self.closed = True
+        if self.slots is not None:
+            # wake a worker blocked in put()
+            self.slots.release()
+
 class ProcessController(BaseController):
 
+    # bump whenever extraction or chunking changes the produced chunks,
+    # every asset is then re-processed on its next run
+    EXTRACTOR_VERSION = "2"
+
     def __init__(self, project_id: str):
         super().__init__()
 
         self.project_id = project_id
         self.project_path = ProjectController().get_project_path(project_id=project_id)
+        self.logger = logging.getLogger("uvicorn")
 
     def get_file_extension(self, file_id: str):
         return os.path.splitext(file_id)[-1]
@@ -40,12 +146,29 @@ class ProcessController(BaseController):
             return TextLoader(file_path, encoding="utf-8")
 
         if file_ext == ProcessingEnum.PDF.value:
-            return PyMuPDFLoader(file_path)
+            return PDFPageStreamer(file_path)
         if file_ext == ProcessingEnum.PPTX.value:
-            return PPTSummarizer(file_path)
+            return PPTSummarizer(
+                file_path,
+                image_model_name=self.app_settings.PPTX_IMAGE_MODEL_ID,
+                image_batch_size=self.app_settings.PPTX_IMAGE_BATCH_SIZE,
+                image_num_threads=self.app_settings.PPTX_IMAGE_NUM_THREADS,
+                image_cache=self.get_image_cache(),
+            )
         
         return None
 
+    def get_image_cache(self):
+        if not self.app_settings.IMAGE_CACHE_ENABLED:
+            return None
+
+        cache_dir = self.app_settings.IMAGE_CACHE_DIR or os.path.join(self.base_dir, "assets/cache/images")
+        return ImageTextCache(
+            cache_dir=cache_dir,
+            max_size_mb=self.app_settings.IMAGE_CACHE_MAX_SIZE_MB,
+            evict_interval=self.app_settings.IMAGE_CACHE_EVICT_INTERVAL,
+        )
+
     def get_file_content(self, file_id: str):
 
         loader = self.get_file_loader(file_id=file_id)
@@ -70,69 +193,276 @@ class ProcessController(BaseController):
         else:
             print("FICHIER NON PPTX BRO -------------------------------")
             if loader:
-                return loader.load()
+                # pages are read lazily, chunking pulls them one at a time
+                return loader.lazy_load()
             return None
 
+    def get_token_chunker(self, chunk_size: int, overlap_size: int):
+        tokenizer_id = self.app_settings.CHUNKING_TOKENIZER_ID or self.app_settings.LOCAL_EMBEDDING_MODEL_ID
+        return TokenChunker(
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            tokenizer=get_tokenizer(tokenizer_id),
+        )
+
+    def iter_file_chunks(self, file_content, chunk_size: int=100, overlap_size: int=20):
+        """Yield the chunks of a file as Documents, pages are consumed one at a time."""
+        pages = iter(file_content)
+        first_page = next(pages, None)
+        if first_page is None:
+            return
+
+        # slides are already summarized into one chunk each
+        if first_page.metadata.get("format") == "powerpoint":
+            yield first_page
+            yield from pages
+            return
+
+        chunker = self.get_token_chunker(chunk_size=chunk_size, overlap_size=overlap_size)
+        for text, metadata in chunker.iter_chunks(itertools.chain([first_page], pages)):
+            yield Document(page_content=text, metadata=metadata)
+
     def process_file_content(self, file_content: list, file_id: str,
                             chunk_size: int=100, overlap_size: int=20):
-        
-        print(file_content[0].metadata)
-        chunks = []
-        if file_content[0].metadata["format"] == "powerpoint":
-            for doc in file_content:
-                chunks.append(doc)
-        else:
-            file_content_texts = [
-                rec.page_content
-                for rec in file_content
-            ]
-
-            file_content_metadata = [
-                rec.metadata
-                for rec in file_content
-            ]
-
-            # chunks = text_splitter.create_documents(
-            #     file_content_texts,
-            #     metadatas=file_content_metadata
-            # )
-
-            chunks = self.process_simpler_splitter(
-                texts=file_content_texts,
-                metadatas=file_content_metadata,
+
+        return list(self.iter_file_chunks(
+            file_content=file_content,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+        ))
+
+    def compute_file_hash(self, file_id: str):
+        file_path = os.path.join(self.project_path, file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def get_processing_fingerprint(self, content_hash: str, chunk_size: int, overlap_size: int):
+        fingerprint = f"{content_hash}:{chunk_size}:{overlap_size}:{self.EXTRACTOR_VERSION}"
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+    async def get_changed_assets(self, assets: list, asset_model,
+                                 chunk_size: int = 100, overlap_size: int = 20,
+                                 force: bool = False):
+        """
+        Select the assets whose content or processing settings changed since their last run.
+        Returns (project_files_ids, asset_configs): asset_id -> file_id of the assets to
+        process, and asset_id -> asset_config to store once their chunks are saved.
+        """
+
+        project_files_ids = {}
+        asset_configs = {}
+
+        for asset in assets:
+            asset_config = dict(asset.asset_config or {})
+
+            # assets uploaded before content hashing are hashed once here
+            if not asset_config.get("content_hash"):
+                content_hash = await asyncio.to_thread(self.compute_file_hash, asset.asset_name)
+                if content_hash is None:
+                    self.logger.error(f"Error while hashing file: {asset.asset_name}")
+                    continue
+                asset_config["content_hash"] = content_hash
+                _ = await asset_model.update_asset_config(asset_id=asset.asset_id, asset_config=asset_config)
+
+            processing_fingerprint = self.get_processing_fingerprint(
+                content_hash=asset_config["content_hash"],
                 chunk_size=chunk_size,
+                overlap_size=overlap_size,
             )
 
-        return chunks
+            if not force and asset_config.get("processing_fingerprint") == processing_fingerprint:
+                continue
 
-    def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
-        
-        full_text = " ".join(texts)
+            project_files_ids[asset.asset_id] = asset.asset_name
+            # the new chunks are pushed on the next index run
+            asset_config.pop("indexed_fingerprint", None)
+            asset_configs[asset.asset_id] = {
+                **asset_config,
+                "processing_fingerprint": processing_fingerprint,
+            }
+
+        return project_files_ids, asset_configs
+
+    async def iter_chunk_batches(self, chunk_queue, extraction, reader=None):
+        """
+        Yield the chunk batches of one extraction until its end marker (or its worker is gone).
+        A manager queue is polled on `reader`, a thread pool kept apart from the extraction
+        and to_thread pools.
+        """
+        if isinstance(chunk_queue, LoopChunkQueue):
+            # an extraction that never ran (e.g. a broken pool) puts no end marker
+            extraction.add_done_callback(lambda _: chunk_queue.queue.put_nowait(None))
+            while True:
+                batch = await chunk_queue.get()
+                if batch is None:
+                    return
+                yield batch
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch = await loop.run_in_executor(reader, chunk_queue.get, True, 1.0)
+            except queue.Empty:
+                # the worker puts its end marker before returning, an empty queue
+                # with a finished future means it never ran (e.g. a broken pool)
+                if extraction.done():
+                    return
+                continue
+
+            if batch is None:
+                return
+            yield batch
+
+    async def process_assets(self, project_files_ids: dict, chunk_model,
+                             chunk_size: int = 100, overlap_size: int = 20,
+                             progress_callback=None, executor=None, max_in_flight: int = None,
+                             nlp_controller=None, asset_model=None, asset_configs: dict = None,
+                             queue_manager=None):
+        """
+        Extract, chunk and store every asset of project_files_ids (asset_id -> file_id).
+        Files are extracted in parallel on `executor` (the default thread pool when None);
+        each worker streams its chunks back in batches through a bounded queue, created by
+        queue_manager (required with a process pool) and read on a dedicated thread pool,
+        or a LoopChunkQueue with thread workers, and they are inserted as they arrive.
+        Chunks (and, with nlp_controller, vectors) left by a previous run of an asset are
+        replaced; asset_configs are saved through asset_model once an asset is stored.
+        Returns (inserted_chunks, processed_files), or None when a file produced no chunks.
+        """
+
+        loop = asyncio.get_running_loop()
+        # bound the files submitted at once so concurrent requests share the pool
+        max_in_flight = max_in_flight or len(project_files_ids) or 1
+        semaphore = asyncio.Semaphore(max_in_flight)
+        # manager queues block on get: read them on their own threads, one per file in flight
+        reader = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="chunk-reader") \
+            if queue_manager is not None else None
+        batch_size = self.app_settings.PROCESSING_CHUNK_BATCH_SIZE
+        queue_size = self.app_settings.PROCESSING_QUEUE_SIZE
+        chunks_changed = False
+
+        async def delete_stale_chunks(asset_id):
+            # what a previous run stored for this asset, vectors first (FK on chunk_id)
+            nonlocal chunks_changed
+            stale_chunk_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset_id)
+            if len(stale_chunk_ids):
+                chunks_changed = True
+                if nlp_controller is not None:
+                    _ = await nlp_controller.delete_vectors_by_chunk_ids(
+                        project_id=self.project_id,
+                        chunk_ids=stale_chunk_ids,
+                    )
+                _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset_id)
+
+        async def replace_asset_chunks(asset_id, chunks_batches):
+            nonlocal chunks_changed
+            inserted_count = 0
+            chunk_order = 0
+
+            async for batch in chunks_batches:
+                # old chunks are kept until new ones arrive, a run that fails early loses nothing
+                if chunk_order == 0:
+                    chunks_changed = True
+                    await delete_stale_chunks(asset_id)
+
+                batch_records = [
+                    DataChunk(
+                        chunk_text=page_content,
+                        chunk_metadata=metadata,
+                        chunk_order=chunk_order+i+1,
+                        chunk_project_id=self.project_id,
+                        chunk_asset_id=asset_id
+                    )
+                    for i, (page_content, metadata) in enumerate(batch)
+                ]
+                chunk_order += len(batch)
+                inserted_count += await chunk_model.insert_many_chunks(chunks=batch_records)
+
+            return inserted_count
+
+        async def process(asset_id, file_id):
+            async with semaphore:
+                if queue_manager is not None:
+                    chunk_queue = queue_manager.Queue(maxsize=queue_size)
+                else:
+                    chunk_queue = LoopChunkQueue(loop, maxsize=queue_size)
+                extraction = loop.run_in_executor(
+                    executor, extract_file_chunks,
+                    self.project_id, file_id, chunk_size, overlap_size,
+                    chunk_queue, batch_size
+                )
+
+                finished = False
+                try:
+                    inserted_count = await replace_asset_chunks(
+                        asset_id, self.iter_chunk_batches(chunk_queue, extraction, reader=reader)
+                    )
+                    finished = True
+                finally:
+                    if not finished:
+                        # do not leave the worker blocked on a full queue
+                        if reader is None:
+                            chunk_queue.close()
+                        else:
+                            threading.Thread(target=drain_chunk_queue, args=(chunk_queue,),
+                                             daemon=True).start()
+
+                try:
+                    chunks_count = await extraction
+                except Exception as e:
+                    self.logger.error(f"Error while extracting file {file_id}: {e}")
+                    chunks_count = None
+
+                if chunks_count == 0:
+                    # the file was read but yields nothing now: its old chunks must not stay searchable
+                    await delete_stale_chunks(asset_id)
+
+            return asset_id, file_id, chunks_count, inserted_count
+
+        tasks = [
+            asyncio.create_task(process(asset_id, file_id))
+            for asset_id, file_id in project_files_ids.items()
+        ]
+
+        no_records = 0
+        no_files = 0
 
-        # split by splitter_tag
-        lines = [ doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1 ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                asset_id, file_id, chunks_count, inserted_count = await next_done
+                no_records += inserted_count
 
-        chunks = []
-        current_chunk = ""
+                if chunks_count is None:
+                    self.logger.error(f"Error while processing file: {file_id}")
+                    continue
 
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(
-                    page_content=current_chunk.strip(),
-                    metadata={}
-                ))
+                if chunks_count == 0:
+                    return None
 
-                current_chunk = ""
+                no_files += 1
 
-        if len(current_chunk) >= 0:
-            chunks.append(Document(
-                page_content=current_chunk.strip(),
-                metadata={}
-            ))
+                if asset_model is not None and asset_configs and asset_id in asset_configs:
+                    _ = await asset_model.update_asset_config(asset_id=asset_id,
+                                                              asset_config=asset_configs[asset_id])
 
-        return chunks
+                if progress_callback:
+                    result = progress_callback(1)
+                    if inspect.isawaitable(result):
+                        await result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
+            if reader is not None:
+                reader.shutdown(wait=False)
 
-    
+            if chunks_changed and nlp_controller is not None:
+                await nlp_controller.invalidate_answer_cache(project_id=self.project_id)
 
+        return no_records, no_files
@@ -2,4 +2,5 @@ from .DataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
 from .NLPController import NLPController
-from .MaturityController import MaturityController
\ No newline at end of file
+from .MaturityController import MaturityController
+from .JobController import JobController
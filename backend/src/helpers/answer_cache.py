@@ -0,0 +1,172 @@
+from dataclasses import dataclass, field
+from prometheus_client import Counter
+import logging
+import threading
+import time
+import numpy as np
+
+ANSWER_CACHE_LOOKUPS = Counter(
+    'answer_cache_lookups_total',
+    'RAG answer cache lookups by outcome',
+    ['result'],
+)
+
+@dataclass
+class CachedAnswer:
+    query: str
+    limit: int
+    answer: str
+    full_prompt: str
+    chat_history: list
+    search_mode: str = None
+    created_at: float = field(default_factory=time.monotonic)
+
+class AnswerCache:
+    """
+    Per-project semantic cache of RAG answers, kept in process memory.
+
+    A stored answer is returned when the cosine similarity between the new query
+    embedding and a cached query embedding reaches similarity_threshold (and the same
+    retrieval limit was used). Any change to a project's chunks or collection must
+    call ainvalidate(project_id).
+
+    Entries are tagged with a per-project generation. With a project_model, the
+    generation is the projects.answer_cache_generation column: ainvalidate bumps it,
+    and callers pass the value read with the project row to lookup / get_generation,
+    so an invalidation made by a job on another replica discards this replica's entries.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl: int = 86400,
+                 max_entries_per_project: int = 500, project_model=None):
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries_per_project = max_entries_per_project
+        self.project_model = project_model
+
+        # project_id -> (unit query vectors matrix, [CachedAnswer])
+        self.projects = {}
+        # bumped by invalidate, answers computed under an older generation are not stored
+        self.generations = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self.logger = logging.getLogger("uvicorn")
+
+    @staticmethod
+    def to_unit_vector(vector: list):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def sync_generation(self, project_id: int, generation: int) -> bool:
+        """
+        Catch up with a shared generation, dropping entries of older generations.
+        False when generation is older than the one already seen (stale project row).
+        """
+        current = self.generations.get(project_id, 0)
+        if generation > current:
+            self.generations[project_id] = generation
+            if self.projects.pop(project_id, None) is not None:
+                self.stats["invalidations"] += 1
+            return True
+        return generation == current
+
+    def lookup(self, project_id: int, query_vector: list, limit: int, search_mode: str = None,
+               generation: int = None):
+        with self.lock:
+            if generation is not None and not self.sync_generation(project_id, generation):
+                return self.miss()
+
+            if project_id not in self.projects:
+                return self.miss()
+
+            self.expire(project_id)
+            matrix, entries = self.projects[project_id]
+            if not entries:
+                return self.miss()
+
+            similarities = matrix @ self.to_unit_vector(query_vector)
+            # best candidates first, the first one with the same retrieval settings wins
+            for idx in np.argsort(-similarities):
+                if similarities[idx] < self.similarity_threshold:
+                    break
+                if entries[idx].limit == limit and entries[idx].search_mode == search_mode:
+                    self.stats["hits"] += 1
+                    ANSWER_CACHE_LOOKUPS.labels(result="hit").inc()
+                    return entries[idx]
+
+            return self.miss()
+
+    def get_generation(self, project_id: int, shared_generation: int = None) -> int:
+        """Generation to compute an answer under, shared_generation read with the project row."""
+        if shared_generation is None:
+            return self.generations.get(project_id, 0)
+
+        with self.lock:
+            self.sync_generation(project_id, shared_generation)
+        return shared_generation
+
+    def store(self, project_id: int, query: str, query_vector: list, limit: int,
+              answer: str, full_prompt: str, chat_history: list, generation: int = None,
+              search_mode: str = None):
+        entry = CachedAnswer(query=query, limit=limit, answer=answer,
+                             full_prompt=full_prompt, chat_history=list(chat_history),
+                             search_mode=search_mode)
+        vector = self.to_unit_vector(query_vector)
+
+        with self.lock:
+            if generation is not None and generation != self.generations.get(project_id, 0):
+                return None
+
+            matrix, entries = self.projects.get(project_id, (None, []))
+            if matrix is None or matrix.shape[1] != vector.shape[0]:
+                matrix, entries = np.empty((0, vector.shape[0]), dtype=np.float32), []
+
+            matrix = np.vstack([matrix, vector])
+            entries = entries + [entry]
+
+            # oldest entries go first once the project is full
+            overflow = len(entries) - self.max_entries_per_project
+            if overflow > 0:
+                matrix, entries = matrix[overflow:], entries[overflow:]
+
+            self.projects[project_id] = (matrix, entries)
+
+        return entry
+
+    def invalidate(self, project_id: int, generation: int = None):
+        with self.lock:
+            current = self.generations.get(project_id, 0)
+            self.generations[project_id] = max(current + 1, generation or 0)
+            if self.projects.pop(project_id, None) is not None:
+                self.stats["invalidations"] += 1
+                self.logger.info(f"Answer cache invalidated for project: {project_id}")
+
+    async def ainvalidate(self, project_id: int):
+        """Invalidate the project here and, through the shared generation, on every replica."""
+        generation = None
+        if self.project_model is not None:
+            generation = await self.project_model.bump_answer_cache_generation(project_id=project_id)
+        self.invalidate(project_id=project_id, generation=generation)
+
+    def expire(self, project_id: int):
+        matrix, entries = self.projects[project_id]
+        now = time.monotonic()
+        keep = [ i for i, e in enumerate(entries) if now - e.created_at <= self.ttl ]
+        if len(keep) != len(entries):
+            self.projects[project_id] = (matrix[keep], [ entries[i] for i in keep ])
+
+    def miss(self):
+        self.stats["misses"] += 1
+        ANSWER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def get_stats(self) -> dict:
+        total = self.stats["hits"] + self.stats["misses"]
+        with self.lock:
+            entries = sum(len(e) for _, e in self.projects.values())
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0,
+            "projects": len(self.projects),
+            "entries": entries,
+        }
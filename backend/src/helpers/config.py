@@ -32,11 +32,86 @@ class Settings(BaseSettings):
     GENERATION_DAFAULT_MAX_TOKENS: int = None
     GENERATION_DAFAULT_TEMPERATURE: float = None
 
+    RAG_PROMPT_MAX_TOKENS: int = 3000
+    RAG_PROMPT_MIN_DOCUMENT_TOKENS: int = 64
+    RAG_PROMPT_DEDUP_THRESHOLD: float = 0.9
+
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_TIMEOUT: float = 60.0
+
+    LOCAL_EMBEDDING_MODEL_ID: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 32
+    LOCAL_EMBEDDING_NUM_THREADS: Optional[int] = None
+    LOCAL_EMBEDDING_WARMUP: bool = False
+
+    RERANKER_ENABLED: bool = False
+    RERANKER_MODEL_ID: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    RERANKER_CANDIDATES: int = 30
+    RERANKER_BATCH_SIZE: int = 16
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_NUM_THREADS: Optional[int] = None
+    RERANKER_WARMUP: bool = False
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MEMORY_SIZE: int = 10000
+    EMBEDDING_CACHE_PERSIST: bool = True
+    EMBEDDING_CACHE_TOUCH_INTERVAL: int = 60
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1000000
+    EMBEDDING_CACHE_EVICT_INTERVAL: int = 3600
+
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_TTL: int = 86400
+    ANSWER_CACHE_MAX_ENTRIES: int = 500
+
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
     VECTOR_DB_DISTANCE_METHOD: str = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = 100
+    VECTOR_DB_PGVEC_INSERT_MODE: str = "copy"
+    VECTOR_DB_PGVEC_INSERT_BATCH_SIZE: int = 1000
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH: int = 40
+    VECTOR_DB_PGVEC_IVFFLAT_LISTS: Optional[int] = None
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES: int = 1
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: Optional[str] = None
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: Optional[str] = "relaxed_order"
+    VECTOR_DB_PGVEC_STORAGE_LAYOUT: str = "per_collection"
+    VECTOR_DB_PGVEC_PARTITIONS: int = 16
+    VECTOR_DB_SEARCH_MODE: str = "vector"
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    VECTOR_DB_HYBRID_CANDIDATES: int = 50
+    VECTOR_DB_HYBRID_TEXT_SCAN_LIMIT: int = 1000
+    FEDERATED_SEARCH_MAX_PROJECTS: int = 20
+
+    PROCESSING_MAX_WORKERS: Optional[int] = None
+    PROCESSING_CHUNK_BATCH_SIZE: int = 500
+    PROCESSING_QUEUE_SIZE: int = 4
+    CHUNKING_TOKENIZER_ID: Optional[str] = None
+    PPTX_IMAGE_MODEL_ID: str = "google/pix2struct-base"
+    PPTX_IMAGE_BATCH_SIZE: int = 8
+    PPTX_IMAGE_NUM_THREADS: Optional[int] = None
+    IMAGE_CACHE_ENABLED: bool = True
+    IMAGE_CACHE_DIR: Optional[str] = None
+    IMAGE_CACHE_MAX_SIZE_MB: int = 512
+    IMAGE_CACHE_EVICT_INTERVAL: int = 300
+
+    INDEXING_FETCH_BATCH_SIZE: int = 500
+    INDEXING_EMBED_BATCH_SIZE: int = 96
+    INDEXING_QUEUE_SIZE: int = 4
+
+    JOB_BROKER_BACKEND: str = "LOCAL"
+    JOB_BROKER_URL: Optional[str] = None
+    JOB_BROKER_QUEUE_NAME: str = "minirag_jobs"
+    JOB_WORKERS: int = 2
+    JOB_TIME_LIMIT: int = 3600
+    JOB_DEDUP_WINDOW: int = 0
+    JOB_PROGRESS_INTERVAL: float = 2.0
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
@@ -0,0 +1,187 @@
+from collections import OrderedDict
+from prometheus_client import Counter
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+
+EMBEDDING_CACHE_LOOKUPS = Counter(
+    'embedding_cache_lookups_total',
+    'Embedding cache lookups by tier and outcome',
+    ['document_type', 'result'],
+)
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of the embedding_cache table.
+
+    Keys are the sha256 of the normalized text, the embedding model namespace and the
+    document type, so a model change never serves vectors from another model.
+
+    Hits of both tiers are counted in memory and written to the table in one batch every
+    touch_interval seconds (or touch_batch_size keys); at most every evict_interval
+    seconds the table is trimmed to its max_entries most recently used rows (0: no bound).
+    """
+
+    def __init__(self, model_namespace: str, embedding_model=None,
+                 memory_size: int = 10000, persist: bool = True,
+                 touch_interval: int = 60, touch_batch_size: int = 1000,
+                 max_entries: int = 0, evict_interval: int = 3600):
+        self.model_namespace = model_namespace
+        self.embedding_model = embedding_model
+        self.memory_size = memory_size
+        self.persist = persist and embedding_model is not None
+
+        self.touch_interval = touch_interval
+        self.touch_batch_size = touch_batch_size
+        self.max_entries = max_entries
+        self.evict_interval = evict_interval
+        self.pending_touches = {}
+        self.last_touch_flush = time.monotonic()
+        self.last_evict = None
+
+        self.memory = OrderedDict()
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+        self.logger = logging.getLogger("uvicorn")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        text = unicodedata.normalize("NFKC", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def make_key(self, text: str, document_type: str = None) -> str:
+        raw_key = f"{self.model_namespace}\x1f{document_type or ''}\x1f{self.normalize_text(text)}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def memory_get(self, cache_key: str):
+        vector = self.memory.get(cache_key)
+        if vector is not None:
+            self.memory.move_to_end(cache_key)
+        return vector
+
+    def memory_set(self, cache_key: str, vector: list):
+        self.memory[cache_key] = vector
+        self.memory.move_to_end(cache_key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    async def aembed(self, texts: list, document_type: str, embed_func):
+        """
+        Return one vector per text, calling `embed_func(missing_texts)` only for the
+        texts found in neither tier. Duplicated texts are embedded once.
+        Returns None when embed_func fails.
+        """
+        cache_keys = [ self.make_key(text, document_type) for text in texts ]
+        vectors = {}
+
+        for cache_key in cache_keys:
+            if cache_key in vectors:
+                continue
+            vector = self.memory_get(cache_key)
+            if vector is not None:
+                vectors[cache_key] = vector
+        self.count("memory_hits", document_type, len(vectors))
+        self.touch(vectors)
+
+        missing_keys = [ k for k in dict.fromkeys(cache_keys) if k not in vectors ]
+
+        if missing_keys and self.persist:
+            try:
+                db_vectors = await self.embedding_model.get_embeddings(cache_keys=missing_keys)
+            except Exception as e:
+                self.logger.warning(f"Embedding cache lookup failed: {e}")
+                db_vectors = {}
+
+            for cache_key, vector in db_vectors.items():
+                vectors[cache_key] = vector
+                self.memory_set(cache_key, vector)
+            self.count("db_hits", document_type, len(db_vectors))
+            self.touch(db_vectors)
+            missing_keys = [ k for k in missing_keys if k not in vectors ]
+
+        if missing_keys:
+            self.count("misses", document_type, len(missing_keys))
+
+            text_by_key = {}
+            for cache_key, text in zip(cache_keys, texts):
+                text_by_key.setdefault(cache_key, text)
+            new_vectors = await embed_func([ text_by_key[k] for k in missing_keys ])
+            if not new_vectors or len(new_vectors) != len(missing_keys):
+                return None
+
+            entries = []
+            for cache_key, vector in zip(missing_keys, new_vectors):
+                vectors[cache_key] = vector
+                self.memory_set(cache_key, vector)
+                entries.append({
+                    "cache_key": cache_key,
+                    "model_id": self.model_namespace,
+                    "document_type": document_type,
+                    "embedding": vector,
+                })
+
+            if self.persist:
+                try:
+                    await self.embedding_model.insert_embeddings(entries=entries)
+                except Exception as e:
+                    self.logger.warning(f"Embedding cache write failed: {e}")
+
+        await self.flush_touches()
+
+        return [ vectors[cache_key] for cache_key in cache_keys ]
+
+    def touch(self, cache_keys):
+        if self.persist:
+            for cache_key in cache_keys:
+                self.pending_touches[cache_key] = self.pending_touches.get(cache_key, 0) + 1
+
+    async def flush_touches(self, force: bool = False):
+        """Write the pending hits once due (or forced), then trim the table when its eviction is due."""
+        if not self.persist:
+            return 0
+
+        now = time.monotonic()
+        if not force and len(self.pending_touches) < self.touch_batch_size \
+                and now - self.last_touch_flush < self.touch_interval:
+            return 0
+
+        touches, self.pending_touches = self.pending_touches, {}
+        self.last_touch_flush = now
+
+        touched_count = 0
+        try:
+            touched_count = await self.embedding_model.touch_embeddings(hits=touches)
+        except Exception as e:
+            self.logger.warning(f"Embedding cache touch failed: {e}")
+
+        if self.max_entries and (self.last_evict is None or now - self.last_evict >= self.evict_interval):
+            self.last_evict = now
+            try:
+                removed_count = await self.embedding_model.evict_entries(max_entries=self.max_entries)
+                if removed_count:
+                    self.logger.info(f"Embedding cache evicted {removed_count} entries")
+            except Exception as e:
+                self.logger.warning(f"Embedding cache eviction failed: {e}")
+
+        return touched_count
+
+    def count(self, result: str, document_type: str, value: int):
+        if value:
+            self.stats[result] += value
+            EMBEDDING_CACHE_LOOKUPS.labels(document_type=document_type or "", result=result).inc(value)
+
+    def get_stats(self) -> dict:
+        total = sum(self.stats.values())
+        hits = self.stats["memory_hits"] + self.stats["db_hits"]
+        return {
+            "model_namespace": self.model_namespace,
+            **self.stats,
+            "lookups": total,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "memory_items": len(self.memory),
+            "memory_size": self.memory_size,
+            "persist": self.persist,
+            "pending_touches": len(self.pending_touches),
+            "max_entries": self.max_entries,
+        }
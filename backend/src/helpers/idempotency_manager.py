@@ -1,9 +1,12 @@
 import hashlib
 import json
 from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from models.db_schemes.minirag.schemes.celery_task_execution import CeleryTaskExecution
 
+ACTIVE_TASK_STATUSES = ('PENDING', 'STARTED', 'RETRY')
+
 class IdempotencyManager:
 
     def __init__(self, db_client, db_engine):
@@ -28,7 +31,7 @@ class IdempotencyManager:
             task_args=task_args,
             celery_task_id=celery_task_id,
             status='PENDING',
-            started_at=datetime.utcnow()
+            started_at=datetime.now(timezone.utc)
         )
         
         session = self.db_client()
@@ -40,6 +43,64 @@ class IdempotencyManager:
         finally:
             await session.close()
 
+    async def claim_task_record(self, task_name: str, task_args: dict,
+                                celery_task_id: str = None) -> tuple[CeleryTaskExecution, bool]:
+        """
+        Create a PENDING task record unless one with the same name and args is still active.
+        The partial unique index ux_task_active_name_args_hash makes this atomic between
+        concurrent submitters. Returns (task_record, is_new).
+        """
+        args_hash = self.create_args_hash(task_name, task_args)
+
+        insert_stmt = insert(CeleryTaskExecution).values(
+            task_name=task_name,
+            task_args_hash=args_hash,
+            task_args=task_args,
+            celery_task_id=celery_task_id,
+            status='PENDING',
+            started_at=datetime.now(timezone.utc),
+        ).on_conflict_do_nothing(
+            index_elements=[CeleryTaskExecution.task_name, CeleryTaskExecution.task_args_hash],
+            index_where=CeleryTaskExecution.status.in_(ACTIVE_TASK_STATUSES),
+        ).returning(CeleryTaskExecution.execution_id)
+
+        session = self.db_client()
+        try:
+            result = await session.execute(insert_stmt)
+            execution_id = result.scalar_one_or_none()
+            await session.commit()
+
+            if execution_id is not None:
+                return await session.get(CeleryTaskExecution, execution_id), True
+
+            stmt = select(CeleryTaskExecution).where(
+                CeleryTaskExecution.task_name == task_name,
+                CeleryTaskExecution.task_args_hash == args_hash,
+                CeleryTaskExecution.status.in_(ACTIVE_TASK_STATUSES),
+            ).order_by(CeleryTaskExecution.execution_id.desc()).limit(1)
+            result = await session.execute(stmt)
+            return result.scalars().first(), False
+        finally:
+            await session.close()
+
+    async def expire_task(self, execution_id: int, reason: str = "task stalled") -> bool:
+        """Mark a task that is still active as failed, e.g. one stuck past its time limit."""
+        session = self.db_client()
+        try:
+            stmt = update(CeleryTaskExecution).where(
+                CeleryTaskExecution.execution_id == execution_id,
+                CeleryTaskExecution.status.in_(ACTIVE_TASK_STATUSES),
+            ).values(
+                status='FAILURE',
+                result={"error": reason},
+                completed_at=datetime.now(timezone.utc),
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+            return bool(result.rowcount)
+        finally:
+            await session.close()
+
     async def update_task_status(self, execution_id: int, status: str, result: dict = None):
         """Update task status and result."""
         session = self.db_client()
@@ -49,36 +110,66 @@ class IdempotencyManager:
                 task_record.status = status
                 if result:
                     task_record.result = result
+                if status == 'STARTED':
+                    task_record.started_at = datetime.now(timezone.utc)
                 if status in ['SUCCESS', 'FAILURE']:
-                    task_record.completed_at = datetime.utcnow()
+                    task_record.completed_at = datetime.now(timezone.utc)
                 await session.commit()
         finally:
             await session.close()
 
+    async def update_task_progress(self, execution_id: int, progress: dict):
+        """Store the latest progress snapshot of a running task."""
+        session = self.db_client()
+        try:
+            task_record = await session.get(CeleryTaskExecution, execution_id)
+            if task_record and task_record.status not in ['SUCCESS', 'FAILURE']:
+                task_record.result = {"progress": progress}
+                await session.commit()
+        finally:
+            await session.close()
+
+    async def get_task_record(self, celery_task_id: str) -> CeleryTaskExecution:
+        """Get a task execution record by its task id."""
+        session = self.db_client()
+        try:
+            stmt = select(CeleryTaskExecution).where(
+                CeleryTaskExecution.celery_task_id == celery_task_id
+            )
+            result = await session.execute(stmt)
+            return result.scalars().first()
+        finally:
+            await session.close()
+
     async def get_existing_task(self, task_name: str, 
-                                task_args: dict, celery_task_id: str) -> CeleryTaskExecution:
-        """Check if task with same name and args already exists."""
+                                task_args: dict, celery_task_id: str = None) -> CeleryTaskExecution:
+        """Check if task with same name and args already exists (latest execution first)."""
         args_hash = self.create_args_hash(task_name, task_args)
         
         session = self.db_client()
         try:
             stmt = select(CeleryTaskExecution).where(
-                CeleryTaskExecution.celery_task_id == celery_task_id,
                 CeleryTaskExecution.task_name == task_name,
                 CeleryTaskExecution.task_args_hash == args_hash
             )
+            if celery_task_id is not None:
+                stmt = stmt.where(CeleryTaskExecution.celery_task_id == celery_task_id)
+
+            stmt = stmt.order_by(CeleryTaskExecution.execution_id.desc()).limit(1)
             result = await session.execute(stmt)
-            return result.scalar_one_or_none()
+            return result.scalars().first()
         finally:
             await session.close()
 
     async def should_execute_task(self, task_name: str, task_args: dict,
-                                  celery_task_id: str, 
-                                  task_time_limit: int = 600) -> tuple[bool, CeleryTaskExecution]:
+                                  celery_task_id: str = None, 
+                                  task_time_limit: int = 600,
+                                  success_ttl: int = None) -> tuple[bool, CeleryTaskExecution]:
         """
         Check if task should be executed or return existing result.
         Args:
             task_time_limit: Time limit in seconds after which a stuck task can be re-executed
+            success_ttl: Seconds during which a successful result is reused (None = forever, 0 = never)
         Returns (should_execute, existing_task_or_none)
         """
         existing_task = await self.get_existing_task(task_name, task_args, celery_task_id)
@@ -88,12 +179,16 @@ class IdempotencyManager:
             
         # Don't execute if task is already completed successfully
         if existing_task.status == 'SUCCESS':
+            if success_ttl is not None and existing_task.completed_at:
+                time_elapsed = (datetime.now(timezone.utc) - existing_task.completed_at).total_seconds()
+                if time_elapsed >= success_ttl:
+                    return True, existing_task
             return False, existing_task
             
         # Check if task is stuck (running longer than time limit + 60 seconds)
-        if existing_task.status in ['PENDING', 'STARTED', 'RETRY']:
+        if existing_task.status in ACTIVE_TASK_STATUSES:
             if existing_task.started_at:
-                time_elapsed = (datetime.utcnow() - existing_task.started_at).total_seconds()
+                time_elapsed = (datetime.now(timezone.utc) - existing_task.started_at).total_seconds()
                 time_gap = 60  # 60 seconds grace period
                 if time_elapsed > (task_time_limit + time_gap):
                     return True, existing_task  # Task is stuck, allow re-execution
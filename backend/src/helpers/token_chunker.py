@@ -0,0 +1,134 @@
+from functools import lru_cache
+import logging
+import re
+
+SENTENCE_END_RE = re.compile(r"(?<=[.!?؟。])\s+")
+
+@lru_cache(maxsize=4)
+def get_tokenizer(model_name: str):
+    """Load a tokenizer once per process, None when it cannot be loaded (words are counted instead)."""
+    try:
+        from transformers import AutoTokenizer
+        return AutoTokenizer.from_pretrained(model_name)
+    except Exception as e:
+        logging.getLogger("uvicorn").warning(
+            f"Chunking tokenizer {model_name} unavailable, falling back to word counts: {e}"
+        )
+        return None
+
+class TokenChunker:
+    """
+    Streaming chunker that measures chunk_size and overlap_size in tokens.
+
+    Pages are split into lines and sentences, which are packed into chunks of at most
+    chunk_size tokens; each chunk starts with the last overlap_size tokens of the
+    previous one. Chunks may cross page boundaries, they keep the metadata of the page
+    they start on plus page_end when they run onto a later page.
+    """
+
+    def __init__(self, chunk_size: int = 100, overlap_size: int = 20, tokenizer=None):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        self.chunk_size = chunk_size
+        self.overlap_size = max(0, min(overlap_size, chunk_size // 2))
+        self.tokenizer = tokenizer
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is None:
+            return len(text.split())
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    def split_units(self, text: str):
+        for line in text.split("\n"):
+            line = line.strip()
+            if len(line) <= 1:
+                continue
+            for sentence in SENTENCE_END_RE.split(line):
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+
+                tokens_count = self.count_tokens(sentence)
+                if tokens_count <= self.chunk_size:
+                    yield sentence, tokens_count
+                else:
+                    yield from self.split_long_unit(sentence)
+
+    def split_long_unit(self, text: str):
+        """Cut a sentence longer than chunk_size on word boundaries."""
+        piece, piece_tokens = [], 0
+        for word in text.split():
+            word_tokens = self.count_tokens(word)
+            if piece and piece_tokens + word_tokens > self.chunk_size:
+                yield " ".join(piece), piece_tokens
+                piece, piece_tokens = [], 0
+            piece.append(word)
+            piece_tokens += word_tokens
+
+        if piece:
+            yield " ".join(piece), piece_tokens
+
+    def get_overlap(self, window: list):
+        """Trailing units of the window that fit in overlap_size tokens."""
+        overlap, overlap_tokens = [], 0
+        for text, tokens_count, metadata in reversed(window):
+            if overlap_tokens + tokens_count <= self.overlap_size:
+                overlap.insert(0, (text, tokens_count, metadata))
+                overlap_tokens += tokens_count
+                continue
+
+            # the unit is too long to carry over whole, keep its last words
+            words = []
+            for word in reversed(text.split()):
+                word_tokens = self.count_tokens(word)
+                if overlap_tokens + word_tokens > self.overlap_size:
+                    break
+                words.insert(0, word)
+                overlap_tokens += word_tokens
+            if words:
+                overlap.insert(0, (" ".join(words), self.count_tokens(" ".join(words)), metadata))
+            break
+
+        return overlap
+
+    def make_chunk(self, window: list):
+        first_metadata = window[0][2]
+        last_metadata = window[-1][2]
+
+        metadata = dict(first_metadata)
+        if last_metadata.get("page") != first_metadata.get("page"):
+            metadata["page_end"] = last_metadata.get("page")
+        metadata["chunk_tokens"] = sum(tokens_count for _, tokens_count, _ in window)
+
+        return "\n".join(text for text, _, _ in window), metadata
+
+    def iter_chunks(self, documents):
+        """
+        documents: iterable of objects with page_content and metadata, consumed lazily.
+        Yields (text, metadata) tuples.
+        """
+        window, window_tokens = [], 0
+        # whether the window holds units that were not emitted yet (not only overlap)
+        has_new_units = False
+
+        for document in documents:
+            metadata = document.metadata or {}
+            for text, tokens_count in self.split_units(document.page_content or ""):
+
+                if has_new_units and window_tokens + tokens_count > self.chunk_size:
+                    yield self.make_chunk(window)
+                    window = self.get_overlap(window)
+                    window_tokens = sum(t for _, t, _ in window)
+                    has_new_units = False
+
+                # the overlap never pushes a chunk past chunk_size
+                while window and window_tokens + tokens_count > self.chunk_size:
+                    window_tokens -= window.pop(0)[1]
+
+                window.append((text, tokens_count, metadata))
+                window_tokens += tokens_count
+                has_new_units = True
+
+        if has_new_units:
+            yield self.make_chunk(window)
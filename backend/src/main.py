@@ -1,13 +1,27 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import base, data, nlp, user, conversation, message, personal_projects, auth, project_admin, maturity
+from routes import base, data, nlp, user, conversation, message, personal_projects, auth, project_admin, maturity, jobs
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.LocalEmbeddingEngine import LocalEmbeddingEngine
+from stores.llm.LocalReranker import LocalReranker
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from stores.jobs.JobBrokerFactory import JobBrokerFactory
+from stores.jobs.JobManager import JobManager
+from stores.jobs.JobEnums import JobNameEnums
+from controllers.JobController import JobController
+from helpers.idempotency_manager import IdempotencyManager
+from helpers.embedding_cache import EmbeddingCache
+from helpers.answer_cache import AnswerCache
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from models.ProjectModel import ProjectModel
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 
 from helpers.metrics import setup_metrics
 from models.UserModel import UserModel
@@ -28,7 +42,37 @@ async def startup_span():
         app.db_engine, class_=AsyncSession, expire_on_commit=False
     )
 
-    llm_provider_factory = LLMProviderFactory(settings)
+    # document extraction pool, "spawn" avoids forking a process that already holds torch threads
+    app.processing_max_workers = settings.PROCESSING_MAX_WORKERS or os.cpu_count() or 1
+    app.process_executor = ProcessPoolExecutor(
+        max_workers=app.processing_max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    # serves the queues the pool workers stream chunk batches through
+    app.process_manager = multiprocessing.get_context("spawn").Manager()
+
+    # local embedding model, loaded once and shared by indexing and search
+    app.local_embedding_engine = LocalEmbeddingEngine(
+        model_id=settings.LOCAL_EMBEDDING_MODEL_ID,
+        batch_size=settings.LOCAL_EMBEDDING_BATCH_SIZE,
+        num_threads=settings.LOCAL_EMBEDDING_NUM_THREADS,
+    )
+    if settings.LOCAL_EMBEDDING_WARMUP and settings.EMBEDDING_MODEL_ID == LocalEmbeddingEngine.MODEL_ALIAS:
+        app.local_embedding_engine.warm_up()
+
+    # optional cross-encoder rerank of retrieved chunks
+    app.reranker = None
+    if settings.RERANKER_ENABLED:
+        app.reranker = LocalReranker(
+            model_id=settings.RERANKER_MODEL_ID,
+            batch_size=settings.RERANKER_BATCH_SIZE,
+            max_length=settings.RERANKER_MAX_LENGTH,
+            num_threads=settings.RERANKER_NUM_THREADS,
+        )
+        if settings.RERANKER_WARMUP:
+            app.reranker.warm_up()
+
+    llm_provider_factory = LLMProviderFactory(settings, local_embedding_engine=app.local_embedding_engine)
     vectordb_provider_factory = VectorDBProviderFactory(config=settings, db_client=app.db_client)
 
     # generation client
@@ -39,6 +83,33 @@ async def startup_span():
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
                                              embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    # embedding cache, namespaced by the model that actually produces the vectors
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        embedding_model_namespace = f"{settings.EMBEDDING_BACKEND}:{settings.EMBEDDING_MODEL_ID}:{settings.EMBEDDING_MODEL_SIZE}"
+        if settings.EMBEDDING_MODEL_ID == LocalEmbeddingEngine.MODEL_ALIAS:
+            embedding_model_namespace += f":{settings.LOCAL_EMBEDDING_MODEL_ID}"
+
+        app.embedding_cache = EmbeddingCache(
+            model_namespace=embedding_model_namespace,
+            embedding_model=await EmbeddingCacheModel.create_instance(db_client=app.db_client),
+            memory_size=settings.EMBEDDING_CACHE_MEMORY_SIZE,
+            persist=settings.EMBEDDING_CACHE_PERSIST,
+            touch_interval=settings.EMBEDDING_CACHE_TOUCH_INTERVAL,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            evict_interval=settings.EMBEDDING_CACHE_EVICT_INTERVAL,
+        )
+
+    # semantic cache of RAG answers, invalidated on any project chunks / collection change
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        app.answer_cache = AnswerCache(
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            ttl=settings.ANSWER_CACHE_TTL,
+            max_entries_per_project=settings.ANSWER_CACHE_MAX_ENTRIES,
+            project_model=await ProjectModel.create_instance(db_client=app.db_client),
+        )
     
     
     # vector db client
@@ -51,14 +122,47 @@ async def startup_span():
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
     )
+
+    # background jobs for process / index operations
+    job_controller = JobController(
+        db_client=app.db_client,
+        vectordb_client=app.vectordb_client,
+        generation_client=app.generation_client,
+        embedding_client=app.embedding_client,
+        template_parser=app.template_parser,
+        process_executor=app.process_executor,
+        processing_max_workers=app.processing_max_workers,
+        process_manager=app.process_manager,
+        embedding_cache=app.embedding_cache,
+        answer_cache=app.answer_cache,
+    )
+
+    app.job_manager = JobManager(
+        broker=JobBrokerFactory(config=settings).create(provider=settings.JOB_BROKER_BACKEND),
+        idempotency_manager=IdempotencyManager(db_client=app.db_client, db_engine=app.db_engine),
+        workers=settings.JOB_WORKERS,
+        time_limit=settings.JOB_TIME_LIMIT,
+        dedup_window=settings.JOB_DEDUP_WINDOW,
+        progress_interval=settings.JOB_PROGRESS_INTERVAL,
+    )
+    app.job_manager.register_handler(JobNameEnums.PROCESS.value, job_controller.run_process_job)
+    app.job_manager.register_handler(JobNameEnums.INDEX.value, job_controller.run_index_job)
+    await app.job_manager.start()
     
     # Créer un admin par défaut s'il n'existe pas
     await create_default_admin(app.db_client)
 
 
 async def shutdown_span():
-    app.db_engine.dispose()
+    await app.job_manager.stop()
+    if app.embedding_cache is not None:
+        await app.embedding_cache.flush_touches(force=True)
+    app.process_executor.shutdown(wait=False, cancel_futures=True)
+    app.process_manager.shutdown()
+    await app.db_engine.dispose()
     await app.vectordb_client.disconnect()
+    await app.generation_client.aclose()
+    await app.embedding_client.aclose()
 
 async def create_default_admin(db_client):
     """
@@ -137,3 +241,4 @@ app.include_router(personal_projects.personal_projects_router)
 app.include_router(auth.auth_router)
 app.include_router(project_admin.projects_admin_router)
 app.include_router(maturity.maturity_router)
+app.include_router(jobs.jobs_router)
@@ -0,0 +1,65 @@
+"""
+Move PGVector collections from per-project tables (VECTOR_DB_PGVEC_STORAGE_LAYOUT="per_collection")
+into the shared partitioned tables used by VECTOR_DB_PGVEC_STORAGE_LAYOUT="partitioned".
+
+    python migrate_vector_storage.py [--drop-source]
+
+Each collection is copied in its own transaction and can be migrated again if the run is
+interrupted. Source tables are kept unless --drop-source is given. Run it with the API
+stopped, then switch VECTOR_DB_PGVEC_STORAGE_LAYOUT to "partitioned".
+"""
+from helpers.config import get_settings
+from stores.vectordb.providers import PGVectorPartitionedProvider
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+import argparse
+import asyncio
+import logging
+
+async def migrate(drop_source: bool = False):
+    settings = get_settings()
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(
+        db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    vectordb_client = PGVectorPartitionedProvider(
+        db_client=db_client,
+        partitions=settings.VECTOR_DB_PGVEC_PARTITIONS,
+        distance_method=settings.VECTOR_DB_DISTANCE_METHOD,
+        default_vector_size=settings.EMBEDDING_MODEL_SIZE,
+        index_threshold=settings.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+        index_type=settings.VECTOR_DB_PGVEC_INDEX_TYPE,
+        hnsw_m=settings.VECTOR_DB_PGVEC_HNSW_M,
+        hnsw_ef_construction=settings.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+        ivfflat_lists=settings.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+        maintenance_work_mem=settings.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+        text_search_config=settings.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+    )
+
+    try:
+        await vectordb_client.connect()
+        migrated = await vectordb_client.migrate_collection_tables(drop_source=drop_source)
+    finally:
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+    return migrated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move per-project PGVector tables into shared partitioned tables.")
+    parser.add_argument("--drop-source", action="store_true",
+                        help="drop each per-project table once its rows are copied")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    logging.getLogger("uvicorn").setLevel(logging.INFO)
+
+    migrated = asyncio.run(migrate(drop_source=args.drop_source))
+
+    for collection_name, copied_count in migrated.items():
+        print(f"{collection_name}: {copied_count} vectors")
+    print(f"Migrated {len(migrated)} collections, {sum(migrated.values())} vectors")
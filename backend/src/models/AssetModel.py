@@ -1,8 +1,11 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Asset
 from .enums.DataBaseEnum import DataBaseEnum
+from .enums.AssetTypeEnum import AssetTypeEnum
 from bson import ObjectId
 from sqlalchemy.future import select
+from sqlalchemy import update, cast
+from sqlalchemy.dialects.postgresql import JSONB
 
 class AssetModel(BaseDataModel):
 
@@ -54,5 +57,72 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
         return record
 
+    async def get_project_file_assets(self, asset_project_id: str, asset_name: str = None):
+        """
+        File assets to process: the one named asset_name, or every file of the project.
+        Returns None when a specific asset_name was requested but not found.
+        """
+
+        if asset_name:
+            asset_record = await self.get_asset_record(
+                asset_project_id=asset_project_id,
+                asset_name=asset_name
+            )
+
+            if asset_record is None:
+                return None
+
+            return [ asset_record ]
+
+        return await self.get_all_project_assets(
+            asset_project_id=asset_project_id,
+            asset_type=AssetTypeEnum.FILE.value,
+        )
+
+    async def get_project_files_ids(self, asset_project_id: str, asset_name: str = None):
+        """
+        Map asset_id -> asset_name of the files to process.
+        Returns None when a specific asset_name was requested but not found.
+        """
+
+        project_files = await self.get_project_file_assets(
+            asset_project_id=asset_project_id,
+            asset_name=asset_name
+        )
+
+        if project_files is None:
+            return None
+
+        return {
+            record.asset_id: record.asset_name
+            for record in project_files
+        }
+
+    async def update_asset_config(self, asset_id: int, asset_config: dict):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Asset).where(Asset.asset_id == asset_id).values(asset_config=asset_config)
+                await session.execute(stmt)
+        return asset_config
+
+    async def mark_asset_indexed(self, asset_id: int, processing_fingerprint: str):
+        """
+        Record that the chunks of processing_fingerprint are pushed, unless the asset was
+        re-processed meanwhile. Returns True when the asset was marked.
+        """
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Asset).where(
+                    Asset.asset_id == asset_id,
+                    Asset.asset_config["processing_fingerprint"].astext == processing_fingerprint,
+                ).values(
+                    asset_config=Asset.asset_config.op("||")(
+                        cast({"indexed_fingerprint": processing_fingerprint}, JSONB)
+                    )
+                )
+                result = await session.execute(stmt)
+        return result.rowcount > 0
+
 
-    
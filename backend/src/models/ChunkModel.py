@@ -50,12 +50,55 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
     
+    async def get_asset_chunk_ids(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = select(DataChunk.chunk_id).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            chunk_ids = result.scalars().all()
+        return list(chunk_ids)
+
+    async def delete_chunks_by_asset_id(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+    
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
-            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page_no - 1) * page_size).limit(page_size)
+            stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).order_by(DataChunk.chunk_id).offset((page_no - 1) * page_size).limit(page_size)
             result = await session.execute(stmt)
             records = result.scalars().all()
         return records
+
+    async def iter_project_chunks(self, project_id: int, batch_size: int=500, after_chunk_id: int=0,
+                                  asset_ids: list=None):
+        """
+        Yield the project chunks in batches, ordered by chunk_id (keyset pagination),
+        only those of asset_ids when given.
+        """
+        last_chunk_id = after_chunk_id
+        while True:
+            async with self.db_client() as session:
+                stmt = select(DataChunk).where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id
+                )
+                if asset_ids is not None:
+                    stmt = stmt.where(DataChunk.chunk_asset_id.in_(asset_ids))
+                stmt = stmt.order_by(DataChunk.chunk_id).limit(batch_size)
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+
+            if not records:
+                break
+
+            yield records
+
+            if len(records) < batch_size:
+                break
+
+            last_chunk_id = records[-1].chunk_id
     
     async def get_total_chunks_count(self, project_id: ObjectId):
         total_count = 0
@@ -0,0 +1,89 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy import update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def get_embeddings(self, cache_keys: list):
+        """Return cache_key -> embedding for the keys found (hits are recorded by touch_embeddings)."""
+        if not cache_keys:
+            return {}
+
+        async with self.db_client() as session:
+            stmt = select(EmbeddingCacheEntry.cache_key, EmbeddingCacheEntry.embedding).where(
+                EmbeddingCacheEntry.cache_key.in_(cache_keys)
+            )
+            result = await session.execute(stmt)
+            embeddings = { row.cache_key: list(row.embedding) for row in result }
+
+        return embeddings
+
+    async def touch_embeddings(self, hits: dict):
+        """hits: cache_key -> number of hits since the last touch. Adds them and marks the keys as used."""
+        if not hits:
+            return 0
+
+        keys_by_count = {}
+        for cache_key, count in hits.items():
+            keys_by_count.setdefault(count, []).append(cache_key)
+
+        touched_count = 0
+        async with self.db_client() as session:
+            async with session.begin():
+                for count, cache_keys in keys_by_count.items():
+                    stmt = update(EmbeddingCacheEntry).where(
+                        EmbeddingCacheEntry.cache_key.in_(cache_keys)
+                    ).values(
+                        hit_count=EmbeddingCacheEntry.hit_count + count,
+                        last_used_at=func.now(),
+                    )
+                    result = await session.execute(stmt)
+                    touched_count += result.rowcount
+
+        return touched_count
+
+    async def evict_entries(self, max_entries: int):
+        """Delete the least recently used entries beyond the max_entries most recent ones."""
+        async with self.db_client() as session:
+            async with session.begin():
+                stale_keys = select(EmbeddingCacheEntry.cache_key).order_by(
+                    EmbeddingCacheEntry.last_used_at.desc()
+                ).offset(max_entries)
+                stmt = delete(EmbeddingCacheEntry).where(EmbeddingCacheEntry.cache_key.in_(stale_keys))
+                result = await session.execute(stmt)
+
+        return result.rowcount
+
+    async def insert_embeddings(self, entries: list):
+        """entries: dicts with cache_key, model_id, document_type and embedding."""
+        if not entries:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = insert(EmbeddingCacheEntry).values([
+                    { **entry, "hit_count": 0 } for entry in entries
+                ]).on_conflict_do_nothing(index_elements=[EmbeddingCacheEntry.cache_key])
+                await session.execute(stmt)
+
+        return len(entries)
+
+    async def get_entries_count(self, model_id: str = None):
+        async with self.db_client() as session:
+            stmt = select(func.count(EmbeddingCacheEntry.cache_key))
+            if model_id:
+                stmt = stmt.where(EmbeddingCacheEntry.model_id == model_id)
+            result = await session.execute(stmt)
+            return result.scalar()
+
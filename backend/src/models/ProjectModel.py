@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update, or_
 
 class ProjectModel(BaseDataModel):
 
@@ -98,6 +98,30 @@ class ProjectModel(BaseDataModel):
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
+    async def get_projects_by_ids(self, project_ids: list, user_id: int = None):
+        """Récupérer en une requête les projets publics parmi project_ids, et ceux de user_id"""
+        async with self.db_client() as session:
+            visible = Project.visibility == 'public'
+            if user_id is not None:
+                visible = or_(visible, Project.user_id == user_id)
+
+            query = select(Project).where(Project.project_id.in_(project_ids), visible)
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    async def bump_answer_cache_generation(self, project_id: int):
+        """Incrémenter la génération du cache de réponses, retourne la nouvelle valeur"""
+        async with self.db_client() as session:
+            async with session.begin():
+                query = (
+                    update(Project)
+                    .where(Project.project_id == project_id)
+                    .values(answer_cache_generation=Project.answer_cache_generation + 1)
+                    .returning(Project.answer_cache_generation)
+                )
+                result = await session.execute(query)
+                return result.scalar_one_or_none()
+
     async def get_projects_by_user(self, user_id: int, page: int = 1, page_size: int = 10):
         """Récupérer tous les projets d'un utilisateur avec pagination"""
         async with self.db_client() as session:
@@ -0,0 +1,26 @@
+"""add chunk project keyset index
+
+Revision ID: 3a1f9c2e7b10
+Revises: c8f54b2d8b6d
+Create Date: 2026-10-17 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a1f9c2e7b10'
+down_revision: Union[str, None] = 'c8f54b2d8b6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='chunks')
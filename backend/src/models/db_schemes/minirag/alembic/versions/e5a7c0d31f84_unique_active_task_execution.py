@@ -0,0 +1,41 @@
+"""unique active task execution
+
+Revision ID: e5a7c0d31f84
+Revises: b41e7c3d9a20
+Create Date: 2026-10-17 14:12:05.384210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c0d31f84'
+down_revision: Union[str, None] = 'b41e7c3d9a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep only the latest active execution of each task / args before enforcing uniqueness
+    op.execute("""
+        UPDATE celery_task_executions t
+        SET status = 'FAILURE', completed_at = now()
+        WHERE t.status IN ('PENDING', 'STARTED', 'RETRY')
+        AND EXISTS (
+            SELECT 1 FROM celery_task_executions newer
+            WHERE newer.task_name = t.task_name
+            AND newer.task_args_hash = t.task_args_hash
+            AND newer.status IN ('PENDING', 'STARTED', 'RETRY')
+            AND newer.execution_id > t.execution_id
+        )
+    """)
+    op.create_index('ux_task_active_name_args_hash', 'celery_task_executions',
+                    ['task_name', 'task_args_hash'], unique=True,
+                    postgresql_where=sa.text("status IN ('PENDING', 'STARTED', 'RETRY')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ux_task_active_name_args_hash', table_name='celery_task_executions')
@@ -0,0 +1,27 @@
+"""add project answer cache generation
+
+Revision ID: f2b8d46c0e19
+Revises: e5a7c0d31f84
+Create Date: 2026-10-17 14:48:31.902771
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d46c0e19'
+down_revision: Union[str, None] = 'e5a7c0d31f84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('answer_cache_generation', sa.Integer(),
+                                        server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'answer_cache_generation')
@@ -5,3 +5,5 @@ from .datachunk import DataChunk, RetrievedDocument
 from .user import User, UserRole
 from .conversation import Conversation
 from .message import Message
+from .celery_task_execution import CeleryTaskExecution
+from .embedding_cache import EmbeddingCacheEntry
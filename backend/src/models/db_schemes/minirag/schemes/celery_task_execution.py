@@ -0,0 +1,34 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index, text
+
+class CeleryTaskExecution(SQLAlchemyBase):
+
+    __tablename__ = "celery_task_executions"
+
+    execution_id = Column(Integer, primary_key=True, autoincrement=True)
+
+    task_name = Column(String(255), nullable=False)
+    task_args_hash = Column(String(64), nullable=False)
+    task_args = Column(JSONB, nullable=True)
+    celery_task_id = Column(String(255), nullable=True)
+
+    status = Column(String(20), nullable=False, default='PENDING')
+    result = Column(JSONB, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('ix_task_name_args_hash', task_name, task_args_hash),
+        Index('ix_task_celery_task_id', celery_task_id),
+        Index('ix_task_status', status),
+        Index('ix_task_created_at', created_at),
+        # at most one pending / running execution per task and args
+        Index('ux_task_active_name_args_hash', task_name, task_args_hash, unique=True,
+              postgresql_where=text("status IN ('PENDING', 'STARTED', 'RETRY')")),
+    )
@@ -4,6 +4,7 @@ from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
 from pydantic import BaseModel
+from typing import Optional
 import uuid
 
 class DataChunk(SQLAlchemyBase):
@@ -29,8 +30,16 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
     )
 
 class RetrievedDocument(BaseModel):
-    text: str
+    # None when the search was asked to leave texts out
+    text: Optional[str] = None
     score: float
+    chunk_id: Optional[int] = None
+    asset_id: Optional[int] = None
+    chunk_order: Optional[int] = None
+    metadata: Optional[dict] = None
+    # set by searches spanning several projects
+    project_id: Optional[int] = None
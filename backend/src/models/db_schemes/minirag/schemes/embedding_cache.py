@@ -0,0 +1,24 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, Float
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Index
+
+class EmbeddingCacheEntry(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    # sha256 of normalized text + embedding model + document type
+    cache_key = Column(String(64), primary_key=True)
+
+    model_id = Column(String(255), nullable=False)
+    document_type = Column(String(32), nullable=True)
+    embedding = Column(ARRAY(Float), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_embedding_cache_model_id', model_id),
+        Index('ix_embedding_cache_last_used_at', last_used_at),
+    )
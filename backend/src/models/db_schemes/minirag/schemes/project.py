@@ -18,6 +18,9 @@ class Project(SQLAlchemyBase):
         nullable=False,
         server_default='private'
     )
+    # bumped whenever the project's chunks or collection change, cached RAG answers
+    # from an older generation are discarded by every API replica
+    answer_cache_generation = Column(Integer, nullable=False, server_default='0')
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
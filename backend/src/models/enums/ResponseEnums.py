@@ -17,6 +17,12 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
+    FEDERATED_SEARCH_PROJECTS_ERROR = "federated_search_projects_error"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
-    
\ No newline at end of file
+    JOB_SUBMITTED = "job_submitted"
+    JOB_DEDUPLICATED = "job_deduplicated"
+    JOB_RETRIEVED = "job_retrieved"
+    JOB_NOT_FOUND = "job_not_found"
+    EMBEDDING_CACHE_STATS_RETRIEVED = "embedding_cache_stats_retrieved"
+    ANSWER_CACHE_STATS_RETRIEVED = "answer_cache_stats_retrieved"
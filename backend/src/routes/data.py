@@ -2,6 +2,7 @@ from time import process_time
 from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 import os
+import hashlib
 from helpers.config import get_settings, Settings
 from controllers import DataController, ProjectController, ProcessController
 import aiofiles
@@ -15,7 +16,6 @@ from models.db_schemes import DataChunk, Asset
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import NLPController
 from sqlalchemy import delete
-from sqlalchemy.sql import text as sql_text
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -94,9 +94,11 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
         project_id=project_id
     )
 
+    content_hash = hashlib.sha256()
     try:
         async with aiofiles.open(file_path, "wb") as f:
             while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                content_hash.update(chunk)
                 await f.write(chunk)
     except Exception as e:
 
@@ -118,7 +120,10 @@ async def upload_data(request: Request, project_id: int, file: UploadFile,
         asset_project_id=project.project_id,
         asset_type=AssetTypeEnum.FILE.value,
         asset_name=file_id,
-        asset_size=os.path.getsize(file_path)
+        asset_size=os.path.getsize(file_path),
+        asset_config={
+            "content_hash": content_hash.hexdigest(),
+        }
     )
 
     asset_record = await asset_model.create_asset(asset=asset_resource)
@@ -151,46 +156,28 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
     )
 
     asset_model = await AssetModel.create_instance(
             db_client=request.app.db_client
         )
 
-    project_files_ids = {}
-    if process_request.file_id:
-        asset_record = await asset_model.get_asset_record(
-            asset_project_id=project.project_id,
-            asset_name=process_request.file_id
-        )
-
-        if asset_record is None:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.FILE_ID_ERROR.value,
-                }
-            )
+    project_assets = await asset_model.get_project_file_assets(
+        asset_project_id=project.project_id,
+        asset_name=process_request.file_id
+    )
 
-        project_files_ids = {
-            asset_record.asset_id: asset_record.asset_name
-        }
-    
-    else:
-        
-        project_files = await asset_model.get_all_project_assets(
-            asset_project_id=project.project_id,
-            asset_type=AssetTypeEnum.FILE.value,
+    if project_assets is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FILE_ID_ERROR.value,
+            }
         )
 
-        project_files_ids = {
-            record.asset_id: record.asset_name
-            for record in project_files
-        }
-        print("project_files_id: ----------------------------L HNA")
-        print(project_files_ids)
-
-    if len(project_files_ids) == 0:
+    if len(project_assets) == 0:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -200,65 +187,57 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
     
     process_controller = ProcessController(project_id=project_id)
 
-    no_records = 0
-    no_files = 0
-
     chunk_model = await ChunkModel.create_instance(
                         db_client=request.app.db_client
                     )
 
     if do_reset == 1:
         # delete associated vectors collection
-        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
-        _ = await request.app.vectordb_client.delete_collection(collection_name=collection_name)
+        _ = await nlp_controller.reset_vector_db_collection(project=project)
 
         # delete associated chunks
         _ = await chunk_model.delete_chunks_by_project_id(
             project_id=project.project_id
         )
 
-    for asset_id, file_id in project_files_ids.items():
-
-        file_content = process_controller.get_file_content(file_id=file_id)
+    # only assets whose content or processing settings changed are re-processed
+    project_files_ids, asset_configs = await process_controller.get_changed_assets(
+        assets=project_assets,
+        asset_model=asset_model,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        force=do_reset == 1,
+    )
 
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
-            continue
+    process_result = await process_controller.process_assets(
+        project_files_ids=project_files_ids,
+        chunk_model=chunk_model,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        executor=request.app.process_executor,
+        max_in_flight=request.app.processing_max_workers,
+        queue_manager=request.app.process_manager,
+        nlp_controller=nlp_controller,
+        asset_model=asset_model,
+        asset_configs=asset_configs,
+    )
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size
+    if process_result is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROCESSING_FAILED.value
+            }
         )
 
-        if file_chunks is None or len(file_chunks) == 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.PROCESSING_FAILED.value
-                }
-            )
-
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
-
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+    no_records, no_files = process_result
 
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
             "inserted_chunks": no_records,
-            "processed_files": no_files
+            "processed_files": no_files,
+            "skipped_files": len(project_assets) - len(project_files_ids)
         }
     )
 
@@ -306,20 +285,21 @@ async def delete_asset_endpoint(request: Request, project_id: int, asset_name: s
             generation_client=request.app.generation_client,
             embedding_client=request.app.embedding_client,
             template_parser=request.app.template_parser,
+            embedding_cache=request.app.embedding_cache,
+            answer_cache=request.app.answer_cache,
+        )
+        chunk_model = await ChunkModel.create_instance(
+            db_client=request.app.db_client
         )
-        collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
 
         # collect chunk ids for this asset
-        async with request.app.db_client() as session:
-            chunk_ids_sql = sql_text('SELECT chunk_id FROM chunks WHERE chunk_asset_id = :asset_id')
-            result = await session.execute(chunk_ids_sql, {"asset_id": asset_record.asset_id})
-            chunk_ids = [row[0] for row in result.fetchall()]
+        chunk_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset_record.asset_id)
 
         if len(chunk_ids):
-            async with request.app.db_client() as session:
-                delete_vectors_sql = sql_text(f'DELETE FROM {collection_name} WHERE chunk_id = ANY(:chunk_ids)')
-                await session.execute(delete_vectors_sql, {"chunk_ids": chunk_ids})
-                await session.commit()
+            _ = await nlp_controller.delete_vectors_by_chunk_ids(
+                project_id=project.project_id,
+                chunk_ids=chunk_ids,
+            )
     except Exception as e:
         logger.error(f"Error deleting vectors for asset '{asset_name}': {e}")
 
@@ -334,6 +314,9 @@ async def delete_asset_endpoint(request: Request, project_id: int, asset_name: s
             )
         await session.commit()
 
+    if request.app.answer_cache is not None:
+        await request.app.answer_cache.ainvalidate(project_id=project.project_id)
+
     return JSONResponse(
         content={
             "signal": "asset_delete_success",
@@ -0,0 +1,108 @@
+from fastapi import APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from routes.schemes.data import ProcessRequest
+from routes.schemes.nlp import PushRequest
+from models.ProjectModel import ProjectModel
+from models import ResponseSignal
+from stores.jobs.JobEnums import JobNameEnums
+
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"],
+)
+
+def serialize_job(task_record):
+    result = task_record.result or {}
+    return {
+        "job_id": task_record.celery_task_id,
+        "job_name": task_record.task_name,
+        "status": task_record.status,
+        "progress": result.get("progress"),
+        "result": {k: v for k, v in result.items() if k != "progress"} or None,
+        "created_at": task_record.created_at.isoformat() if task_record.created_at else None,
+        "started_at": task_record.started_at.isoformat() if task_record.started_at else None,
+        "completed_at": task_record.completed_at.isoformat() if task_record.completed_at else None,
+    }
+
+async def submit_job(request: Request, job_name: str, task_args: dict):
+
+    task_record, is_new = await request.app.job_manager.submit(
+        task_name=job_name,
+        task_args=task_args,
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_SUBMITTED.value if is_new else ResponseSignal.JOB_DEDUPLICATED.value,
+            **serialize_job(task_record),
+        }
+    )
+
+@jobs_router.post("/process/{project_id}")
+async def submit_process_job(request: Request, project_id: int, process_request: ProcessRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    return await submit_job(request, JobNameEnums.PROCESS.value, {
+        "project_id": project.project_id,
+        "file_id": process_request.file_id,
+        "chunk_size": process_request.chunk_size,
+        "overlap_size": process_request.overlap_size,
+        "do_reset": process_request.do_reset,
+    })
+
+@jobs_router.post("/index/{project_id}")
+async def submit_index_job(request: Request, project_id: int, push_request: PushRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+
+    return await submit_job(request, JobNameEnums.INDEX.value, {
+        "project_id": project.project_id,
+        "do_reset": push_request.do_reset,
+        "batch_size": push_request.batch_size,
+    })
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(request: Request, job_id: str):
+
+    task_record = await request.app.job_manager.get_job(job_id=job_id)
+
+    if task_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            **serialize_job(task_record),
+        }
+    )
@@ -1,12 +1,16 @@
-from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi import FastAPI, APIRouter, Depends, status, Request, Header
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, FederatedSearchRequest
+from helpers.config import get_settings, Settings
+from helpers.security import decode_token
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
 from controllers import NLPController
 from models import ResponseSignal
 from tqdm.auto import tqdm
 
+import json
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -16,8 +20,12 @@ nlp_router = APIRouter(
     tags=["api_v1", "nlp"],
 )
 
+def format_sse_event(event: str, data: dict):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @nlp_router.post("/index/push/{project_id}")
-async def index_project(request: Request, project_id: int, push_request: PushRequest):
+async def index_project(request: Request, project_id: int, push_request: PushRequest,
+                        app_settings: Settings = Depends(get_settings)):
 
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
@@ -27,6 +35,10 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         db_client=request.app.db_client
     )
 
+    asset_model = await AssetModel.create_instance(
+        db_client=request.app.db_client
+    )
+
     project = await project_model.get_project_or_create_one(
         project_id=project_id
     )
@@ -44,59 +56,70 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
-    )
-
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
-    # create collection if not exists
-    collection_name = nlp_controller.create_collection_name(project_id=project.project_id)
-
-    _ = await request.app.vectordb_client.create_collection(
-        collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
     )
 
     # setup batching
     total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
     pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
 
-    while has_records:
-        page_chunks = await chunk_model.get_poject_chunks(project_id=project.project_id, page_no=page_no)
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
+    inserted_items_count, index_info = await nlp_controller.index_project(
+        project=project,
+        chunk_model=chunk_model,
+        asset_model=asset_model,
+        do_reset=push_request.do_reset,
+        fetch_batch_size=push_request.batch_size or app_settings.INDEXING_FETCH_BATCH_SIZE,
+        embed_batch_size=app_settings.INDEXING_EMBED_BATCH_SIZE,
+        queue_size=app_settings.INDEXING_QUEUE_SIZE,
+        progress_callback=pbar.update,
+    )
 
-        chunks_ids =  [ c.chunk_id for c in page_chunks ]
-        idx += len(page_chunks)
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
+            }
+        )
         
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+            "inserted_items_count": inserted_items_count,
+            "index_info": index_info
+        }
+    )
+
+@nlp_router.get("/embedding-cache/stats")
+async def get_embedding_cache_stats(request: Request):
+
+    embedding_cache = request.app.embedding_cache
+    stats = embedding_cache.get_stats() if embedding_cache else None
+
+    if stats and embedding_cache.persist:
+        stats["persisted_items"] = await embedding_cache.embedding_model.get_entries_count(
+            model_id=embedding_cache.model_namespace
         )
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.EMBEDDING_CACHE_STATS_RETRIEVED.value,
+            "enabled": embedding_cache is not None,
+            "stats": stats
+        }
+    )
+
+@nlp_router.get("/answer-cache/stats")
+async def get_answer_cache_stats(request: Request):
+
+    answer_cache = request.app.answer_cache
 
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
-        
     return JSONResponse(
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignal.ANSWER_CACHE_STATS_RETRIEVED.value,
+            "enabled": answer_cache is not None,
+            "stats": answer_cache.get_stats() if answer_cache else None
         }
     )
 
@@ -116,6 +139,8 @@ async def get_project_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
     )
 
     collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
@@ -143,10 +168,16 @@ async def search_index(request: Request, project_id: int, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
+        reranker=request.app.reranker,
     )
 
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project, text=search_request.text, limit=search_request.limit,
+        search_mode=search_request.search_mode,
+        filters=search_request.get_filters(),
+        include_text=search_request.include_text is not False,
     )
 
     if not results:
@@ -164,6 +195,81 @@ async def search_index(request: Request, project_id: int, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search-federated")
+async def search_projects_indexes(request: Request, search_request: FederatedSearchRequest,
+                                  app_settings: Settings = Depends(get_settings),
+                                  authorization: str | None = Header(default=None)):
+    """Search public projects, plus the caller's own projects when a Bearer token is given."""
+
+    current_user_id = None
+    if authorization:
+        if not authorization.lower().startswith("bearer "):
+            return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"signal": "unauthorized"})
+        try:
+            token_data = decode_token(authorization.split(" ", 1)[1])
+            current_user_id = int(token_data.get("sub"))
+        except Exception:
+            return JSONResponse(status_code=status.HTTP_401_UNAUTHORIZED, content={"signal": "invalid_token"})
+
+    project_ids = list(dict.fromkeys(search_request.project_ids))
+    if not project_ids or len(project_ids) > app_settings.FEDERATED_SEARCH_MAX_PROJECTS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.FEDERATED_SEARCH_PROJECTS_ERROR.value,
+                "max_projects": app_settings.FEDERATED_SEARCH_MAX_PROJECTS,
+            }
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    # private projects of other users are reported as missing, like unknown ids
+    projects = await project_model.get_projects_by_ids(project_ids=project_ids, user_id=current_user_id)
+    if not projects:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
+        reranker=request.app.reranker,
+    )
+
+    results = await nlp_controller.search_projects_collections(
+        projects=projects, text=search_request.text, limit=search_request.limit,
+        search_mode=search_request.search_mode,
+        filters=search_request.get_filters(),
+        include_text=search_request.include_text is not False,
+    )
+
+    if not results:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    found_project_ids = { project.project_id for project in projects }
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [ result.dict()  for result in results ],
+            "missing_project_ids": [ pid for pid in project_ids if pid not in found_project_ids ],
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
     
@@ -180,12 +286,17 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
+        reranker=request.app.reranker,
     )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        search_mode=search_request.search_mode,
+        filters=search_request.get_filters(),
     )
 
     if not answer:
@@ -204,3 +315,81 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             "chat_history": chat_history
         }
     )
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(request: Request, project_id: int, search_request: SearchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        embedding_cache=request.app.embedding_cache,
+        answer_cache=request.app.answer_cache,
+        reranker=request.app.reranker,
+    )
+
+    retrieved_documents, full_prompt, chat_history = await nlp_controller.construct_rag_prompt(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        search_mode=search_request.search_mode,
+        filters=search_request.get_filters(),
+    )
+
+    if not retrieved_documents:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+                }
+        )
+
+    async def event_stream():
+        # retrieval metadata goes out before the first generated token
+        yield format_sse_event("metadata", {
+            "documents": [ doc.dict() for doc in retrieved_documents ],
+        })
+
+        answer_parts = []
+        try:
+            async for token in nlp_controller.stream_rag_answer(
+                full_prompt=full_prompt,
+                chat_history=chat_history
+            ):
+                answer_parts.append(token)
+                yield format_sse_event("token", {"text": token})
+        except Exception as e:
+            logger.error(f"Error while streaming RAG answer: {e}")
+            yield format_sse_event("error", {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+            })
+            return
+
+        if not answer_parts:
+            yield format_sse_event("error", {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+            })
+            return
+
+        yield format_sse_event("done", {
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "answer": "".join(answer_parts),
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
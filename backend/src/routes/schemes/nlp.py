@@ -1,9 +1,30 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Literal, Optional, Union
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    batch_size: Optional[int] = None
+
+class SearchFilters(BaseModel):
+    asset_ids: Optional[List[int]] = None
+    chunk_ids: Optional[List[int]] = None
+    # inclusive range on the chunk's page (slide number for PowerPoint)
+    page_from: Optional[int] = None
+    page_to: Optional[int] = None
+    # exact matches on chunk metadata, e.g. {"format": "powerpoint"}
+    metadata: Optional[Dict[str, Union[str, int, float, bool]]] = None
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    # "vector" or "hybrid", the VECTOR_DB_SEARCH_MODE setting when omitted
+    search_mode: Optional[Literal["vector", "hybrid"]] = None
+    filters: Optional[SearchFilters] = None
+    # /index/search only: leave chunk texts out when only ids and metadata are needed
+    include_text: Optional[bool] = True
+
+    def get_filters(self):
+        return self.filters.dict(exclude_none=True) if self.filters else None
+
+class FederatedSearchRequest(SearchRequest):
+    project_ids: List[int]
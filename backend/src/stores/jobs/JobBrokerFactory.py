@@ -0,0 +1,18 @@
+from .providers import LocalJobBroker, RedisJobBroker
+from .JobEnums import JobBrokerEnums
+
+class JobBrokerFactory:
+    def __init__(self, config):
+        self.config = config
+
+    def create(self, provider: str):
+        if provider == JobBrokerEnums.LOCAL.value:
+            return LocalJobBroker()
+
+        if provider == JobBrokerEnums.REDIS.value:
+            return RedisJobBroker(
+                url=self.config.JOB_BROKER_URL,
+                queue_name=self.config.JOB_BROKER_QUEUE_NAME,
+            )
+
+        return None
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+class JobBrokerInterface(ABC):
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def enqueue(self, message: dict):
+        pass
+
+    @abstractmethod
+    async def dequeue(self, timeout: float = 1.0) -> dict:
+        """Return the next message, or None when nothing arrived within timeout."""
+        pass
@@ -0,0 +1,15 @@
+from enum import Enum
+
+class JobBrokerEnums(Enum):
+    LOCAL = "LOCAL"
+    REDIS = "REDIS"
+
+class JobStatusEnums(Enum):
+    PENDING = "PENDING"
+    STARTED = "STARTED"
+    SUCCESS = "SUCCESS"
+    FAILURE = "FAILURE"
+
+class JobNameEnums(Enum):
+    PROCESS = "data.process"
+    INDEX = "nlp.index_push"
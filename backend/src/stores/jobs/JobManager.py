@@ -0,0 +1,211 @@
+from .JobEnums import JobStatusEnums
+import asyncio
+import inspect
+import logging
+import time
+import uuid
+
+class JobProgress:
+    """Progress reporter handed to job handlers, writes are throttled to one per interval."""
+
+    def __init__(self, idempotency_manager, execution_id: int, interval: float = 2.0):
+        self.idempotency_manager = idempotency_manager
+        self.execution_id = execution_id
+        self.interval = interval
+
+        self.done = 0
+        self.total = None
+        self.stage = None
+        self.last_report = 0.0
+
+    def snapshot(self) -> dict:
+        return {"stage": self.stage, "done": self.done, "total": self.total}
+
+    async def report(self, done: int = None, total: int = None,
+                     stage: str = None, advance: int = None, force: bool = False):
+        if stage is not None:
+            self.stage = stage
+        if total is not None:
+            self.total = total
+        if done is not None:
+            self.done = done
+        if advance is not None:
+            self.done += advance
+
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+
+        self.last_report = now
+        await self.idempotency_manager.update_task_progress(
+            execution_id=self.execution_id,
+            progress=self.snapshot(),
+        )
+
+    async def advance(self, count: int):
+        await self.report(advance=count)
+
+
+class JobManager:
+    """
+    Accepts background jobs, deduplicates identical submissions through the
+    IdempotencyManager and runs them on a pool of asyncio workers fed by a broker.
+
+    Jobs such as process / index also depend on project state that is not part of their
+    args (new uploads, new chunks), so by default only submissions identical to a job
+    that is still pending or running are deduplicated; dedup_window > 0 additionally
+    reuses results of jobs that succeeded within that many seconds.
+    """
+
+    def __init__(self, broker, idempotency_manager, workers: int = 2,
+                 time_limit: int = 3600, dedup_window: int = 0,
+                 progress_interval: float = 2.0):
+        self.broker = broker
+        self.idempotency_manager = idempotency_manager
+        self.workers = workers
+        self.time_limit = time_limit
+        self.dedup_window = dedup_window
+        self.progress_interval = progress_interval
+
+        self.handlers = {}
+        self.worker_tasks = []
+        self.logger = logging.getLogger("uvicorn")
+
+    def register_handler(self, task_name: str, handler):
+        """handler(task_args: dict, progress: JobProgress) -> dict"""
+        self.handlers[task_name] = handler
+
+    async def start(self):
+        await self.broker.connect()
+        self.worker_tasks = [
+            asyncio.create_task(self.worker_loop(worker_id=i))
+            for i in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self.worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        await self.broker.disconnect()
+
+    async def submit(self, task_name: str, task_args: dict):
+        """
+        Queue a job unless an identical one is still pending / running, or succeeded
+        within the dedup window. Returns (task_record, is_new).
+        """
+        if task_name not in self.handlers:
+            raise ValueError(f"No handler registered for job: {task_name}")
+
+        should_execute, existing_task = await self.idempotency_manager.should_execute_task(
+            task_name=task_name,
+            task_args=task_args,
+            task_time_limit=self.time_limit,
+            success_ttl=self.dedup_window,
+        )
+
+        if not should_execute:
+            return existing_task, False
+
+        if existing_task is not None and existing_task.status in (JobStatusEnums.PENDING.value,
+                                                                  JobStatusEnums.STARTED.value):
+            # stuck past its time limit, retire it so a new run can be claimed
+            _ = await self.idempotency_manager.expire_task(execution_id=existing_task.execution_id)
+
+        # a concurrent submit may have claimed the same job since the check above
+        task_record, is_new = await self.idempotency_manager.claim_task_record(
+            task_name=task_name,
+            task_args=task_args,
+            celery_task_id=uuid.uuid4().hex,
+        )
+        if not is_new:
+            return task_record, False
+
+        await self.broker.enqueue({
+            "job_id": task_record.celery_task_id,
+            "execution_id": task_record.execution_id,
+            "task_name": task_name,
+            "task_args": task_args,
+        })
+
+        return task_record, True
+
+    async def get_job(self, job_id: str):
+        return await self.idempotency_manager.get_task_record(celery_task_id=job_id)
+
+    async def worker_loop(self, worker_id: int):
+        while True:
+            try:
+                message = await self.broker.dequeue(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Job worker {worker_id} failed to read from broker: {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            if message is None:
+                continue
+
+            await self.run_job(message)
+
+    async def run_job(self, message: dict):
+        execution_id = message["execution_id"]
+        handler = self.handlers.get(message["task_name"])
+
+        if handler is None:
+            await self.idempotency_manager.update_task_status(
+                execution_id=execution_id,
+                status=JobStatusEnums.FAILURE.value,
+                result={"error": f"No handler registered for job: {message['task_name']}"},
+            )
+            return
+
+        await self.idempotency_manager.update_task_status(
+            execution_id=execution_id,
+            status=JobStatusEnums.STARTED.value,
+        )
+
+        progress = JobProgress(
+            idempotency_manager=self.idempotency_manager,
+            execution_id=execution_id,
+            interval=self.progress_interval,
+        )
+
+        try:
+            result = handler(message["task_args"], progress)
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, timeout=self.time_limit)
+        except asyncio.CancelledError:
+            await self.idempotency_manager.update_task_status(
+                execution_id=execution_id,
+                status=JobStatusEnums.FAILURE.value,
+                result={"error": "job cancelled", "progress": progress.snapshot()},
+            )
+            raise
+        except asyncio.TimeoutError:
+            self.logger.error(f"Job {message['job_id']} exceeded time limit of {self.time_limit}s")
+            await self.idempotency_manager.update_task_status(
+                execution_id=execution_id,
+                status=JobStatusEnums.FAILURE.value,
+                result={"error": "time limit exceeded", "progress": progress.snapshot()},
+            )
+            return
+        except Exception as e:
+            self.logger.error(f"Job {message['job_id']} failed: {e}")
+            await self.idempotency_manager.update_task_status(
+                execution_id=execution_id,
+                status=JobStatusEnums.FAILURE.value,
+                result={"error": str(e), "progress": progress.snapshot()},
+            )
+            return
+
+        # handlers return {"failed": True, ...} for expected business errors
+        result = result or {}
+        status = JobStatusEnums.FAILURE.value if result.pop("failed", False) else JobStatusEnums.SUCCESS.value
+
+        await self.idempotency_manager.update_task_status(
+            execution_id=execution_id,
+            status=status,
+            result={**result, "progress": progress.snapshot()},
+        )
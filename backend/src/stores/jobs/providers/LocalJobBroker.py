@@ -0,0 +1,30 @@
+from ..JobBrokerInterface import JobBrokerInterface
+import asyncio
+import logging
+
+class LocalJobBroker(JobBrokerInterface):
+    """In-process broker: jobs live in an asyncio.Queue and are lost on restart."""
+
+    def __init__(self, max_size: int = 0):
+        self.max_size = max_size
+        self.queue = None
+        self.logger = logging.getLogger("uvicorn")
+
+    async def connect(self):
+        # the queue must be created inside the running event loop
+        self.queue = asyncio.Queue(maxsize=self.max_size)
+
+    async def disconnect(self):
+        if self.queue is not None and not self.queue.empty():
+            self.logger.warning(f"Local job broker stopped with {self.queue.qsize()} queued jobs")
+        self.queue = None
+
+    async def enqueue(self, message: dict):
+        await self.queue.put(message)
+        return True
+
+    async def dequeue(self, timeout: float = 1.0):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
@@ -0,0 +1,36 @@
+from ..JobBrokerInterface import JobBrokerInterface
+import json
+import logging
+
+class RedisJobBroker(JobBrokerInterface):
+    """Redis list broker (LPUSH / BRPOP), lets several API replicas share the workers."""
+
+    def __init__(self, url: str, queue_name: str):
+        self.url = url
+        self.queue_name = queue_name
+        self.client = None
+        self.logger = logging.getLogger("uvicorn")
+
+    async def connect(self):
+        # optional dependency, only needed when JOB_BROKER_BACKEND=REDIS
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(self.url)
+        await self.client.ping()
+
+    async def disconnect(self):
+        if self.client is not None:
+            await self.client.aclose()
+        self.client = None
+
+    async def enqueue(self, message: dict):
+        await self.client.lpush(self.queue_name, json.dumps(message, default=str))
+        return True
+
+    async def dequeue(self, timeout: float = 1.0):
+        item = await self.client.brpop(self.queue_name, timeout=max(1, int(timeout)))
+        if item is None:
+            return None
+
+        _, payload = item
+        return json.loads(payload)
@@ -0,0 +1,2 @@
+from .LocalJobBroker import LocalJobBroker
+from .RedisJobBroker import RedisJobBroker
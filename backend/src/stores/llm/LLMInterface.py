@@ -19,6 +19,30 @@ class LLMInterface(ABC):
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        pass
+
+    @abstractmethod
+    def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                           temperature: float = None):
+        """Async generator yielding the generated text piece by piece."""
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def aclose(self):
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Number of tokens text takes for the generation model."""
+        pass
@@ -3,8 +3,9 @@ from .LLMEnums import LLMEnums
 from .providers import OpenAIProvider, CoHereProvider
 
 class LLMProviderFactory:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, local_embedding_engine=None):
         self.config = config
+        self.local_embedding_engine = local_embedding_engine
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
@@ -13,7 +14,11 @@ class LLMProviderFactory:
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                local_embedding_engine=self.local_embedding_engine,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT,
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -21,7 +26,11 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                local_embedding_engine=self.local_embedding_engine,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT,
             )
 
         return None
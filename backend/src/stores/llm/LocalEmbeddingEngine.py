@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import threading
+from typing import List, Union
+
+class LocalEmbeddingEngine:
+
+    # embedding_model_id value that routes providers to this engine
+    MODEL_ALIAS = "hugging_face"
+
+    def __init__(self, model_id: str, batch_size: int = 32,
+                       num_threads: int = None, device: str = None):
+
+        self.model_id = model_id
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.device = device
+
+        self.model = None
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("uvicorn")
+
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self):
+        """Load the sentence-transformers model once for the whole process."""
+        if self.model is not None:
+            return self.model
+
+        with self.lock:
+            if self.model is None:
+                import torch
+                from sentence_transformers import SentenceTransformer
+
+                if self.num_threads:
+                    torch.set_num_threads(self.num_threads)
+
+                self.logger.info(f"Loading local embedding model: {self.model_id}")
+                self.model = SentenceTransformer(self.model_id, device=self.device)
+
+        return self.model
+
+    def warm_up(self):
+        """Load the weights and run one dummy batch so the first request is not penalised."""
+        model = self.load()
+        model.encode(["warm up"], batch_size=1)
+        return True
+
+    def get_embedding_size(self) -> int:
+        return self.load().get_sentence_embedding_dimension()
+
+    def encode(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        if isinstance(texts, str):
+            texts = [texts]
+
+        model = self.load()
+        vectors = model.encode(texts, batch_size=self.batch_size,
+                               convert_to_numpy=True, show_progress_bar=False)
+        return vectors.tolist()
+
+    async def aencode(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        # torch releases the GIL during inference, a worker thread keeps the event loop free
+        return await asyncio.to_thread(self.encode, texts)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import threading
+from typing import List
+
+class LocalReranker:
+    """
+    Cross-encoder reranker run locally on CPU: scores (query, chunk) pairs in batches
+    and keeps the best ones, so a wider retrieval can feed a shorter prompt.
+    """
+
+    def __init__(self, model_id: str, batch_size: int = 16, max_length: int = 512,
+                       num_threads: int = None, device: str = None):
+
+        self.model_id = model_id
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.num_threads = num_threads
+        self.device = device
+
+        self.model = None
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("uvicorn")
+
+    def is_loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self):
+        """Load the cross-encoder once for the whole process."""
+        if self.model is not None:
+            return self.model
+
+        with self.lock:
+            if self.model is None:
+                import torch
+                from sentence_transformers import CrossEncoder
+
+                if self.num_threads:
+                    torch.set_num_threads(self.num_threads)
+
+                self.logger.info(f"Loading local reranker model: {self.model_id}")
+                self.model = CrossEncoder(self.model_id, max_length=self.max_length, device=self.device)
+
+        return self.model
+
+    def warm_up(self):
+        model = self.load()
+        model.predict([("warm up", "warm up")], batch_size=1, show_progress_bar=False)
+        return True
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        if not texts:
+            return []
+
+        model = self.load()
+        scores = model.predict([ (query, text) for text in texts ],
+                               batch_size=self.batch_size, show_progress_bar=False)
+        return [ float(s) for s in scores ]
+
+    def rerank(self, query: str, documents: list, top_k: int) -> list:
+        """Documents sorted by cross-encoder score (which replaces their retrieval score), top_k kept."""
+        scores = self.score(query, [ doc.text for doc in documents ])
+        ranked = sorted(zip(scores, range(len(documents))), key=lambda item: -item[0])
+
+        return [
+            documents[idx].model_copy(update={"score": score})
+            for score, idx in ranked[:top_k]
+        ]
+
+    async def arerank(self, query: str, documents: list, top_k: int) -> list:
+        # torch releases the GIL during inference, a worker thread keeps the event loop free
+        return await asyncio.to_thread(self.rerank, query, documents, top_k)
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from prometheus_client import Histogram
+import logging
+import re
+
+RAG_PROMPT_TOKENS = Histogram(
+    'rag_prompt_tokens',
+    'Tokens in assembled RAG prompts (system + documents + question)',
+    buckets=(250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000),
+)
+
+WORD_RE = re.compile(r"\w+")
+
+@dataclass
+class RAGPrompt:
+    system_prompt: str
+    full_prompt: str
+    documents: list
+    prompt_tokens: int
+    dropped_documents: int = 0
+    truncated_documents: int = 0
+    duplicate_documents: int = 0
+
+class RAGPromptBuilder:
+    """
+    Assembles the RAG prompt from retrieved documents within a token budget.
+
+    Documents are taken best score first. Near-identical ones (word-set Jaccard similarity
+    at or above dedup_threshold with an already selected document) are skipped; a document
+    that does not fit is truncated when at least min_document_tokens remain, dropped
+    otherwise. max_prompt_tokens covers the system prompt, documents and question.
+    """
+
+    def __init__(self, template_parser, count_tokens, max_prompt_tokens: int = 3000,
+                 min_document_tokens: int = 64, dedup_threshold: float = 0.9):
+        self.template_parser = template_parser
+        self.count_tokens = count_tokens
+        self.max_prompt_tokens = max_prompt_tokens
+        self.min_document_tokens = min_document_tokens
+        self.dedup_threshold = dedup_threshold
+        self.logger = logging.getLogger("uvicorn")
+
+    @staticmethod
+    def get_words(text: str) -> frozenset:
+        return frozenset(WORD_RE.findall(text.lower()))
+
+    def is_duplicate(self, words: frozenset, selected_words: list) -> bool:
+        if not words:
+            return True
+        for other in selected_words:
+            union = len(words | other)
+            if union and len(words & other) / union >= self.dedup_threshold:
+                return True
+        return False
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest word prefix of text that fits in max_tokens."""
+        words = text.split()
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(" ".join(words[:middle])) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return " ".join(words[:low])
+
+    def render_document(self, doc_num: int, chunk_text: str) -> str:
+        return self.template_parser.get("rag", "document_prompt", {
+            "doc_num": doc_num,
+            "chunk_text": chunk_text,
+        })
+
+    def build(self, query: str, documents: list) -> RAGPrompt:
+        system_prompt = self.template_parser.get("rag", "system_prompt")
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "query": query
+        })
+
+        # "\n\n" separators between the documents block and the footer
+        used_tokens = self.count_tokens(system_prompt) + self.count_tokens(footer_prompt) + 2
+        budget = self.max_prompt_tokens if self.max_prompt_tokens else None
+
+        # template tokens around each chunk (widest doc number) plus the "\n" separator,
+        # each chunk text is then counted once
+        document_overhead = self.count_tokens(self.render_document(len(documents), "")) + 1
+
+        selected, selected_words, selected_texts = [], [], []
+        dropped = truncated = duplicates = 0
+
+        for doc in sorted(documents, key=lambda d: -d.score):
+            words = self.get_words(doc.text or "")
+            if self.is_duplicate(words, selected_words):
+                duplicates += 1
+                continue
+
+            chunk_text = doc.text
+            text_tokens = self.count_tokens(chunk_text)
+
+            if budget is not None and used_tokens + document_overhead + text_tokens > budget:
+                remaining = budget - used_tokens - document_overhead
+                if remaining < self.min_document_tokens:
+                    dropped += 1
+                    continue
+
+                chunk_text = self.truncate(doc.text, remaining)
+                if not chunk_text:
+                    dropped += 1
+                    continue
+
+                text_tokens = self.count_tokens(chunk_text)
+                truncated += 1
+
+            selected.append(doc)
+            selected_words.append(words)
+            selected_texts.append(chunk_text)
+            used_tokens += document_overhead + text_tokens
+
+        documents_prompts = self.template_parser.render_many("rag", "document_prompt", [
+            { "doc_num": idx + 1, "chunk_text": chunk_text }
+            for idx, chunk_text in enumerate(selected_texts)
+        ]) or []
+
+        full_prompt = "\n\n".join([ "\n".join(documents_prompts), footer_prompt ])
+        prompt_tokens = self.count_tokens(system_prompt) + self.count_tokens(full_prompt)
+
+        RAG_PROMPT_TOKENS.observe(prompt_tokens)
+        self.logger.info(f"RAG prompt: {prompt_tokens} tokens, {len(selected)} documents "
+                         f"({dropped} dropped, {truncated} truncated, {duplicates} duplicates)")
+
+        return RAGPrompt(
+            system_prompt=system_prompt,
+            full_prompt=full_prompt,
+            documents=selected,
+            prompt_tokens=prompt_tokens,
+            dropped_documents=dropped,
+            truncated_documents=truncated,
+            duplicate_documents=duplicates,
+        )
@@ -0,0 +1,28 @@
+from functools import lru_cache
+import logging
+
+# rough ratio used when no tokenizer is available for the generation model
+APPROX_CHARS_PER_TOKEN = 4
+
+@lru_cache(maxsize=8)
+def get_tiktoken_encoding(model_id: str):
+    """tiktoken encoding for an OpenAI model (cl100k_base when unknown), None without tiktoken."""
+    try:
+        import tiktoken
+    except ImportError:
+        logging.getLogger("uvicorn").warning("tiktoken is not installed, prompt tokens are approximated")
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model_id)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def approximate_tokens(text: str) -> int:
+    return (len(text) + APPROX_CHARS_PER_TOKEN - 1) // APPROX_CHARS_PER_TOKEN
+
+def count_tiktoken_tokens(text: str, model_id: str) -> int:
+    encoding = get_tiktoken_encoding(model_id or "")
+    if encoding is None:
+        return approximate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
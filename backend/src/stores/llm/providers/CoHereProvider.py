@@ -1,18 +1,25 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CoHereEnums, DocumentTypeEnum
+from ..LocalEmbeddingEngine import LocalEmbeddingEngine
+from ..TokenCounter import approximate_tokens
 import cohere
+import httpx
 import logging
 from typing import List, Union
-from sentence_transformers import SentenceTransformer
 
 class CoHereProvider(LLMInterface):
 
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       local_embedding_engine: LocalEmbeddingEngine=None,
+                       http_max_connections: int=100,
+                       http_max_keepalive_connections: int=20,
+                       http_timeout: float=60.0):
         
         self.api_key = api_key
+        self.local_embedding_engine = local_embedding_engine
 
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
@@ -25,6 +32,20 @@ class CoHereProvider(LLMInterface):
 
         self.client = cohere.Client(api_key=self.api_key)
 
+        # pooled connections shared by every request of the worker
+        self.async_http_client = httpx.AsyncClient(
+            timeout=http_timeout,
+            limits=httpx.Limits(
+                max_connections=http_max_connections,
+                max_keepalive_connections=http_max_keepalive_connections,
+            ),
+        )
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            timeout=http_timeout,
+            httpx_client=self.async_http_client,
+        )
+
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
 
@@ -38,6 +59,10 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def count_tokens(self, text: str) -> int:
+        # Cohere only tokenizes through an API call, too slow for prompt assembly
+        return approximate_tokens(text)
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
 
@@ -79,15 +104,16 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Embedding model for CoHere was not set")
             return None
         
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
 
-        if self.embedding_model_id == "hugging_face":
-            model = SentenceTransformer("sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+        if self.embedding_model_id == LocalEmbeddingEngine.MODEL_ALIAS:
+            if not self.local_embedding_engine:
+                self.logger.error("Local embedding engine was not set")
+                return None
             # response = model.encode([ self.process_text(t) for t in text ])
-            response = model.encode(text)
-            return response.tolist()
+            return self.local_embedding_engine.encode(text)
         else :
             response = self.client.embed(
                 model = self.embedding_model_id,
@@ -106,6 +132,97 @@ class CoHereProvider(LLMInterface):
         #     return None
         
         # return [ f for f in response.embeddings.float ]
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        response = await self.async_client.chat(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = prompt,
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        if not response or not response.text:
+            self.logger.error("Error while generating text with CoHere")
+            return None
+
+        return response.text
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        stream = self.async_client.chat_stream(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = prompt,
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        async for event in stream:
+            if event.event_type == "text-generation" and event.text:
+                yield event.text
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        if self.embedding_model_id == LocalEmbeddingEngine.MODEL_ALIAS:
+            if not self.local_embedding_engine:
+                self.logger.error("Local embedding engine was not set")
+                return None
+            return await self.local_embedding_engine.aencode(text)
+
+        response = await self.async_client.embed(
+            model = self.embedding_model_id,
+            texts = text,
+            input_type = input_type,
+            embedding_types=['float'],
+        )
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
+            return None
+        return [ f for f in response.embeddings.float ]
+
+    async def aclose(self):
+        if self.async_client:
+            await self.async_http_client.aclose()
     
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -1,6 +1,9 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from ..LocalEmbeddingEngine import LocalEmbeddingEngine
+from ..TokenCounter import count_tiktoken_tokens
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
 import logging
 from typing import List, Union
 
@@ -9,10 +12,15 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       local_embedding_engine: LocalEmbeddingEngine=None,
+                       http_max_connections: int=100,
+                       http_max_keepalive_connections: int=20,
+                       http_timeout: float=60.0):
         
         self.api_key = api_key
         self.api_url = api_url
+        self.local_embedding_engine = local_embedding_engine
 
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
@@ -28,6 +36,19 @@ class OpenAIProvider(LLMInterface):
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        # pooled connections shared by every request of the worker
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            timeout = http_timeout,
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=http_max_connections,
+                    max_keepalive_connections=http_max_keepalive_connections,
+                ),
+            ),
+        )
+
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -41,6 +62,9 @@ class OpenAIProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
+    def count_tokens(self, text: str) -> int:
+        return count_tiktoken_tokens(text, model_id=self.generation_model_id)
+
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
         
@@ -85,6 +109,12 @@ class OpenAIProvider(LLMInterface):
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
             return None
+
+        if self.embedding_model_id == LocalEmbeddingEngine.MODEL_ALIAS:
+            if not self.local_embedding_engine:
+                self.logger.error("Local embedding engine was not set")
+                return None
+            return self.local_embedding_engine.encode(text)
         
         response = self.client.embeddings.create(
             model = self.embedding_model_id,
@@ -97,6 +127,105 @@ class OpenAIProvider(LLMInterface):
 
         return [ rec.embedding for rec in response.data ]
 
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature
+        )
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        return response.choices[0].message.content
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                 temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        stream = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature,
+            stream = True
+        )
+
+        async for chunk in stream:
+            if not chunk.choices or not chunk.choices[0].delta:
+                continue
+
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        if self.embedding_model_id == LocalEmbeddingEngine.MODEL_ALIAS:
+            if not self.local_embedding_engine:
+                self.logger.error("Local embedding engine was not set")
+                return None
+            return await self.local_embedding_engine.aencode(text)
+
+        response = await self.async_client.embeddings.create(
+            model = self.embedding_model_id,
+            input = text,
+        )
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
+            return None
+
+        return [ rec.embedding for rec in response.data ]
+
+    async def aclose(self):
+        if self.async_client:
+            await self.async_client.close()
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
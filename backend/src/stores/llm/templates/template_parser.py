@@ -1,43 +1,83 @@
+from string import Template
+from types import MappingProxyType
+import importlib
 import os
 
 class TemplateParser:
+    """
+    Prompt templates of every locales/<language>/<group>.py module, imported once and kept
+    in read-only mappings. Groups missing from the selected language fall back, key by
+    key, to the default language.
+    """
 
     def __init__(self, language: str=None, default_language='en'):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.default_language = default_language
         self.language = None
 
+        # language -> group -> key -> Template
+        self.catalog = self.load_catalog()
+        self.templates = MappingProxyType({})
+
         self.set_language(language)
 
-    
+    def load_catalog(self):
+        locales_path = os.path.join(self.current_path, "locales")
+        catalog = {}
+
+        for language in sorted(os.listdir(locales_path)):
+            language_path = os.path.join(locales_path, language)
+            if not os.path.isfile(os.path.join(language_path, "__init__.py")):
+                continue
+
+            groups = {}
+            for file_name in sorted(os.listdir(language_path)):
+                group, ext = os.path.splitext(file_name)
+                if ext != ".py" or group == "__init__":
+                    continue
+
+                module = importlib.import_module(f"stores.llm.templates.locales.{language}.{group}")
+                groups[group] = MappingProxyType({
+                    key: value
+                    for key, value in vars(module).items()
+                    if isinstance(value, Template)
+                })
+
+            catalog[language] = MappingProxyType(groups)
+
+        return MappingProxyType(catalog)
+
     def set_language(self, language: str):
-        if not language:
-            self.language = self.default_language
+        self.language = language if language in self.catalog else self.default_language
 
-        language_path = os.path.join(self.current_path, "locales", language)
-        if os.path.exists(language_path):
-            self.language = language
-        else:
-            self.language = self.default_language
+        # resolve the fallback once, lookups are then a single dict access
+        default_groups = self.catalog.get(self.default_language, {})
+        language_groups = self.catalog.get(self.language, {})
 
-    def get(self, group: str, key: str, vars: dict={}):
+        self.templates = MappingProxyType({
+            group: MappingProxyType({
+                **default_groups.get(group, {}),
+                **language_groups.get(group, {}),
+            })
+            for group in set(default_groups) | set(language_groups)
+        })
+
+    def get_template(self, group: str, key: str):
         if not group or not key:
             return None
-        
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
-        targeted_language = self.language
-        if not os.path.exists(group_path):
-            group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py" )
-            targeted_language = self.default_language
-
-        if not os.path.exists(group_path):
+        return self.templates.get(group, {}).get(key)
+
+    def get(self, group: str, key: str, vars: dict={}):
+        template = self.get_template(group, key)
+        if template is None:
             return None
-        
-        # import group module
-        module = __import__(f"stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group])
 
-        if not module:
+        return template.substitute(vars)
+
+    def render_many(self, group: str, key: str, vars_list: list):
+        """Render one template for each vars dict, e.g. one document prompt per retrieved chunk."""
+        template = self.get_template(group, key)
+        if template is None:
             return None
-        
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(vars)
+
+        return [ template.substitute(vars) for vars in vars_list ]
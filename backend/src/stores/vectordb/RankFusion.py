@@ -0,0 +1,55 @@
+import math
+import re
+
+TERM_RE = re.compile(r"\w[\w\-.]*")
+
+def get_terms(text: str, max_terms: int = None) -> list:
+    """Distinct lowercased query terms, in order of appearance."""
+    terms = list(dict.fromkeys(TERM_RE.findall((text or "").lower())))
+    return terms[:max_terms] if max_terms else terms
+
+def reciprocal_rank_fusion(rankings: list, rrf_k: int = 60) -> list:
+    """
+    rankings: lists of ids, best first. Returns (id, score) pairs sorted by the RRF score
+    sum(1 / (rrf_k + rank)) over the rankings an id appears in.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (rrf_k + rank)
+
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+def bm25_scores(texts: dict, terms: list, doc_freqs: dict, total_docs: int,
+                k1: float = 1.2, b: float = 0.75) -> dict:
+    """
+    Okapi BM25 score of each text (id -> text) for the query terms. doc_freqs and
+    total_docs describe the whole collection, document lengths are normalized by the
+    average length of the scored texts.
+    """
+    tokenized = { item_id: TERM_RE.findall((text or "").lower()) for item_id, text in texts.items() }
+    if not tokenized:
+        return {}
+
+    average_length = (sum(len(tokens) for tokens in tokenized.values()) / len(tokenized)) or 1.0
+    total_docs = max(total_docs, len(tokenized))
+
+    idf = {
+        term: math.log(1 + (total_docs - doc_freqs.get(term, 0) + 0.5) / (doc_freqs.get(term, 0) + 0.5))
+        for term in terms
+    }
+
+    scores = {}
+    for item_id, tokens in tokenized.items():
+        counts = {}
+        for token in tokens:
+            if token in idf:
+                counts[token] = counts.get(token, 0) + 1
+
+        length_norm = k1 * (1 - b + b * len(tokens) / average_length)
+        scores[item_id] = sum(
+            idf[term] * tf * (k1 + 1) / (tf + length_norm)
+            for term, tf in counts.items()
+        )
+
+    return scores
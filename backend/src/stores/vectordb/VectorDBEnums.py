@@ -4,6 +4,10 @@ class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
 
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    HYBRID = "hybrid"
+
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
@@ -14,6 +18,7 @@ class PgVectorTableSchemeEnums(Enum):
     VECTOR = 'vector'
     CHUNK_ID = 'chunk_id'
     METADATA = 'metadata'
+    COLLECTION = 'collection'
     _PREFIX = 'pgvector'
 
 class PgVectorDistanceMethodEnums(Enum):
@@ -23,3 +28,11 @@ class PgVectorDistanceMethodEnums(Enum):
 class PgVectorIndexTypeEnums(Enum):
     HNSW = "hnsw"
     IVFFLAT = "ivfflat"
+
+class PgVectorStorageLayoutEnums(Enum):
+    PER_COLLECTION = "per_collection"
+    PARTITIONED = "partitioned"
+
+class PgVectorInsertModeEnums(Enum):
+    COPY = "copy"
+    INSERT = "insert"
@@ -12,6 +12,10 @@ class VectorDBInterface(ABC):
     def disconnect(self):
         pass
 
+    @abstractmethod
+    def load_collections_catalog(self) -> set:
+        pass
+
     @abstractmethod
     def is_collection_existed(self, collection_name: str) -> bool:
         pass
@@ -47,6 +51,34 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
+    def delete_by_record_ids(self, collection_name: str, record_ids: list) -> bool:
+        pass
+
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str, drop_index: bool = True):
+        pass
+
+    @abstractmethod
+    def end_bulk_load(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               ef_search: int = None, probes: int = None,
+                               filters: dict = None,
+                               include_text: bool = True) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int,
+                            ef_search: int = None, probes: int = None,
+                            filters: dict = None,
+                            include_text: bool = True) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_by_vector_many(self, collection_names: List[str], vector: list, limit: int,
+                                    ef_search: int = None, probes: int = None,
+                                    filters: dict = None,
+                                    include_text: bool = True) -> dict:
         pass
-    
\ No newline at end of file
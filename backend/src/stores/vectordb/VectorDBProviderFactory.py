@@ -1,5 +1,5 @@
-from .providers import QdrantDBProvider, PGVectorProvider
-from .VectorDBEnums import VectorDBEnums
+from .providers import QdrantDBProvider, PGVectorProvider, PGVectorPartitionedProvider
+from .VectorDBEnums import VectorDBEnums, PgVectorStorageLayoutEnums
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
 
@@ -18,14 +18,38 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                hybrid_rrf_k=self.config.VECTOR_DB_HYBRID_RRF_K,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                hybrid_text_scan_limit=self.config.VECTOR_DB_HYBRID_TEXT_SCAN_LIMIT,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
-            return PGVectorProvider(
+            pgvector_options = dict(
                 db_client=self.db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                insert_mode=self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+                insert_batch_size=self.config.VECTOR_DB_PGVEC_INSERT_BATCH_SIZE,
+                index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                hnsw_ef_search=self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_lists=self.config.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+                ivfflat_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                hybrid_rrf_k=self.config.VECTOR_DB_HYBRID_RRF_K,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                iterative_scan=self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
             )
+
+            if self.config.VECTOR_DB_PGVEC_STORAGE_LAYOUT == PgVectorStorageLayoutEnums.PARTITIONED.value:
+                return PGVectorPartitionedProvider(
+                    partitions=self.config.VECTOR_DB_PGVEC_PARTITIONS,
+                    **pgvector_options,
+                )
+
+            return PGVectorProvider(**pgvector_options)
         
         return None
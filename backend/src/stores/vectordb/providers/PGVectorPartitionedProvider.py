@@ -0,0 +1,391 @@
+from .PGVectorProvider import PGVectorProvider
+from ..VectorDBEnums import PgVectorTableSchemeEnums
+from typing import List
+from sqlalchemy.sql import text as sql_text
+from sqlalchemy.exc import DBAPIError
+import time
+
+class PGVectorPartitionedProvider(PGVectorProvider):
+    """
+    PGVector storage where collections share one hash-partitioned table per embedding
+    size instead of owning a table each.
+
+    Rows carry their collection name, which is the partition key, and a registry table
+    maps every collection to its shared table. The vector, full-text and metadata indexes
+    are defined once on the shared table, so a small collection is searched through the
+    same ANN index as the large ones and the catalog no longer grows with the number of
+    projects. Searches are scoped to their collection, which prunes them to one partition.
+    """
+
+    def __init__(self, db_client, partitions: int = 16, **kwargs):
+        super().__init__(db_client=db_client, **kwargs)
+
+        self.partitions = partitions
+        self.registry_table = f"{self.pgvector_table_prefix}_collections"
+
+        # collection_name -> shared table, kept in sync with collections_catalog
+        self.collection_tables = {}
+        # shared tables created (or checked) by this process
+        self.shared_tables = set()
+
+    def get_shared_table_name(self, embedding_size: int) -> str:
+        return f"{self.pgvector_table_prefix}_shared_{int(embedding_size)}"
+
+    def get_table_name(self, collection_name: str) -> str:
+        return self.collection_tables.get(collection_name)
+
+    def get_collection_scope(self, collection_name: str, alias: str = None):
+        column = PgVectorTableSchemeEnums.COLLECTION.value
+        if alias:
+            column = f"{alias}.{column}"
+        return [f'{column} = :scope_collection'], {"scope_collection": collection_name}
+
+    def get_collection_columns(self, collection_name: str) -> dict:
+        return {PgVectorTableSchemeEnums.COLLECTION.value: collection_name}
+
+    async def connect(self):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    "CREATE EXTENSION IF NOT EXISTS vector"
+                ))
+                await session.execute(sql_text(
+                    f'CREATE TABLE IF NOT EXISTS {self.registry_table} ('
+                        'collection_name text PRIMARY KEY, '
+                        'table_name text NOT NULL, '
+                        'embedding_size integer NOT NULL, '
+                        'created_at timestamptz NOT NULL DEFAULT now()'
+                    ')'
+                ))
+                await session.commit()
+
+        await self.load_collections_catalog()
+
+    async def disconnect(self):
+        self.collections_catalog = set()
+        self.collection_tables = {}
+        self.shared_tables = set()
+
+    async def load_collections_catalog(self):
+        async with self.db_client() as session:
+            async with session.begin():
+                catalog_sql = sql_text(f'SELECT collection_name, table_name FROM {self.registry_table}')
+                results = await session.execute(catalog_sql)
+                self.collection_tables = { record.collection_name: record.table_name for record in results.fetchall() }
+
+        self.collections_catalog = set(self.collection_tables)
+        self.shared_tables = set(self.collection_tables.values())
+
+        return self.collections_catalog
+
+    def forget_collection(self, collection_name: str):
+        self.collections_catalog.discard(collection_name)
+        self.collection_tables.pop(collection_name, None)
+
+    async def is_collection_existed(self, collection_name: str, use_catalog: bool = True) -> bool:
+
+        if use_catalog and collection_name in self.collections_catalog:
+            return True
+
+        # miss: the collection may have been registered by another worker
+        async with self.db_client() as session:
+            async with session.begin():
+                registry_sql = sql_text(f'SELECT table_name FROM {self.registry_table} '
+                                        'WHERE collection_name = :collection_name')
+                results = await session.execute(registry_sql, {"collection_name": collection_name})
+                table_name = results.scalar_one_or_none()
+
+        if table_name:
+            self.collection_tables[collection_name] = table_name
+            self.collections_catalog.add(collection_name)
+        else:
+            self.forget_collection(collection_name)
+
+        return bool(table_name)
+
+    async def list_all_collections(self) -> List:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text(f'SELECT collection_name FROM {self.registry_table} ORDER BY collection_name')
+                results = await session.execute(list_sql)
+                return results.scalars().all()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return None
+
+        collection_info = await super().get_collection_info(collection_name=collection_name)
+        if collection_info:
+            collection_info["storage_layout"] = "partitioned"
+
+        return collection_info
+
+    async def delete_collection(self, collection_name: str):
+        if not await self.is_collection_existed(collection_name=collection_name):
+            return True
+
+        table_name = self.get_table_name(collection_name)
+        scope, scope_params = self.get_collection_scope(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                self.logger.info(f"Deleting collection: {collection_name} from {table_name}")
+
+                delete_sql = sql_text(f'DELETE FROM {table_name} WHERE {" AND ".join(scope)}')
+                await session.execute(delete_sql, scope_params)
+
+                unregister_sql = sql_text(f'DELETE FROM {self.registry_table} '
+                                          'WHERE collection_name = :collection_name')
+                await session.execute(unregister_sql, {"collection_name": collection_name})
+                await session.commit()
+
+        self.forget_collection(collection_name)
+
+        return True
+
+    def get_shared_table_sql(self, table_name: str, embedding_size: int):
+        collection_column = PgVectorTableSchemeEnums.COLLECTION.value
+        chunk_id_column = PgVectorTableSchemeEnums.CHUNK_ID.value
+
+        statements = [
+            sql_text(
+                f'CREATE TABLE IF NOT EXISTS {table_name} ('
+                    f'{PgVectorTableSchemeEnums.ID.value} bigserial, '
+                    f'{collection_column} text NOT NULL, '
+                    f'{PgVectorTableSchemeEnums.TEXT.value} text, '
+                    f'{PgVectorTableSchemeEnums.VECTOR.value} vector({int(embedding_size)}), '
+                    f'{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT \'{{}}\', '
+                    f'{chunk_id_column} integer, '
+                    f'PRIMARY KEY ({collection_column}, {PgVectorTableSchemeEnums.ID.value}), '
+                    f'FOREIGN KEY ({chunk_id_column}) REFERENCES chunks(chunk_id)'
+                f') PARTITION BY HASH ({collection_column})'
+            ),
+        ]
+
+        statements += [
+            sql_text(
+                f'CREATE TABLE IF NOT EXISTS {table_name}_p{remainder} PARTITION OF {table_name} '
+                f'FOR VALUES WITH (MODULUS {int(self.partitions)}, REMAINDER {remainder})'
+            )
+            for remainder in range(int(self.partitions))
+        ]
+
+        # indexes on the parent are created on every partition
+        statements.append(sql_text(
+            f'CREATE INDEX IF NOT EXISTS {table_name}_chunk_id_idx '
+            f'ON {table_name} ({collection_column}, {chunk_id_column})'
+        ))
+
+        return statements + self.get_search_indexes_sql(table_name)
+
+    async def create_shared_table(self, session, embedding_size: int) -> str:
+        table_name = self.get_shared_table_name(embedding_size)
+        if table_name in self.shared_tables:
+            return table_name
+
+        self.logger.info(f"Creating shared vectors table: {table_name} ({self.partitions} partitions)")
+        for statement in self.get_shared_table_sql(table_name, embedding_size):
+            await session.execute(statement)
+
+        self.shared_tables.add(table_name)
+
+        return table_name
+
+    async def register_collection(self, session, collection_name: str, table_name: str, embedding_size: int):
+        register_sql = sql_text(f'INSERT INTO {self.registry_table} (collection_name, table_name, embedding_size) '
+                                'VALUES (:collection_name, :table_name, :embedding_size) '
+                                'ON CONFLICT (collection_name) DO NOTHING')
+        await session.execute(register_sql, {
+            "collection_name": collection_name,
+            "table_name": table_name,
+            "embedding_size": int(embedding_size),
+        })
+
+    async def create_collection(self, collection_name: str,
+                                      embedding_size: int,
+                                      do_reset: bool = False):
+
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        # checked against the registry, another worker may have deleted the collection
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name,
+                                                                 use_catalog=False)
+        if is_collection_existed:
+            return False
+
+        self.logger.info(f"Creating collection: {collection_name}")
+        async with self.db_client() as session:
+            async with session.begin():
+                table_name = await self.create_shared_table(session, embedding_size=embedding_size)
+                await self.register_collection(session, collection_name=collection_name,
+                                               table_name=table_name, embedding_size=embedding_size)
+                await session.commit()
+
+        self.collection_tables[collection_name] = table_name
+        self.collections_catalog.add(collection_name)
+
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = True):
+        # the vector index is shared with every other collection of the table, it is kept
+        # and maintained by the inserts instead of being dropped and rebuilt
+        self.bulk_loading_collections.add(collection_name)
+
+        return True
+
+    async def search_by_vector_many(self, collection_names: List[str], vector: list, limit: int,
+                                    ef_search: int = None, probes: int = None, filters: dict = None,
+                                    include_text: bool = True) -> dict:
+        """
+        Nearest neighbours across several collections, one ANN scan per shared table
+        restricted to the requested collections; returns collection_name -> results,
+        with the best `limit` rows overall.
+        """
+        tables = {}
+        for collection_name in collection_names:
+            if await self.is_collection_existed(collection_name=collection_name):
+                tables.setdefault(self.get_table_name(collection_name), []).append(collection_name)
+
+        if not tables:
+            return {}
+
+        ef_search = max(ef_search if ef_search else self.hnsw_ef_search, limit)
+        probes = probes if probes else self.ivfflat_probes
+
+        conditions, params = self.build_filter_conditions(filters)
+        filter_conditions = ''.join(f' AND {condition}' for condition in conditions)
+
+        collection_column = PgVectorTableSchemeEnums.COLLECTION.value
+        text_column = PgVectorTableSchemeEnums.TEXT.value if include_text else 'NULL::text'
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+
+        branches = []
+        for idx, (table_name, table_collections) in enumerate(tables.items()):
+            branches.append(
+                f'(SELECT {collection_column} AS collection_name, {text_column} AS text, '
+                f'1 - ({vector_column} <=> :vector) AS score, '
+                f'{PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id, {PgVectorTableSchemeEnums.METADATA.value} AS metadata'
+                f' FROM {table_name} WHERE {collection_column} = ANY(:collections_{idx}){filter_conditions}'
+                f' ORDER BY {vector_column} <=> :vector LIMIT {int(limit)})'
+            )
+            params[f"collections_{idx}"] = table_collections
+
+        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    # the collection condition filters the shared ANN index scan
+                    await self.set_search_parameters(session, ef_search=ef_search, probes=probes,
+                                                     filtered=True)
+
+                    search_sql = sql_text(f'SELECT hits.collection_name, hits.text, hits.score, hits.chunk_id, hits.metadata, '
+                                          f'ch.chunk_asset_id AS asset_id, ch.chunk_order AS chunk_order FROM ('
+                                          f'{" UNION ALL ".join(branches)}'
+                                          f') hits LEFT JOIN chunks ch ON ch.chunk_id = hits.chunk_id '
+                                          f'ORDER BY hits.score DESC LIMIT {int(limit)}')
+
+                    result = await session.execute(search_sql, {"vector": vector, **params})
+                    records = result.fetchall()
+        except DBAPIError as e:
+            self.logger.error(f"Error while searching tables {list(tables)}: {e}")
+            if self.is_undefined_table(e):
+                for table_collections in tables.values():
+                    for collection_name in table_collections:
+                        self.forget_collection(collection_name)
+            return False
+
+        results = {
+            collection_name: []
+            for table_collections in tables.values()
+            for collection_name in table_collections
+        }
+        for record in records:
+            results[record.collection_name].append(self.to_retrieved_document(record))
+
+        return results
+
+    async def list_collection_tables(self) -> dict:
+        """Per-collection vector tables (the per_collection layout): table_name -> embedding size."""
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text('SELECT c.relname AS table_name, a.atttypmod AS embedding_size '
+                                    'FROM pg_class c '
+                                    'JOIN pg_namespace n ON n.oid = c.relnamespace '
+                                    'JOIN pg_attribute a ON a.attrelid = c.oid '
+                                    'WHERE n.nspname = current_schema() '
+                                    "AND c.relkind = 'r' AND NOT c.relispartition "
+                                    'AND a.attname = :column_name AND NOT a.attisdropped '
+                                    "AND a.atttypid = 'vector'::regtype "
+                                    'ORDER BY c.relname')
+                results = await session.execute(list_sql, {"column_name": PgVectorTableSchemeEnums.VECTOR.value})
+                return { record.table_name: record.embedding_size for record in results.fetchall() }
+
+    async def migrate_collection_table(self, collection_name: str, embedding_size: int,
+                                             drop_source: bool = False) -> int:
+        """
+        Copy the per-collection table named collection_name into the shared table, in one
+        transaction; rows already migrated for the collection are replaced, so an
+        interrupted migration can be run again. Returns the number of copied rows.
+        """
+        collection_column = PgVectorTableSchemeEnums.COLLECTION.value
+        copied_columns = ", ".join([
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ])
+
+        start_time = time.perf_counter()
+        async with self.db_client() as session:
+            async with session.begin():
+                table_name = await self.create_shared_table(session, embedding_size=embedding_size)
+
+                await session.execute(sql_text(f'DELETE FROM {table_name} WHERE {collection_column} = :collection_name'),
+                                      {"collection_name": collection_name})
+
+                copy_sql = sql_text(f'INSERT INTO {table_name} ({collection_column}, {copied_columns}) '
+                                    f'SELECT :collection_name, {copied_columns} FROM {collection_name} '
+                                    f'ORDER BY {PgVectorTableSchemeEnums.ID.value}')
+                result = await session.execute(copy_sql, {"collection_name": collection_name})
+                copied_count = result.rowcount
+
+                await self.register_collection(session, collection_name=collection_name,
+                                               table_name=table_name, embedding_size=embedding_size)
+
+                if drop_source:
+                    await session.execute(sql_text(f'DROP TABLE {collection_name}'))
+
+                await session.commit()
+
+        self.collection_tables[collection_name] = table_name
+        self.collections_catalog.add(collection_name)
+
+        self.logger.info(f"Migrated collection {collection_name} to {table_name}: "
+                         f"{copied_count} vectors in {time.perf_counter() - start_time:.2f}s")
+
+        return copied_count
+
+    async def migrate_collection_tables(self, drop_source: bool = False) -> dict:
+        """
+        Move every per-collection table into the shared tables, then build the vector
+        index of each new shared table once all of its rows are in (copies into a shared
+        table that is already indexed maintain its index). Returns collection_name ->
+        number of copied rows.
+        """
+        migrated = {}
+        for collection_name, embedding_size in (await self.list_collection_tables()).items():
+            migrated[collection_name] = await self.migrate_collection_table(
+                collection_name=collection_name,
+                embedding_size=embedding_size,
+                drop_source=drop_source,
+            )
+
+        built_tables = set()
+        for collection_name in migrated:
+            table_name = self.get_table_name(collection_name)
+            if table_name not in built_tables:
+                _ = await self.create_vector_index(collection_name=collection_name)
+                built_tables.add(table_name)
+
+        return migrated
@@ -1,21 +1,58 @@
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
-                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
+                             PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums,
+                             PgVectorInsertModeEnums)
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
 from sqlalchemy.sql import text as sql_text
+from sqlalchemy.exc import DBAPIError
+from pgvector.asyncpg import register_vector
 import json
+import time
+
+# undefined_table, raised by asyncpg directly (COPY) or wrapped by SQLAlchemy
+UNDEFINED_TABLE_SQLSTATE = "42P01"
 
 class PGVectorProvider(VectorDBInterface):
 
     def __init__(self, db_client, default_vector_size: int = 786,
-                       distance_method: str = None, index_threshold: int=100):
+                       distance_method: str = None, index_threshold: int=100,
+                       insert_mode: str = PgVectorInsertModeEnums.COPY.value,
+                       insert_batch_size: int = 1000,
+                       index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+                       hnsw_m: int = 16, hnsw_ef_construction: int = 64,
+                       hnsw_ef_search: int = 40,
+                       ivfflat_lists: int = None, ivfflat_probes: int = 1,
+                       maintenance_work_mem: str = None,
+                       text_search_config: str = "simple",
+                       hybrid_rrf_k: int = 60, hybrid_candidates: int = 50,
+                       iterative_scan: str = "relaxed_order"):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         
         self.index_threshold = index_threshold
+        self.insert_mode = insert_mode
+        self.insert_batch_size = insert_batch_size
+
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_lists = ivfflat_lists
+        self.ivfflat_probes = ivfflat_probes
+        self.maintenance_work_mem = maintenance_work_mem
+
+        self.text_search_config = text_search_config
+        self.hybrid_rrf_k = hybrid_rrf_k
+        self.hybrid_candidates = hybrid_candidates
+        self.iterative_scan = iterative_scan
+
+        self.bulk_loading_collections = set()
+
+        # collections known to exist, filled at connect and kept in sync by create/delete
+        self.collections_catalog = set()
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
@@ -27,6 +64,8 @@ class PGVectorProvider(VectorDBInterface):
 
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = lambda collection_name: f"{collection_name}_vector_idx"
+        self.text_index_name = lambda collection_name: f"{collection_name}_text_fts_idx"
+        self.metadata_index_name = lambda collection_name: f"{collection_name}_metadata_idx"
 
 
     async def connect(self):
@@ -37,19 +76,51 @@ class PGVectorProvider(VectorDBInterface):
                 ))
                 await session.commit()
 
+        await self.load_collections_catalog()
+
     async def disconnect(self):
-        pass
+        self.collections_catalog = set()
 
-    async def is_collection_existed(self, collection_name: str) -> bool:
+    async def load_collections_catalog(self):
+        # every visible table holding a pgvector column is a collection
+        async with self.db_client() as session:
+            async with session.begin():
+                catalog_sql = sql_text('SELECT table_name FROM information_schema.columns '
+                                       'WHERE table_schema = current_schema() '
+                                       'AND column_name = :column_name '
+                                       "AND udt_name = 'vector'")
+                results = await session.execute(catalog_sql, {"column_name": PgVectorTableSchemeEnums.VECTOR.value})
+                self.collections_catalog = set(results.scalars().all())
 
+        return self.collections_catalog
+
+    @staticmethod
+    def is_undefined_table(error: Exception) -> bool:
+        return getattr(getattr(error, "orig", error), "sqlstate", None) == UNDEFINED_TABLE_SQLSTATE
+
+    def forget_collection(self, collection_name: str):
+        # stale catalog entry, e.g. the table was dropped by another worker
+        self.collections_catalog.discard(collection_name)
+
+    async def is_collection_existed(self, collection_name: str, use_catalog: bool = True) -> bool:
+
+        if use_catalog and collection_name in self.collections_catalog:
+            return True
+
+        # miss: the collection may have been created by another worker
         record = None
         async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text(f'SELECT * FROM pg_tables WHERE tablename = :collection_name')
+                list_tbl = sql_text(f'SELECT tablename FROM pg_tables WHERE tablename = :collection_name')
                 results = await session.execute(list_tbl, {"collection_name": collection_name})
                 record = results.scalar_one_or_none()
 
-        return record
+        if record:
+            self.collections_catalog.add(collection_name)
+        else:
+            self.forget_collection(collection_name)
+
+        return bool(record)
     
     async def list_all_collections(self) -> List:
         records = []
@@ -62,19 +133,23 @@ class PGVectorProvider(VectorDBInterface):
         return records
     
     async def get_collection_info(self, collection_name: str) -> dict:
+        table_name = self.get_table_name(collection_name)
+        scope, scope_params = self.get_collection_scope(collection_name)
+        where_clause = f' WHERE {" AND ".join(scope)}' if scope else ''
+
         async with self.db_client() as session:
             async with session.begin():
                 
                 table_info_sql = sql_text(f'''
                     SELECT schemaname, tablename, tableowner, tablespace, hasindexes 
                     FROM pg_tables 
-                    WHERE tablename = :collection_name
+                    WHERE tablename = :table_name
                 ''')
 
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+                count_sql = sql_text(f'SELECT COUNT(*) FROM {table_name}{where_clause}')
 
-                table_info = await session.execute(table_info_sql, {"collection_name": collection_name})
-                record_count = await session.execute(count_sql)
+                table_info = await session.execute(table_info_sql, {"table_name": table_name})
+                record_count = await session.execute(count_sql, scope_params)
 
                 table_data = table_info.fetchone()
                 if not table_data:
@@ -99,6 +174,8 @@ class PGVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS {collection_name}')
                 await session.execute(delete_sql)
                 await session.commit()
+
+        self.collections_catalog.discard(collection_name)
         
         return True
 
@@ -109,13 +186,15 @@ class PGVectorProvider(VectorDBInterface):
         if do_reset:
             _ = await self.delete_collection(collection_name=collection_name)
 
-        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        # checked against the database, the catalog may still list a table another worker dropped
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name,
+                                                                 use_catalog=False)
         if not is_collection_existed:
             self.logger.info(f"Creating collection: {collection_name}")
             async with self.db_client() as session:
                 async with session.begin():
                     create_sql = sql_text(
-                        f'CREATE TABLE {collection_name} ('
+                        f'CREATE TABLE IF NOT EXISTS {collection_name} ('
                             f'{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY,'
                             f'{PgVectorTableSchemeEnums.TEXT.value} text, '
                             f'{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), '
@@ -125,61 +204,231 @@ class PGVectorProvider(VectorDBInterface):
                         ')'
                     )
                     await session.execute(create_sql)
+
+                    # chunk_id lookups: stale vector deletion and incremental pushes
+                    chunk_id_idx_sql = sql_text(
+                        f'CREATE INDEX IF NOT EXISTS {collection_name}_chunk_id_idx '
+                        f'ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})'
+                    )
+                    await session.execute(chunk_id_idx_sql)
+
+                    for search_index_sql in self.get_search_indexes_sql(collection_name):
+                        await session.execute(search_index_sql)
                     await session.commit()
+
+            self.collections_catalog.add(collection_name)
             
             return True
 
         return False
     
     async def is_index_existed(self, collection_name: str) -> bool:
-        index_name = self.default_index_name(collection_name)
+        table_name = self.get_table_name(collection_name)
+        index_name = self.default_index_name(table_name)
         async with self.db_client() as session:
             async with session.begin():
                 check_sql = sql_text(f""" 
                                     SELECT 1 
                                     FROM pg_indexes 
-                                    WHERE tablename = :collection_name
+                                    WHERE tablename = :table_name
                                     AND indexname = :index_name
                                     """)
-                results = await session.execute(check_sql, {"index_name": index_name, "collection_name": collection_name})
+                results = await session.execute(check_sql, {"index_name": index_name, "table_name": table_name})
                 
                 return bool(results.scalar_one_or_none())
             
     async def create_vector_index(self, collection_name: str,
-                                        index_type: str = PgVectorIndexTypeEnums.HNSW.value):
+                                        index_type: str = None):
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
             return False
+
+        index_type = index_type if index_type else self.index_type
+        table_name = self.get_table_name(collection_name)
         
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM {collection_name}')
+                count_sql = sql_text(f'SELECT COUNT(*) FROM {table_name}')
                 result = await session.execute(count_sql)
                 records_count = result.scalar_one()
 
                 if records_count < self.index_threshold:
                     return False
                 
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
+                self.logger.info(f"START: Creating vector index for table: {table_name}")
+
+                if self.maintenance_work_mem:
+                    await session.execute(sql_text(
+                        f"SET LOCAL maintenance_work_mem = '{self.maintenance_work_mem}'"
+                    ))
+
+                if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+                    lists = self.ivfflat_lists if self.ivfflat_lists else max(records_count // 1000, 1)
+                    index_options = f'WITH (lists = {int(lists)})'
+                else:
+                    index_options = f'WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})'
                 
-                index_name = self.default_index_name(collection_name)
+                index_name = self.default_index_name(table_name)
                 create_idx_sql = sql_text(
-                                            f'CREATE INDEX {index_name} ON {collection_name} '
-                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
+                                            f'CREATE INDEX {index_name} ON {table_name} '
+                                            f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method}) '
+                                            f'{index_options}'
                                           )
 
+                start_time = time.perf_counter()
                 await session.execute(create_idx_sql)
+                build_time = time.perf_counter() - start_time
 
-                self.logger.info(f"END: Created vector index for collection: {collection_name}")
+                self.logger.info(f"END: Created vector index for table: {table_name} in {build_time:.2f}s")
 
-    async def reset_vector_index(self, collection_name: str, 
-                                       index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
-        
-        index_name = self.default_index_name(collection_name)
+        return True
+
+    async def drop_vector_index(self, collection_name: str):
+        index_name = self.default_index_name(self.get_table_name(collection_name))
         async with self.db_client() as session:
             async with session.begin():
                 drop_sql = sql_text(f'DROP INDEX IF EXISTS {index_name}')
                 await session.execute(drop_sql)
+
+        return True
+
+    def get_table_name(self, collection_name: str) -> str:
+        # each collection is its own table in this layout
+        return collection_name
+
+    def get_collection_scope(self, collection_name: str, alias: str = None):
+        """SQL conditions (and bind params) restricting the collection table to collection_name."""
+        return [], {}
+
+    def get_collection_columns(self, collection_name: str) -> dict:
+        """Extra column -> value written with every record of collection_name."""
+        return {}
+
+    def get_text_tsvector(self) -> str:
+        # must match the indexed expression for the planner to use the GIN index
+        ts_config = self.text_search_config.replace("'", "''")
+        return f"to_tsvector('{ts_config}'::regconfig, coalesce({PgVectorTableSchemeEnums.TEXT.value}, ''))"
+
+    def get_search_indexes_sql(self, table_name: str):
+        return [
+            # full-text index used by hybrid search
+            sql_text(
+                f'CREATE INDEX IF NOT EXISTS {self.text_index_name(table_name)} '
+                f'ON {table_name} USING gin ({self.get_text_tsvector()})'
+            ),
+            # containment (@>) filters on metadata
+            sql_text(
+                f'CREATE INDEX IF NOT EXISTS {self.metadata_index_name(table_name)} '
+                f'ON {table_name} USING gin ({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)'
+            ),
+        ]
+
+    async def create_search_indexes(self, collection_name: str):
+        """Full-text and metadata GIN indexes, added to collections created before they existed."""
+        async with self.db_client() as session:
+            async with session.begin():
+                for search_index_sql in self.get_search_indexes_sql(self.get_table_name(collection_name)):
+                    await session.execute(search_index_sql)
+
+        return True
+
+    def build_filter_conditions(self, filters: dict):
+        """
+        Translate search filters into SQL predicates and their bind parameters:
+        chunk_ids, asset_ids (through the chunks table), metadata (jsonb containment)
+        and page_from / page_to (inclusive range on metadata.page).
+        """
+        conditions, params = [], {}
+        if not filters:
+            return conditions, params
+
+        chunk_id_column = PgVectorTableSchemeEnums.CHUNK_ID.value
+        metadata_column = PgVectorTableSchemeEnums.METADATA.value
+
+        if filters.get("chunk_ids"):
+            conditions.append(f'{chunk_id_column} = ANY(:filter_chunk_ids)')
+            params["filter_chunk_ids"] = [ int(c) for c in filters["chunk_ids"] ]
+
+        if filters.get("asset_ids"):
+            conditions.append(f'{chunk_id_column} IN (SELECT chunk_id FROM chunks '
+                              f'WHERE chunk_asset_id = ANY(:filter_asset_ids))')
+            params["filter_asset_ids"] = [ int(a) for a in filters["asset_ids"] ]
+
+        if filters.get("metadata"):
+            conditions.append(f'{metadata_column} @> CAST(:filter_metadata AS jsonb)')
+            params["filter_metadata"] = json.dumps(filters["metadata"], ensure_ascii=False)
+
+        if filters.get("page_from") is not None:
+            conditions.append(f"({metadata_column}->'page') >= to_jsonb(CAST(:filter_page_from AS integer))")
+            params["filter_page_from"] = int(filters["page_from"])
+
+        if filters.get("page_to") is not None:
+            conditions.append(f"({metadata_column}->'page') <= to_jsonb(CAST(:filter_page_to AS integer))")
+            params["filter_page_to"] = int(filters["page_to"])
+
+        return conditions, params
+
+    async def set_search_parameters(self, session, ef_search: int, probes: int, filtered: bool):
+        await session.execute(sql_text(f'SET LOCAL hnsw.ef_search = {int(ef_search)}'))
+        await session.execute(sql_text(f'SET LOCAL ivfflat.probes = {int(probes)}'))
+
+        # filters are applied while walking the ANN index; iterative scans (pgvector >= 0.8)
+        # keep scanning until enough rows pass them instead of returning too few
+        if filtered and self.iterative_scan:
+            await session.execute(sql_text(f'SET LOCAL hnsw.iterative_scan = {self.iterative_scan}'))
+            if self.iterative_scan == "relaxed_order":
+                await session.execute(sql_text('SET LOCAL ivfflat.iterative_scan = relaxed_order'))
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list) -> bool:
+        if not record_ids or not await self.is_collection_existed(collection_name=collection_name):
+            return False
+
+        scope, scope_params = self.get_collection_scope(collection_name)
+        scope_filters = ''.join(f' AND {condition}' for condition in scope)
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    delete_sql = sql_text(f'DELETE FROM {self.get_table_name(collection_name)} '
+                                          f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids){scope_filters}')
+                    await session.execute(delete_sql, {"record_ids": list(record_ids), **scope_params})
+        except Exception as e:
+            if not self.is_undefined_table(e):
+                raise
+            self.logger.error(f"Can not delete records, collection table is missing: {collection_name}")
+            self.forget_collection(collection_name)
+            return False
+
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = True):
+        # inserts skip index maintenance until end_bulk_load builds it once
+        self.bulk_loading_collections.add(collection_name)
+
+        if drop_index:
+            _ = await self.drop_vector_index(collection_name=collection_name)
+
+        return True
+
+    async def end_bulk_load(self, collection_name: str) -> dict:
+        self.bulk_loading_collections.discard(collection_name)
+
+        start_time = time.perf_counter()
+        is_index_built = await self.create_vector_index(collection_name=collection_name)
+        build_time = time.perf_counter() - start_time
+
+        _ = await self.create_search_indexes(collection_name=collection_name)
+
+        return {
+            "index_built": bool(is_index_built),
+            "index_type": self.index_type,
+            "build_time": round(build_time, 3) if is_index_built else 0.0,
+        }
+
+    async def reset_vector_index(self, collection_name: str, 
+                                       index_type: str = None) -> bool:
+        
+        _ = await self.drop_vector_index(collection_name=collection_name)
         
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
 
@@ -197,30 +446,117 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.error(f"Can not insert new record without chunk_id: {collection_name}")
             return False
         
-        async with self.db_client() as session:
-            async with session.begin():
-                insert_sql = sql_text(f'INSERT INTO {collection_name} '
-                                      f'({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.METADATA.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                                      'VALUES (:text, :vector, :metadata, :chunk_id)'
-                                      )
-                
-                metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
-                await session.execute(insert_sql, {
-                    'text': text,
-                    'vector': "[" + ",".join([ str(v) for v in vector ]) + "]",
-                    'metadata': metadata_json,
-                    'chunk_id': record_id
-                })
-                await session.commit()
+        collection_columns = self.get_collection_columns(collection_name)
+        extra_columns = ''.join(f', {column}' for column in collection_columns)
+        extra_values = ''.join(f', :{column}' for column in collection_columns)
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    insert_sql = sql_text(f'INSERT INTO {self.get_table_name(collection_name)} '
+                                          f'({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.METADATA.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value}{extra_columns}) '
+                                          f'VALUES (:text, :vector, :metadata, :chunk_id{extra_values})'
+                                          )
+                    
+                    metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
+                    await session.execute(insert_sql, {
+                        'text': text,
+                        'vector': "[" + ",".join([ str(v) for v in vector ]) + "]",
+                        'metadata': metadata_json,
+                        'chunk_id': record_id,
+                        **collection_columns,
+                    })
+                    await session.commit()
+        except Exception as e:
+            if not self.is_undefined_table(e):
+                raise
+            self.logger.error(f"Can not insert new record, collection table is missing: {collection_name}")
+            self.forget_collection(collection_name)
+            return False
 
-                await self.create_vector_index(collection_name=collection_name)
+        if collection_name not in self.bulk_loading_collections:
+            await self.create_vector_index(collection_name=collection_name)
         
         return True
     
 
+    # types whose binary codec pgvector.asyncpg.register_vector installs
+    PGVECTOR_CODEC_TYPES = ("vector", "halfvec", "sparsevec")
+
+    async def get_driver_connection(self, session):
+        # raw asyncpg connection behind the SQLAlchemy session
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    async def reset_vector_codec(self, driver_connection):
+        """
+        Give a pooled connection back its text codec for the pgvector types: every other
+        query binds vectors as '[...]' strings, which the binary codec can not encode.
+        """
+        for type_name in self.PGVECTOR_CODEC_TYPES:
+            try:
+                await driver_connection.reset_type_codec(type_name)
+            except ValueError:
+                # type not installed by this pgvector version
+                continue
+
+    async def copy_many(self, collection_name: str, texts: list,
+                        vectors: list, metadata: list,
+                        record_ids: list, batch_size: int):
+
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+        collection_columns = self.get_collection_columns(collection_name)
+        columns += list(collection_columns)
+        extra_values = tuple(collection_columns.values())
+
+        async with self.db_client() as session:
+            driver_connection = await self.get_driver_connection(session)
+
+            # COPY is binary only: the pgvector codec is installed for this call and removed
+            # before the connection goes back to the pool; if that fails it is discarded
+            await register_vector(driver_connection)
+            try:
+                async with driver_connection.transaction():
+                    for i in range(0, len(texts), batch_size):
+                        records = (
+                            (
+                                _text,
+                                _vector,
+                                json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}",
+                                _record_id,
+                            ) + extra_values
+                            for _text, _vector, _metadata, _record_id in zip(
+                                texts[i:i + batch_size],
+                                vectors[i:i + batch_size],
+                                metadata[i:i + batch_size],
+                                record_ids[i:i + batch_size],
+                            )
+                        )
+
+                        await driver_connection.copy_records_to_table(
+                            self.get_table_name(collection_name),
+                            records=records,
+                            columns=columns,
+                        )
+            finally:
+                try:
+                    await self.reset_vector_codec(driver_connection)
+                except Exception as e:
+                    self.logger.warning(f"Can not reset the pgvector codec, dropping the connection: {e}")
+                    connection = await session.connection()
+                    await connection.invalidate()
+
+        return True
+
     async def insert_many(self, collection_name: str, texts: list,
                          vectors: list, metadata: list = None,
-                         record_ids: list = None, batch_size: int = 50):
+                         record_ids: list = None, batch_size: int = None):
         
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
@@ -233,7 +569,35 @@ class PGVectorProvider(VectorDBInterface):
         
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
-        
+
+        batch_size = batch_size if batch_size else self.insert_batch_size
+
+        write_many = self.copy_many if self.insert_mode == PgVectorInsertModeEnums.COPY.value else self.execute_many
+
+        try:
+            _ = await write_many(collection_name=collection_name, texts=texts,
+                                 vectors=vectors, metadata=metadata,
+                                 record_ids=record_ids, batch_size=batch_size)
+        except Exception as e:
+            if not self.is_undefined_table(e):
+                raise
+            self.logger.error(f"Can not insert new records, collection table is missing: {collection_name}")
+            self.forget_collection(collection_name)
+            return False
+
+        if collection_name not in self.bulk_loading_collections:
+            await self.create_vector_index(collection_name=collection_name)
+
+        return True
+
+    async def execute_many(self, collection_name: str, texts: list,
+                           vectors: list, metadata: list,
+                           record_ids: list, batch_size: int):
+
+        collection_columns = self.get_collection_columns(collection_name)
+        extra_columns = ''.join(f', {column}' for column in collection_columns)
+        extra_values = ''.join(f', :{column}' for column in collection_columns)
+
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(texts), batch_size):
@@ -251,46 +615,241 @@ class PGVectorProvider(VectorDBInterface):
                             'text': _text,
                             'vector': "[" + ",".join([ str(v) for v in _vector ]) + "]",
                             'metadata': metadata_json,
-                            'chunk_id': _record_id
+                            'chunk_id': _record_id,
+                            **collection_columns,
                         })
                     
-                    batch_insert_sql = sql_text(f'INSERT INTO {collection_name} '
+                    batch_insert_sql = sql_text(f'INSERT INTO {self.get_table_name(collection_name)} '
                                     f'({PgVectorTableSchemeEnums.TEXT.value}, '
                                     f'{PgVectorTableSchemeEnums.VECTOR.value}, '
                                     f'{PgVectorTableSchemeEnums.METADATA.value}, '
-                                    f'{PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                                    f'VALUES (:text, :vector, :metadata, :chunk_id)')
+                                    f'{PgVectorTableSchemeEnums.CHUNK_ID.value}{extra_columns}) '
+                                    f'VALUES (:text, :vector, :metadata, :chunk_id{extra_values})')
                     
                     await session.execute(batch_insert_sql, values)
 
-        await self.create_vector_index(collection_name=collection_name)
-
         return True
     
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def to_retrieved_document(self, record) -> RetrievedDocument:
+        metadata = record.metadata
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+
+        return RetrievedDocument(
+            text=record.text,
+            score=float(record.score),
+            chunk_id=record.chunk_id,
+            asset_id=record.asset_id,
+            chunk_order=record.chunk_order,
+            metadata=metadata,
+        )
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               ef_search: int = None, probes: int = None, filters: dict = None,
+                               include_text: bool = True):
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
         if not is_collection_existed:
             self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
             return False
+
+        # hnsw.ef_search below limit would cap the number of returned rows
+        ef_search = max(ef_search if ef_search else self.hnsw_ef_search, limit)
+        probes = probes if probes else self.ivfflat_probes
+
+        conditions, params = self.build_filter_conditions(filters)
+        scope, scope_params = self.get_collection_scope(collection_name)
+        conditions, params = scope + conditions, {**scope_params, **params}
+        where_clause = f' WHERE {" AND ".join(conditions)}' if conditions else ''
         
         vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
-        async with self.db_client() as session:
-            async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score'
-                                      f' FROM {collection_name}'
-                                      ' ORDER BY score DESC '
-                                      f'LIMIT {limit}'
-                                      )
-                
-                result = await session.execute(search_sql, {"vector": vector})
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.set_search_parameters(session, ef_search=ef_search, probes=probes,
+                                                     filtered=bool(conditions))
+
+                    text_column = PgVectorTableSchemeEnums.TEXT.value if include_text else 'NULL::text'
+                    chunk_id_column = PgVectorTableSchemeEnums.CHUNK_ID.value
+
+                    # ordering on the distance operator itself lets the planner use the ANN index,
+                    # the outer ORDER BY restores exact order after a relaxed iterative scan and
+                    # chunk details come from a primary key join on the rows left after LIMIT
+                    search_sql = sql_text(f'SELECT nearest.text, nearest.score, nearest.chunk_id, nearest.metadata, '
+                                          f'ch.chunk_asset_id AS asset_id, ch.chunk_order AS chunk_order FROM ('
+                                          f'SELECT {text_column} as text, 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score, '
+                                          f'{chunk_id_column} as chunk_id, {PgVectorTableSchemeEnums.METADATA.value} as metadata'
+                                          f' FROM {self.get_table_name(collection_name)}'
+                                          f'{where_clause}'
+                                          f' ORDER BY {PgVectorTableSchemeEnums.VECTOR.value} <=> :vector '
+                                          f'LIMIT {int(limit)}'
+                                          f') nearest LEFT JOIN chunks ch ON ch.chunk_id = nearest.chunk_id '
+                                          f'ORDER BY nearest.score DESC'
+                                          )
+                    
+                    result = await session.execute(search_sql, {"vector": vector, **params})
+
+                    records = result.fetchall()
+        except DBAPIError as e:
+            self.logger.error(f"Error while searching collection {collection_name}: {e}")
+            if self.is_undefined_table(e):
+                self.forget_collection(collection_name)
+            return False
 
-                records = result.fetchall()
+        return [ self.to_retrieved_document(record) for record in records ]
 
-                return [
-                    RetrievedDocument(
-                        text=record.text,
-                        score=record.score
-                    )
-                    for record in records
-                ]
+    async def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int,
+                            ef_search: int = None, probes: int = None, filters: dict = None,
+                            include_text: bool = True):
+        """
+        Vector and full-text search fused with reciprocal rank fusion in one round trip.
+        Each ranking contributes its top hybrid_candidates rows; score is the RRF score
+        sum(1 / (rrf_k + rank)) over the rankings a row appears in.
+        """
+
+        is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if not is_collection_existed:
+            self.logger.error(f"Can not search for records in a non-existed collection: {collection_name}")
+            return False
+
+        candidates = max(self.hybrid_candidates, limit)
+        ef_search = max(ef_search if ef_search else self.hnsw_ef_search, candidates)
+        probes = probes if probes else self.ivfflat_probes
+
+        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        ts_config = self.text_search_config.replace("'", "''")
+        text_vector = self.get_text_tsvector()
+
+        conditions, params = self.build_filter_conditions(filters)
+        scope, scope_params = self.get_collection_scope(collection_name)
+        join_scope, _ = self.get_collection_scope(collection_name, alias="c")
+        conditions, params = scope + conditions, {**scope_params, **params}
+        vector_where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        text_filters = ''.join(f' AND {condition}' for condition in conditions)
+        join_filters = ''.join(f' AND {condition}' for condition in join_scope)
+
+        table_name = self.get_table_name(collection_name)
+
+        id_column = PgVectorTableSchemeEnums.ID.value
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        text_column = PgVectorTableSchemeEnums.TEXT.value
+        chunk_id_column = PgVectorTableSchemeEnums.CHUNK_ID.value
+        metadata_column = PgVectorTableSchemeEnums.METADATA.value
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.set_search_parameters(session, ef_search=ef_search, probes=probes,
+                                                     filtered=bool(conditions))
+
+                    # plainto_tsquery ANDs the terms, any matching term is enough here
+                    # and ts_rank_cd ranks rows matching more of them first
+                    search_sql = sql_text(f"""
+                        WITH query AS (
+                            SELECT NULLIF(replace(plainto_tsquery('{ts_config}'::regconfig, :text)::text, ' & ', ' | '), '')::tsquery AS q
+                        ),
+                        vector_hits AS (
+                            SELECT {id_column} AS id, row_number() OVER (ORDER BY distance) AS rank
+                            FROM (
+                                SELECT {id_column}, {vector_column} <=> :vector AS distance
+                                FROM {table_name}
+                                {vector_where}
+                                ORDER BY {vector_column} <=> :vector
+                                LIMIT {int(candidates)}
+                            ) nearest
+                        ),
+                        text_hits AS (
+                            SELECT {id_column} AS id, row_number() OVER (ORDER BY text_rank DESC) AS rank
+                            FROM (
+                                SELECT {id_column}, ts_rank_cd({text_vector}, query.q) AS text_rank
+                                FROM {table_name}, query
+                                WHERE {text_vector} @@ query.q{text_filters}
+                                ORDER BY text_rank DESC
+                                LIMIT {int(candidates)}
+                            ) matched
+                        ),
+                        fused AS (
+                            SELECT id, SUM(1.0 / ({int(self.hybrid_rrf_k)} + rank)) AS score
+                            FROM (SELECT * FROM vector_hits UNION ALL SELECT * FROM text_hits) hits
+                            GROUP BY id
+                        )
+                        SELECT {f"c.{text_column}" if include_text else "NULL::text"} AS text, fused.score AS score,
+                               c.{chunk_id_column} AS chunk_id, c.{metadata_column} AS metadata,
+                               ch.chunk_asset_id AS asset_id, ch.chunk_order AS chunk_order
+                        FROM fused JOIN {table_name} c ON c.{id_column} = fused.id{join_filters}
+                        LEFT JOIN chunks ch ON ch.chunk_id = c.{chunk_id_column}
+                        ORDER BY fused.score DESC
+                        LIMIT {int(limit)}
+                    """)
+
+                    result = await session.execute(search_sql, {"vector": vector, "text": text or "", **params})
+
+                    records = result.fetchall()
+        except DBAPIError as e:
+            self.logger.error(f"Error while searching collection {collection_name}: {e}")
+            if self.is_undefined_table(e):
+                self.forget_collection(collection_name)
+            return False
+
+        return [ self.to_retrieved_document(record) for record in records ]
+
+    async def search_by_vector_many(self, collection_names: List[str], vector: list, limit: int,
+                                    ef_search: int = None, probes: int = None, filters: dict = None,
+                                    include_text: bool = True) -> dict:
+        """
+        Nearest neighbours across several collections in a single UNION ALL query.
+        Each branch keeps its own ORDER BY / LIMIT so every collection uses its ANN index;
+        returns collection_name -> results, with the best `limit` rows overall.
+        """
+        existing_collections = [
+            collection_name for collection_name in collection_names
+            if await self.is_collection_existed(collection_name=collection_name)
+        ]
+        if not existing_collections:
+            return {}
+
+        ef_search = max(ef_search if ef_search else self.hnsw_ef_search, limit)
+        probes = probes if probes else self.ivfflat_probes
+
+        conditions, params = self.build_filter_conditions(filters)
+        where_clause = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+
+        text_column = PgVectorTableSchemeEnums.TEXT.value if include_text else 'NULL::text'
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+
+        branches = [
+            f'(SELECT {idx} AS collection_idx, {text_column} AS text, 1 - ({vector_column} <=> :vector) AS score, '
+            f'{PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id, {PgVectorTableSchemeEnums.METADATA.value} AS metadata'
+            f' FROM {collection_name}{where_clause}'
+            f' ORDER BY {vector_column} <=> :vector LIMIT {int(limit)})'
+            for idx, collection_name in enumerate(existing_collections)
+        ]
+
+        vector = "[" + ",".join([ str(v) for v in vector ]) + "]"
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    await self.set_search_parameters(session, ef_search=ef_search, probes=probes,
+                                                     filtered=bool(conditions))
+
+                    search_sql = sql_text(f'SELECT hits.collection_idx, hits.text, hits.score, hits.chunk_id, hits.metadata, '
+                                          f'ch.chunk_asset_id AS asset_id, ch.chunk_order AS chunk_order FROM ('
+                                          f'{" UNION ALL ".join(branches)}'
+                                          f') hits LEFT JOIN chunks ch ON ch.chunk_id = hits.chunk_id '
+                                          f'ORDER BY hits.score DESC LIMIT {int(limit)}')
+
+                    result = await session.execute(search_sql, {"vector": vector, **params})
+                    records = result.fetchall()
+        except DBAPIError as e:
+            self.logger.error(f"Error while searching collections {existing_collections}: {e}")
+            if self.is_undefined_table(e):
+                # the missing one is not known: the others are checked again on their next use
+                for collection_name in existing_collections:
+                    self.forget_collection(collection_name)
+            return False
+
+        results = { collection_name: [] for collection_name in existing_collections }
+        for record in records:
+            results[existing_collections[record.collection_idx]].append(self.to_retrieved_document(record))
+
+        return results
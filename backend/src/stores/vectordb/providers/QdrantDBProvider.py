@@ -1,14 +1,18 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import DistanceMethodEnums
+from ..RankFusion import get_terms, reciprocal_rank_fusion, bm25_scores
 import logging
+import time
 from typing import List
 from models.db_schemes import RetrievedDocument
 
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 786,
-                                     distance_method: str = None, index_threshold: int=100):
+                                     distance_method: str = None, index_threshold: int=100,
+                                     hybrid_rrf_k: int = 60, hybrid_candidates: int = 50,
+                                     hybrid_text_scan_limit: int = 1000):
 
         self.client = None
         self.db_client = db_client
@@ -20,16 +24,40 @@ class QdrantDBProvider(VectorDBInterface):
         elif distance_method == DistanceMethodEnums.DOT.value:
             self.distance_method = models.Distance.DOT
 
+        self.hybrid_rrf_k = hybrid_rrf_k
+        self.hybrid_candidates = hybrid_candidates
+        self.hybrid_text_scan_limit = hybrid_text_scan_limit
+
         self.logger = logging.getLogger('uvicorn')
 
+        # Qdrant default, restored once a bulk load is over
+        self.default_indexing_threshold = 20000
+
+        # collections known to exist, filled at connect and kept in sync by create/delete
+        self.collections_catalog = set()
+
     async def connect(self):
         self.client = QdrantClient(path=self.db_client)
+        await self.load_collections_catalog()
 
     async def disconnect(self):
         self.client = None
+        self.collections_catalog = set()
+
+    async def load_collections_catalog(self):
+        collections = self.client.get_collections().collections
+        self.collections_catalog = set([ c.name for c in collections ])
+        return self.collections_catalog
 
     async def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        if collection_name in self.collections_catalog:
+            return True
+
+        is_existed = self.client.collection_exists(collection_name=collection_name)
+        if is_existed:
+            self.collections_catalog.add(collection_name)
+
+        return is_existed
     
     async def list_all_collections(self) -> List:
         return self.client.get_collections()
@@ -40,6 +68,7 @@ class QdrantDBProvider(VectorDBInterface):
     async def delete_collection(self, collection_name: str):
         if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
+            self.collections_catalog.discard(collection_name)
             return self.client.delete_collection(collection_name=collection_name)
         
     async def create_collection(self, collection_name: str, 
@@ -59,10 +88,31 @@ class QdrantDBProvider(VectorDBInterface):
                 )
             )
 
+            _ = self.create_text_index(collection_name=collection_name)
+
+            self.collections_catalog.add(collection_name)
+
             return True
         
         return False
     
+    def create_text_index(self, collection_name: str) -> bool:
+        """Full-text index on the chunk text used by hybrid search, added to older collections on push."""
+        payload_schema = self.client.get_collection(collection_name=collection_name).payload_schema or {}
+        if "text" in payload_schema:
+            return False
+
+        _ = self.client.create_payload_index(
+            collection_name=collection_name,
+            field_name="text",
+            field_schema=models.TextIndexParams(
+                type=models.TextIndexType.TEXT,
+                tokenizer=models.TokenizerType.WORD,
+                lowercase=True,
+            ),
+        )
+        return True
+
     async def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
                          record_id: str = None):
@@ -131,22 +181,213 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list) -> bool:
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return False
+
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+        )
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = True):
+        # indexing_threshold=0 disables HNSW building while points are uploaded
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+        )
+        return True
+
+    async def end_bulk_load(self, collection_name: str) -> dict:
+        start_time = time.perf_counter()
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(
+                indexing_threshold=self.default_indexing_threshold
+            ),
+        )
+        build_time = time.perf_counter() - start_time
+
+        _ = self.create_text_index(collection_name=collection_name)
+
+        # the HNSW graph itself is built asynchronously by the Qdrant optimizer
+        return {
+            "index_built": True,
+            "index_type": "hnsw",
+            "build_time": round(build_time, 3),
+        }
+
+    def build_filter_conditions(self, filters: dict) -> list:
+        """Translate search filters into payload conditions (asset_id and page live in the metadata payload)."""
+        conditions = []
+        if not filters:
+            return conditions
+
+        if filters.get("chunk_ids"):
+            conditions.append(models.HasIdCondition(has_id=[ int(c) for c in filters["chunk_ids"] ]))
 
+        if filters.get("asset_ids"):
+            conditions.append(models.FieldCondition(
+                key="metadata.asset_id",
+                match=models.MatchAny(any=[ int(a) for a in filters["asset_ids"] ]),
+            ))
+
+        for key, value in (filters.get("metadata") or {}).items():
+            conditions.append(models.FieldCondition(key=f"metadata.{key}", match=models.MatchValue(value=value)))
+
+        if filters.get("page_from") is not None or filters.get("page_to") is not None:
+            conditions.append(models.FieldCondition(
+                key="metadata.page",
+                range=models.Range(gte=filters.get("page_from"), lte=filters.get("page_to")),
+            ))
+
+        return conditions
+
+    @staticmethod
+    def get_payload_selector(include_text: bool = True):
+        # the chunk text is the bulk of the payload, leave it on the server when not needed
+        return True if include_text else models.PayloadSelectorExclude(exclude=["text"])
+
+    def to_retrieved_document(self, point_id, score: float, payload: dict,
+                              include_text: bool = True) -> RetrievedDocument:
+        # point ids are chunk ids, asset_id and chunk_order are stored with the vector metadata
+        metadata = payload.get("metadata") or {}
+        return RetrievedDocument(
+            text=payload.get("text") if include_text else None,
+            score=score,
+            chunk_id=int(point_id),
+            asset_id=metadata.get("asset_id"),
+            chunk_order=metadata.get("chunk_order"),
+            metadata=metadata,
+        )
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               ef_search: int = None, probes: int = None, filters: dict = None,
+                               include_text: bool = True):
+
+        conditions = self.build_filter_conditions(filters)
         results = self.client.search(
             collection_name=collection_name,
             query_vector=vector,
-            limit=limit
+            query_filter=models.Filter(must=conditions) if conditions else None,
+            limit=limit,
+            search_params=models.SearchParams(hnsw_ef=ef_search) if ef_search else None,
+            with_payload=self.get_payload_selector(include_text),
         )
 
         if not results or len(results) == 0:
             return None
         
         return [
-            RetrievedDocument(**{
-                "score": result.score,
-                "text": result.payload["text"],
-            })
+            self.to_retrieved_document(result.id, result.score, result.payload, include_text)
             for result in results
         ]
 
+    def search_text(self, collection_name: str, terms: list, conditions: list, candidates: int) -> list:
+        """
+        Point ids matching the query terms, best BM25 score first.
+
+        Qdrant only filters on full-text matches, it does not rank them: the matches are
+        scanned (points holding every term first, then any term, in id order) up to
+        hybrid_text_scan_limit and scored here, with document frequencies counted over the
+        whole collection. Beyond the scan limit, matches holding fewer of the terms may
+        be missed.
+        """
+        def term_condition(term):
+            return models.FieldCondition(key="text", match=models.MatchText(text=term))
+
+        scan_limit = max(self.hybrid_text_scan_limit, candidates)
+        scroll_filters = [ models.Filter(must=conditions + [ term_condition(term) for term in terms ]) ]
+        if len(terms) > 1:
+            scroll_filters.append(models.Filter(must=conditions or None,
+                                                should=[ term_condition(term) for term in terms ]))
+
+        texts = {}
+        for scroll_filter in scroll_filters:
+            if len(texts) >= scan_limit:
+                break
+            points, _ = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                limit=scan_limit - len(texts),
+                with_payload=["text"],
+                with_vectors=False,
+            )
+            for point in points:
+                texts.setdefault(point.id, (point.payload or {}).get("text") or "")
+
+        if not texts:
+            return []
+
+        total_docs = self.client.count(collection_name=collection_name, exact=False).count
+        doc_freqs = {
+            term: self.client.count(
+                collection_name=collection_name,
+                count_filter=models.Filter(must=[ term_condition(term) ]),
+                exact=True,
+            ).count
+            for term in terms
+        }
+
+        scores = bm25_scores(texts, terms, doc_freqs, total_docs)
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+
+        return [ point_id for point_id, score in ranked[:candidates] if score > 0 ]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int = 5,
+                            ef_search: int = None, probes: int = None, filters: dict = None,
+                            include_text: bool = True):
+        """
+        Vector search and BM25-ranked full-text matches on the text payload, fused with
+        reciprocal rank fusion; score is the RRF score.
+        """
+        candidates = max(self.hybrid_candidates, limit)
+        conditions = self.build_filter_conditions(filters)
+        payload_selector = self.get_payload_selector(include_text)
+
+        vector_results = self.client.search(
+            collection_name=collection_name,
+            query_vector=vector,
+            query_filter=models.Filter(must=conditions) if conditions else None,
+            limit=candidates,
+            search_params=models.SearchParams(hnsw_ef=max(ef_search, candidates)) if ef_search else None,
+            with_payload=payload_selector,
+        ) or []
+
+        terms = get_terms(text, max_terms=16)
+        text_ids = self.search_text(collection_name, terms, conditions, candidates) if terms else []
+
+        fused = reciprocal_rank_fusion(
+            [ [ point.id for point in vector_results ], text_ids ],
+            rrf_k=self.hybrid_rrf_k,
+        )[:limit]
+        if not fused:
+            return None
+
+        payloads = { point.id: point.payload for point in vector_results }
+        missing_ids = [ point_id for point_id, _ in fused if point_id not in payloads ]
+        if missing_ids:
+            for point in self.client.retrieve(collection_name=collection_name, ids=missing_ids,
+                                              with_payload=payload_selector, with_vectors=False):
+                payloads[point.id] = point.payload
+
+        return [
+            self.to_retrieved_document(point_id, score, payloads.get(point_id) or {}, include_text)
+            for point_id, score in fused
+        ]
+
+    async def search_by_vector_many(self, collection_names: List[str], vector: list, limit: int = 5,
+                                    ef_search: int = None, probes: int = None, filters: dict = None,
+                                    include_text: bool = True) -> dict:
+        """collection_name -> results; the local client is synchronous, collections are searched in turn."""
+        results = {}
+        for collection_name in collection_names:
+            if not await self.is_collection_existed(collection_name):
+                continue
+            results[collection_name] = await self.search_by_vector(
+                collection_name=collection_name, vector=vector, limit=limit,
+                ef_search=ef_search, probes=probes, filters=filters, include_text=include_text,
+            ) or []
+
+        return results
@@ -0,0 +1,77 @@
+from helpers.answer_cache import AnswerCache
+
+
+def store(cache, project_id, vector, answer, limit=5, generation=None):
+    return cache.store(project_id=project_id, query="q", query_vector=vector, limit=limit,
+                       answer=answer, full_prompt="prompt", chat_history=[], generation=generation)
+
+
+def test_similar_query_hits_and_other_projects_or_limits_miss():
+    cache = AnswerCache(similarity_threshold=0.95)
+    store(cache, 1, [1.0, 0.0, 0.0], "cached answer")
+
+    hit = cache.lookup(project_id=1, query_vector=[0.99, 0.05, 0.0], limit=5)
+    assert hit is not None and hit.answer == "cached answer"
+
+    assert cache.lookup(project_id=1, query_vector=[0.0, 1.0, 0.0], limit=5) is None
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0, 0.0], limit=10) is None
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0, 0.0], limit=5, search_mode="hybrid") is None
+    assert cache.lookup(project_id=2, query_vector=[1.0, 0.0, 0.0], limit=5) is None
+
+
+def test_invalidate_drops_entries_and_rejects_stale_stores():
+    cache = AnswerCache()
+    generation = cache.get_generation(project_id=1)
+    store(cache, 1, [1.0, 0.0], "old answer")
+
+    cache.invalidate(project_id=1)
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5) is None
+
+    # an answer computed before the invalidation must not be stored after it
+    assert store(cache, 1, [1.0, 0.0], "stale answer", generation=generation) is None
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5) is None
+
+
+def test_ttl_and_max_entries():
+    cache = AnswerCache(ttl=0, max_entries_per_project=2)
+    store(cache, 1, [1.0, 0.0], "a")
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5) is None
+
+    cache = AnswerCache(max_entries_per_project=2)
+    store(cache, 1, [1.0, 0.0], "a")
+    store(cache, 1, [0.0, 1.0], "b")
+    store(cache, 1, [0.7, 0.7], "c")
+    assert cache.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5) is None
+    assert cache.get_stats()["entries"] == 2
+
+
+class SharedGenerations:
+    """Stands in for ProjectModel: the projects.answer_cache_generation column."""
+
+    def __init__(self):
+        self.generations = {}
+
+    async def bump_answer_cache_generation(self, project_id):
+        self.generations[project_id] = self.generations.get(project_id, 0) + 1
+        return self.generations[project_id]
+
+
+def test_invalidation_on_another_replica_discards_entries():
+    import asyncio
+
+    shared = SharedGenerations()
+    replica_a = AnswerCache(project_model=shared)
+    replica_b = AnswerCache(project_model=shared)
+
+    generation = replica_b.get_generation(project_id=1, shared_generation=0)
+    store(replica_b, 1, [1.0, 0.0], "old answer", generation=generation)
+    assert replica_b.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5, generation=0) is not None
+
+    # a re-index job running on replica A
+    asyncio.run(replica_a.ainvalidate(project_id=1))
+
+    # replica B reads the bumped generation with the project row
+    assert replica_b.lookup(project_id=1, query_vector=[1.0, 0.0], limit=5,
+                            generation=shared.generations[1]) is None
+    # an answer computed under the old generation is not stored
+    assert store(replica_b, 1, [1.0, 0.0], "stale answer", generation=generation) is None
@@ -0,0 +1,109 @@
+import asyncio
+
+from helpers.embedding_cache import EmbeddingCache
+
+
+class InMemoryEmbeddingCacheModel:
+
+    def __init__(self):
+        self.rows = {}
+        self.touches = []
+        self.evictions = []
+
+    async def get_embeddings(self, cache_keys):
+        return { k: self.rows[k] for k in cache_keys if k in self.rows }
+
+    async def touch_embeddings(self, hits):
+        self.touches.append(dict(hits))
+        return len(hits)
+
+    async def evict_entries(self, max_entries):
+        self.evictions.append(max_entries)
+        return 0
+
+    async def insert_embeddings(self, entries):
+        for entry in entries:
+            self.rows.setdefault(entry["cache_key"], entry["embedding"])
+        return len(entries)
+
+
+class CountingEmbedder:
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+def test_repeated_and_normalized_texts_are_embedded_once():
+    cache = EmbeddingCache(model_namespace="m", embedding_model=InMemoryEmbeddingCacheModel())
+    embedder = CountingEmbedder()
+
+    vectors = asyncio.run(cache.aembed(
+        texts=["Confidential  notice", "Confidential notice\n", "other"],
+        document_type="document",
+        embed_func=embedder,
+    ))
+
+    assert embedder.calls == [["Confidential  notice", "other"]]
+    assert vectors == [[20.0], [20.0], [5.0]]
+
+    asyncio.run(cache.aembed(texts=["other"], document_type="document", embed_func=embedder))
+    assert len(embedder.calls) == 1
+    assert cache.get_stats()["memory_hits"] == 1
+
+
+def test_persistent_tier_serves_a_cold_memory_and_keys_include_document_type():
+    store = InMemoryEmbeddingCacheModel()
+    embedder = CountingEmbedder()
+
+    warm = EmbeddingCache(model_namespace="m", embedding_model=store)
+    asyncio.run(warm.aembed(texts=["question"], document_type="query", embed_func=embedder))
+
+    cold = EmbeddingCache(model_namespace="m", embedding_model=store)
+    asyncio.run(cold.aembed(texts=["question"], document_type="query", embed_func=embedder))
+    assert len(embedder.calls) == 1
+    assert cold.get_stats()["db_hits"] == 1
+
+    asyncio.run(cold.aembed(texts=["question"], document_type="document", embed_func=embedder))
+    assert len(embedder.calls) == 2
+
+    other_model = EmbeddingCache(model_namespace="other", embedding_model=store)
+    asyncio.run(other_model.aembed(texts=["question"], document_type="query", embed_func=embedder))
+    assert len(embedder.calls) == 3
+
+
+def test_failed_embedding_is_not_cached():
+    cache = EmbeddingCache(model_namespace="m", embedding_model=InMemoryEmbeddingCacheModel())
+
+    async def failing(texts):
+        return None
+
+    assert asyncio.run(cache.aembed(texts=["a"], document_type="query", embed_func=failing)) is None
+    assert cache.get_stats()["memory_items"] == 0
+
+
+def test_hits_are_written_in_batches():
+    store = InMemoryEmbeddingCacheModel()
+    embedder = CountingEmbedder()
+
+    warm = EmbeddingCache(model_namespace="m", embedding_model=store)
+    asyncio.run(warm.aembed(texts=["a", "b"], document_type="query", embed_func=embedder))
+
+    cache = EmbeddingCache(model_namespace="m", embedding_model=store,
+                           touch_batch_size=3, max_entries=100)
+    for _ in range(3):
+        asyncio.run(cache.aembed(texts=["a"], document_type="query", embed_func=embedder))
+    # one db hit then two memory hits, nothing written yet
+    assert store.touches == []
+    assert cache.get_stats()["pending_touches"] == 1
+
+    asyncio.run(cache.aembed(texts=["b", "c"], document_type="query", embed_func=embedder))
+    assert store.touches == []
+
+    asyncio.run(cache.flush_touches(force=True))
+    key_a, key_b = cache.make_key("a", "query"), cache.make_key("b", "query")
+    assert store.touches == [{key_a: 3, key_b: 1}]
+    assert store.evictions == [100]
@@ -0,0 +1,54 @@
+import asyncio
+from types import SimpleNamespace
+
+from controllers.NLPController import NLPController
+from models.db_schemes import RetrievedDocument
+
+
+class FakeEmbeddingClient:
+    embedding_size = 2
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_text(self, text, document_type=None):
+        self.calls += 1
+        return [[1.0, 0.0] for _ in text]
+
+
+class FakeVectorDBClient:
+    default_vector_size = 2
+
+    def __init__(self, scores):
+        # collection_name -> scores of its hits
+        self.scores = scores
+
+    async def search_by_vector_many(self, collection_names, vector, limit, filters=None, include_text=True):
+        return {
+            name: [ RetrievedDocument(text=f"{name}-{s}", score=s) for s in self.scores[name][:limit] ]
+            for name in collection_names if name in self.scores
+        }
+
+
+def test_federated_search_embeds_once_and_merges_by_score():
+    embedding = FakeEmbeddingClient()
+    controller = NLPController(
+        vectordb_client=FakeVectorDBClient({
+            "collection_2_1": [0.9, 0.4],
+            "collection_2_2": [0.8, 0.7],
+        }),
+        generation_client=None,
+        embedding_client=embedding,
+        template_parser=None,
+    )
+
+    results = asyncio.run(controller.search_projects_collections(
+        projects=[SimpleNamespace(project_id=1), SimpleNamespace(project_id=2), SimpleNamespace(project_id=3)],
+        text="query",
+        limit=3,
+        search_mode="vector",
+    ))
+
+    assert embedding.calls == 1
+    assert [ r.score for r in results ] == [0.9, 0.8, 0.7]
+    assert [ r.project_id for r in results ] == [1, 2, 2]
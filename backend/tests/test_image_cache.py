@@ -0,0 +1,62 @@
+import os
+import time
+
+from Extractore.image_cache import ImageTextCache
+
+
+def make_cache(tmp_path, max_size_mb=1, evict_interval=300):
+    return ImageTextCache(cache_dir=str(tmp_path), max_size_mb=max_size_mb,
+                          evict_interval=evict_interval)
+
+
+def test_same_image_model_and_mode_hit_the_same_entry(tmp_path):
+    cache = make_cache(tmp_path)
+
+    key = ImageTextCache.make_key(b"logo", model_name="pix2struct", mode="chart")
+    assert key == ImageTextCache.make_key(b"logo", model_name="pix2struct", mode="chart")
+    assert key != ImageTextCache.make_key(b"logo", model_name="pix2struct", mode="ocr")
+    assert key != ImageTextCache.make_key(b"logo", model_name="other", mode="chart")
+
+    assert cache.get(key) is None
+    cache.set(key, "TITLE | 2024")
+    assert cache.get(key) == "TITLE | 2024"
+
+
+def test_evict_removes_oldest_entries_and_keeps_writes_in_progress(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.max_size_bytes = 1000
+
+    now = time.time()
+    keys = [ ImageTextCache.make_key(bytes([i]), model_name="m", mode="ocr") for i in range(4) ]
+    for age, key in zip([40, 30, 20, 10], keys):
+        cache.set(key, "x" * 400)
+        os.utime(cache.get_path(key), (now - age, now - age))
+
+    # another process' mkstemp file, not yet renamed
+    tmp_file = os.path.join(str(tmp_path), "ab", "in-flight.tmp")
+    os.makedirs(os.path.dirname(tmp_file), exist_ok=True)
+    with open(tmp_file, "w") as f:
+        f.write("y" * 400)
+
+    # 1600 bytes of entries: the two oldest go, the temp file is neither counted nor removed
+    assert cache.evict() == 2
+    assert [ cache.get(key) is not None for key in keys ] == [False, False, True, True]
+    assert os.path.exists(tmp_file)
+
+
+def test_evict_runs_once_per_interval(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.max_size_bytes = 100
+
+    key = ImageTextCache.make_key(b"a", model_name="m", mode="ocr")
+    cache.set(key, "x" * 50)
+    assert cache.evict() == 0
+
+    # over the limit, but the last pass (of any process sharing the directory) is too recent
+    other_key = ImageTextCache.make_key(b"b", model_name="m", mode="ocr")
+    cache.set(other_key, "x" * 200)
+    other_cache = make_cache(tmp_path)
+    other_cache.max_size_bytes = 100
+    assert other_cache.evict() == 0
+
+    assert cache.evict(force=True) >= 1
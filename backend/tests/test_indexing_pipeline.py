@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+
+from controllers.NLPController import NLPController
+
+
+class FakeEmbeddingClient:
+    embedding_size = 2
+
+    def __init__(self):
+        self.calls = []
+
+    async def aembed_text(self, text, document_type=None):
+        self.calls.append(len(text))
+        return [[float(len(t)), 1.0] for t in text]
+
+
+class FakeVectorDBClient:
+    default_vector_size = 2
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.record_ids = []
+
+    async def insert_many(self, collection_name, texts, vectors, metadata=None, record_ids=None):
+        if self.fail:
+            return False
+        self.record_ids.extend(record_ids)
+        return True
+
+
+def make_chunks(start: int, count: int):
+    return [
+        SimpleNamespace(chunk_id=i, chunk_text=f"chunk {i}", chunk_metadata={}, chunk_asset_id=1,
+                        chunk_order=i)
+        for i in range(start, start + count)
+    ]
+
+
+async def batches(pages):
+    for page in pages:
+        yield page
+
+
+def make_controller(vectordb_client, embedding_client):
+    return NLPController(
+        vectordb_client=vectordb_client,
+        generation_client=None,
+        embedding_client=embedding_client,
+        template_parser=None,
+    )
+
+
+def test_pipeline_rebatches_pages_and_keeps_order():
+    vectordb = FakeVectorDBClient()
+    embedding = FakeEmbeddingClient()
+    controller = make_controller(vectordb, embedding)
+    progress = []
+
+    pages = [make_chunks(1, 5), make_chunks(6, 5), make_chunks(11, 2)]
+    inserted = asyncio.run(controller.index_project_pipelined(
+        project=SimpleNamespace(project_id=1),
+        chunks_batches=batches(pages),
+        embed_batch_size=4,
+        queue_size=1,
+        progress_callback=progress.append,
+    ))
+
+    assert inserted == 12
+    assert embedding.calls == [4, 4, 4]
+    assert vectordb.record_ids == list(range(1, 13))
+    assert sum(progress) == 12
+
+
+def test_pipeline_returns_none_when_writer_fails():
+    controller = make_controller(FakeVectorDBClient(fail=True), FakeEmbeddingClient())
+
+    inserted = asyncio.run(controller.index_project_pipelined(
+        project=SimpleNamespace(project_id=1),
+        chunks_batches=batches([make_chunks(1, 50) for _ in range(10)]),
+        embed_batch_size=8,
+        queue_size=1,
+    ))
+
+    assert inserted is None
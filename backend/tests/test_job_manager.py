@@ -0,0 +1,229 @@
+import asyncio
+import itertools
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from stores.jobs.JobManager import JobManager
+from stores.jobs.providers import LocalJobBroker
+
+
+class InMemoryIdempotencyManager:
+    """Same contract as helpers.idempotency_manager.IdempotencyManager, without a database."""
+
+    def __init__(self):
+        self.records = {}
+        self.ids = itertools.count(1)
+
+    async def should_execute_task(self, task_name, task_args, celery_task_id=None,
+                                  task_time_limit=600, success_ttl=None):
+        matches = [
+            r for r in self.records.values()
+            if r.task_name == task_name and r.task_args == task_args
+        ]
+        if not matches:
+            return True, None
+
+        existing = matches[-1]
+        if existing.status in ("PENDING", "STARTED"):
+            return False, existing
+        if existing.status == "SUCCESS":
+            return success_ttl == 0, existing
+        return True, existing
+
+    async def claim_task_record(self, task_name, task_args, celery_task_id=None):
+        for record in self.records.values():
+            if (record.task_name == task_name and record.task_args == task_args
+                    and record.status in ("PENDING", "STARTED")):
+                return record, False
+
+        record = SimpleNamespace(
+            execution_id=next(self.ids), task_name=task_name, task_args=task_args,
+            celery_task_id=celery_task_id, status="PENDING", result=None,
+            created_at=datetime.now(timezone.utc), started_at=None, completed_at=None,
+        )
+        self.records[record.execution_id] = record
+        return record, True
+
+    async def expire_task(self, execution_id, reason="task stalled"):
+        record = self.records[execution_id]
+        if record.status not in ("PENDING", "STARTED"):
+            return False
+        record.status = "FAILURE"
+        record.result = {"error": reason}
+        return True
+
+    async def update_task_status(self, execution_id, status, result=None):
+        record = self.records[execution_id]
+        record.status = status
+        if result:
+            record.result = result
+
+    async def update_task_progress(self, execution_id, progress):
+        self.records[execution_id].result = {"progress": progress}
+
+    async def get_task_record(self, celery_task_id):
+        for record in self.records.values():
+            if record.celery_task_id == celery_task_id:
+                return record
+        return None
+
+
+async def wait_for_status(manager, job_id, statuses, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        record = await manager.get_job(job_id)
+        if record.status in statuses:
+            return record
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {statuses}")
+
+
+def make_manager(**kwargs):
+    return JobManager(
+        broker=LocalJobBroker(),
+        idempotency_manager=InMemoryIdempotencyManager(),
+        workers=2,
+        progress_interval=0,
+        **kwargs,
+    )
+
+
+def test_job_runs_and_reports_progress():
+    manager = make_manager()
+
+    async def handler(task_args, progress):
+        await progress.report(done=0, total=task_args["items"], stage="work", force=True)
+        for _ in range(task_args["items"]):
+            await progress.advance(1)
+        return {"processed": task_args["items"]}
+
+    async def run():
+        manager.register_handler("work", handler)
+        await manager.start()
+        try:
+            record, is_new = await manager.submit("work", {"items": 3})
+            return is_new, await wait_for_status(manager, record.celery_task_id, {"SUCCESS", "FAILURE"})
+        finally:
+            await manager.stop()
+
+    is_new, record = asyncio.run(run())
+
+    assert is_new
+    assert record.status == "SUCCESS"
+    assert record.result["processed"] == 3
+    assert record.result["progress"] == {"stage": "work", "done": 3, "total": 3}
+
+
+def test_identical_submission_is_deduplicated_while_running():
+    manager = make_manager()
+    release = None
+    calls = []
+
+    async def handler(task_args, progress):
+        calls.append(task_args)
+        await release.wait()
+        return {}
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        manager.register_handler("work", handler)
+        await manager.start()
+        try:
+            first, first_new = await manager.submit("work", {"project_id": 1})
+            second, second_new = await manager.submit("work", {"project_id": 1})
+            other, other_new = await manager.submit("work", {"project_id": 2})
+            release.set()
+            await wait_for_status(manager, first.celery_task_id, {"SUCCESS"})
+            await wait_for_status(manager, other.celery_task_id, {"SUCCESS"})
+            return (first, first_new), (second, second_new), other_new
+        finally:
+            await manager.stop()
+
+    (first, first_new), (second, second_new), other_new = asyncio.run(run())
+
+    assert first_new and other_new
+    assert not second_new
+    assert second.celery_task_id == first.celery_task_id
+    assert len(calls) == 2
+
+
+def test_failing_handler_marks_job_failed():
+    manager = make_manager()
+
+    async def handler(task_args, progress):
+        raise RuntimeError("boom")
+
+    async def run():
+        manager.register_handler("work", handler)
+        await manager.start()
+        try:
+            record, _ = await manager.submit("work", {})
+            return await wait_for_status(manager, record.celery_task_id, {"SUCCESS", "FAILURE"})
+        finally:
+            await manager.stop()
+
+    record = asyncio.run(run())
+
+    assert record.status == "FAILURE"
+    assert record.result["error"] == "boom"
+
+
+def test_finished_job_is_not_deduplicated_by_default():
+    manager = make_manager()
+    calls = []
+
+    async def handler(task_args, progress):
+        calls.append(task_args)
+        return {}
+
+    async def run():
+        manager.register_handler("work", handler)
+        await manager.start()
+        try:
+            first, _ = await manager.submit("work", {"project_id": 1})
+            await wait_for_status(manager, first.celery_task_id, {"SUCCESS"})
+            second, second_new = await manager.submit("work", {"project_id": 1})
+            await wait_for_status(manager, second.celery_task_id, {"SUCCESS"})
+            return first, second, second_new
+        finally:
+            await manager.stop()
+
+    first, second, second_new = asyncio.run(run())
+
+    # e.g. a re-index after new uploads must run again
+    assert second_new
+    assert second.celery_task_id != first.celery_task_id
+    assert len(calls) == 2
+
+
+def test_concurrent_submissions_enqueue_once():
+    manager = make_manager()
+    release = None
+    calls = []
+
+    async def handler(task_args, progress):
+        calls.append(task_args)
+        await release.wait()
+        return {}
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        manager.register_handler("work", handler)
+        await manager.start()
+        try:
+            submissions = await asyncio.gather(*[
+                manager.submit("work", {"project_id": 1}) for _ in range(5)
+            ])
+            release.set()
+            await wait_for_status(manager, submissions[0][0].celery_task_id, {"SUCCESS"})
+            return submissions
+        finally:
+            await manager.stop()
+
+    submissions = asyncio.run(run())
+
+    assert sum(1 for _, is_new in submissions if is_new) == 1
+    assert len({ record.celery_task_id for record, _ in submissions }) == 1
+    assert len(calls) == 1
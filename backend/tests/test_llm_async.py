@@ -0,0 +1,93 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from stores.llm.providers.OpenAIProvider import OpenAIProvider
+
+
+STUB_DELAY = 0.5
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible server: every call sleeps STUB_DELAY seconds."""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        _ = self.rfile.read(length)
+        time.sleep(STUB_DELAY)
+
+        if self.path.endswith("/chat/completions"):
+            body = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "stub-model",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "stub answer"},
+                    "finish_reason": "stop",
+                }],
+            }
+        else:
+            body = {
+                "object": "list",
+                "model": "stub-embedding",
+                "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2, 0.3]}],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+def test_agenerate_text_runs_requests_concurrently(stub_server):
+    provider = OpenAIProvider(api_key="sk-test", api_url=stub_server)
+    provider.set_generation_model("stub-model")
+
+    async def run():
+        start = time.perf_counter()
+        answers = await asyncio.gather(*[
+            provider.agenerate_text(prompt=f"question {i}", chat_history=[])
+            for i in range(5)
+        ])
+        elapsed = time.perf_counter() - start
+        await provider.aclose()
+        return answers, elapsed
+
+    answers, elapsed = asyncio.run(run())
+
+    assert answers == ["stub answer"] * 5
+    # sequential calls would take 5 * STUB_DELAY
+    assert elapsed < 3 * STUB_DELAY
+
+
+def test_aembed_text_returns_vectors(stub_server):
+    provider = OpenAIProvider(api_key="sk-test", api_url=stub_server)
+    provider.set_embedding_model("stub-embedding", embedding_size=3)
+
+    async def run():
+        vectors = await provider.aembed_text("hello")
+        await provider.aclose()
+        return vectors
+
+    assert asyncio.run(run()) == [[0.1, 0.2, 0.3]]
@@ -0,0 +1,83 @@
+import asyncio
+
+from stores.vectordb.providers import PGVectorPartitionedProvider
+
+
+class FakeResult:
+    def scalar_one_or_none(self):
+        return None
+
+    def scalar_one(self):
+        return 0
+
+    def fetchall(self):
+        return []
+
+
+class FakeSession:
+    def __init__(self, statements):
+        self.statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin(self):
+        return self
+
+    async def commit(self):
+        pass
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params or {}))
+        return FakeResult()
+
+
+def make_provider(statements, partitions=4):
+    return PGVectorPartitionedProvider(
+        db_client=lambda: FakeSession(statements),
+        partitions=partitions,
+        distance_method="cosine",
+        default_vector_size=384,
+    )
+
+
+def test_collections_share_one_partitioned_table():
+    statements = []
+    provider = make_provider(statements)
+
+    async def run():
+        assert await provider.create_collection("collection_384_1", embedding_size=384)
+        assert await provider.create_collection("collection_384_2", embedding_size=384)
+
+    asyncio.run(run())
+
+    assert provider.get_table_name("collection_384_1") == "pgvector_shared_384"
+    assert provider.get_table_name("collection_384_2") == "pgvector_shared_384"
+
+    # the shared table and its partitions are created once
+    ddl = [ sql for sql, _ in statements if sql.startswith("CREATE TABLE") ]
+    assert len(ddl) == 1 + 4
+    assert "PARTITION BY HASH (collection)" in ddl[0]
+
+    registered = [ params["collection_name"] for sql, params in statements if "INSERT INTO pgvector_collections" in sql ]
+    assert registered == ["collection_384_1", "collection_384_2"]
+
+
+def test_search_is_scoped_to_the_collection():
+    statements = []
+    provider = make_provider(statements)
+    provider.collection_tables["collection_384_1"] = "pgvector_shared_384"
+    provider.collections_catalog.add("collection_384_1")
+
+    results = asyncio.run(provider.search_by_vector("collection_384_1", vector=[0.1] * 384, limit=5))
+    assert results == []
+
+    search_sql, params = statements[-1]
+    assert "FROM pgvector_shared_384 WHERE collection = :scope_collection" in search_sql
+    assert params["scope_collection"] == "collection_384_1"
+
+    # the collection condition filters the ANN scan, iterative scan is enabled
+    assert any("hnsw.iterative_scan" in sql for sql, _ in statements)
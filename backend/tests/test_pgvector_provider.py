@@ -0,0 +1,145 @@
+import asyncio
+
+from stores.vectordb.providers import PGVectorProvider
+
+
+class FakeDataError(Exception):
+    pass
+
+
+class FakeDriverConnection:
+    """asyncpg connection: a binary codec set on a type stays until it is reset."""
+
+    def __init__(self):
+        self.binary_types = set()
+        self.copied_rows = []
+
+    async def set_type_codec(self, typename, schema="public", encoder=None, decoder=None, format="text"):
+        if typename != "vector":
+            raise ValueError(f"unknown type: {schema}.{typename}")
+        self.binary_types.add(typename)
+
+    async def reset_type_codec(self, typename, schema="public"):
+        if typename != "vector":
+            raise ValueError(f"unknown type: {schema}.{typename}")
+        self.binary_types.discard(typename)
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        assert "vector" in self.binary_types, "COPY needs the binary vector codec"
+        self.copied_rows.extend(records)
+
+
+class FakeTransaction:
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeResult:
+
+    def fetchall(self):
+        return []
+
+
+class FakeRawConnection:
+
+    def __init__(self, driver_connection):
+        self.driver_connection = driver_connection
+        self.info = {}
+
+
+class FakeConnection:
+
+    def __init__(self, driver_connection):
+        self.raw_connection = FakeRawConnection(driver_connection)
+
+    async def get_raw_connection(self):
+        return self.raw_connection
+
+    async def invalidate(self):
+        pass
+
+
+class FakeSession:
+    """Every session checks out the same pooled connection."""
+
+    def __init__(self, driver_connection):
+        self.driver_connection = driver_connection
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin(self):
+        return self
+
+    async def connection(self):
+        return FakeConnection(self.driver_connection)
+
+    async def execute(self, statement, params=None):
+        vector = (params or {}).get("vector")
+        if isinstance(vector, str) and "vector" in self.driver_connection.binary_types:
+            # what Vector._to_db_binary does with a '[...]' string
+            raise FakeDataError("invalid input for query argument $1 (expected a list or array)")
+        return FakeResult()
+
+
+def test_search_after_copy_on_the_same_pooled_connection():
+    driver_connection = FakeDriverConnection()
+    provider = PGVectorProvider(db_client=lambda: FakeSession(driver_connection),
+                                distance_method="cosine", insert_mode="copy")
+    provider.collections_catalog.add("collection_3_1")
+    provider.bulk_loading_collections.add("collection_3_1")
+
+    async def run():
+        assert await provider.insert_many("collection_3_1", texts=["a", "b"],
+                                          vectors=[[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]],
+                                          record_ids=[1, 2])
+        return await provider.search_by_vector("collection_3_1", vector=[0.1, 0.2, 0.3], limit=5)
+
+    assert asyncio.run(run()) == []
+    assert len(driver_connection.copied_rows) == 2
+    assert driver_connection.binary_types == set()
+
+
+class FakeDriverError(Exception):
+
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+class FailingSession(FakeSession):
+
+    def __init__(self, error):
+        super().__init__(FakeDriverConnection())
+        self.error = error
+
+    async def execute(self, statement, params=None):
+        if "SET LOCAL" in str(statement):
+            return FakeResult()
+        raise self.error
+
+
+def test_search_errors_only_evict_missing_tables():
+    from sqlalchemy.exc import DataError, ProgrammingError
+
+    def search_with(error):
+        provider = PGVectorProvider(db_client=lambda: FailingSession(error), distance_method="cosine")
+        provider.collections_catalog.add("collection_3_1")
+        result = asyncio.run(provider.search_by_vector("collection_3_1", vector=[0.1, 0.2, 0.3], limit=5))
+        return result, "collection_3_1" in provider.collections_catalog
+
+    # a bad filter cast or a syntax error does not make the collection disappear
+    assert search_with(DataError("SELECT", {}, FakeDriverError("22P02"))) == (False, True)
+    assert search_with(ProgrammingError("SELECT", {}, FakeDriverError("42601"))) == (False, True)
+
+    assert search_with(ProgrammingError("SELECT", {}, FakeDriverError("42P01"))) == (False, False)
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from stores.llm.PromptBuilder import RAGPromptBuilder
+
+
+class FakeTemplateParser:
+    templates = {
+        "system_prompt": "system",
+        "document_prompt": "doc $doc_num : $chunk_text",
+        "footer_prompt": "question : $query",
+    }
+
+    def get(self, group, key, vars={}):
+        text = self.templates[key]
+        for name, value in vars.items():
+            text = text.replace(f"${name}", str(value))
+        return text
+
+    def render_many(self, group, key, vars_list):
+        return [ self.get(group, key, vars) for vars in vars_list ]
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def make_builder(max_prompt_tokens, min_document_tokens=3):
+    return RAGPromptBuilder(template_parser=FakeTemplateParser(), count_tokens=count_words,
+                            max_prompt_tokens=max_prompt_tokens,
+                            min_document_tokens=min_document_tokens, dedup_threshold=0.9)
+
+
+def make_doc(text, score):
+    return SimpleNamespace(text=text, score=score)
+
+
+def test_documents_fit_budget_best_score_first():
+    documents = [
+        make_doc(" ".join(f"low{i}" for i in range(10)), 0.1),
+        make_doc(" ".join(f"high{i}" for i in range(10)), 0.9),
+        make_doc(" ".join(f"mid{i}" for i in range(10)), 0.5),
+    ]
+
+    prompt = make_builder(max_prompt_tokens=30).build(query="what", documents=documents)
+
+    assert [ d.score for d in prompt.documents ] == [0.9, 0.5]
+    assert prompt.truncated_documents == 1
+    assert prompt.dropped_documents == 1
+    assert prompt.prompt_tokens <= 30
+    assert prompt.full_prompt.startswith("doc 1 : high0")
+
+
+def test_near_duplicates_are_skipped():
+    text = " ".join(f"word{i}" for i in range(20))
+    documents = [make_doc(text, 0.9), make_doc(text + " extra", 0.8), make_doc("other text", 0.7)]
+
+    prompt = make_builder(max_prompt_tokens=1000).build(query="what", documents=documents)
+
+    assert prompt.duplicate_documents == 1
+    assert [ d.score for d in prompt.documents ] == [0.9, 0.7]
@@ -0,0 +1,35 @@
+from stores.vectordb.RankFusion import get_terms, reciprocal_rank_fusion, bm25_scores
+
+
+def test_rrf_rewards_ids_ranked_by_both_rankings():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4, 1]], rrf_k=60)
+
+    ids = [ item_id for item_id, _ in fused ]
+    # 1 is first and third, 3 third and first: both beat single-ranking ids
+    assert set(ids[:2]) == {1, 3}
+    assert ids[2:] == [2, 4]
+
+    scores = dict(fused)
+    assert abs(scores[1] - (1 / 61 + 1 / 63)) < 1e-12
+    assert abs(scores[4] - 1 / 62) < 1e-12
+
+
+def test_rrf_of_empty_rankings():
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_bm25_prefers_rare_terms_and_short_documents():
+    texts = {
+        1: "invoice total amount due before the end of the month",
+        2: "the the the invoice",
+        3: "qwanza invoice",
+        4: "unrelated text",
+    }
+    terms = get_terms("Qwanza invoice")
+    scores = bm25_scores(texts, terms, doc_freqs={"qwanza": 1, "invoice": 300}, total_docs=1000)
+
+    ranked = sorted(scores, key=lambda item_id: -scores[item_id])
+    assert ranked[0] == 3
+    assert scores[4] == 0
+    # same single term match, the shorter document scores higher
+    assert scores[2] > scores[1] > 0
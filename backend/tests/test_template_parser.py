@@ -0,0 +1,30 @@
+import pytest
+
+from stores.llm.templates.template_parser import TemplateParser
+
+
+def test_templates_are_preloaded_and_read_only():
+    parser = TemplateParser(language="en")
+
+    assert "rag" in parser.templates
+    with pytest.raises(TypeError):
+        parser.templates["rag"]["document_prompt"] = None
+
+
+def test_get_and_render_many_match():
+    parser = TemplateParser(language="en")
+    vars_list = [ {"doc_num": i, "chunk_text": f"text {i}"} for i in range(1, 4) ]
+
+    rendered = parser.render_many("rag", "document_prompt", vars_list)
+
+    assert rendered == [ parser.get("rag", "document_prompt", vars) for vars in vars_list ]
+    assert "text 2" in rendered[1]
+
+
+def test_unknown_language_key_or_group_fall_back():
+    parser = TemplateParser(language="xx", default_language="en")
+
+    assert parser.language == "en"
+    assert parser.get("rag", "missing_key") is None
+    assert parser.get("missing_group", "system_prompt") is None
+    assert parser.render_many("missing_group", "system_prompt", [{}]) is None
@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from helpers.token_chunker import TokenChunker
+
+
+class WhitespaceTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+
+def make_page(text, page):
+    return SimpleNamespace(page_content=text, metadata={"source": "doc.pdf", "page": page})
+
+
+def make_chunker(chunk_size, overlap_size):
+    return TokenChunker(chunk_size=chunk_size, overlap_size=overlap_size, tokenizer=WhitespaceTokenizer())
+
+
+def test_chunks_respect_token_budget_and_overlap():
+    words = [f"w{i}" for i in range(50)]
+    pages = [make_page(" ".join(words[i:i + 5]) + ".", page=0) for i in range(0, 50, 5)]
+
+    chunks = list(make_chunker(chunk_size=20, overlap_size=5).iter_chunks(pages))
+
+    assert len(chunks) > 1
+    assert all(len(text.split()) <= 20 for text, _ in chunks)
+    for (previous, _), (current, _) in zip(chunks, chunks[1:]):
+        assert current.split()[:5] == previous.split()[-5:]
+
+
+def test_chunks_keep_page_metadata():
+    pages = [make_page("one two three four.", page=0), make_page("five six seven eight.", page=1)]
+
+    chunks = list(make_chunker(chunk_size=6, overlap_size=0).iter_chunks(pages))
+
+    assert chunks[0][1]["page"] == 0
+    assert chunks[0][1]["source"] == "doc.pdf"
+    assert chunks[-1][1]["page"] == 1
+
+
+def test_long_sentence_is_split_on_words():
+    pages = [make_page(" ".join(["word"] * 25), page=0)]
+
+    chunks = list(make_chunker(chunk_size=10, overlap_size=0).iter_chunks(pages))
+
+    assert [len(text.split()) for text, _ in chunks] == [10, 10, 5]
+
+
+def test_pages_are_consumed_lazily():
+    consumed = []
+
+    def pages():
+        for i in range(100):
+            consumed.append(i)
+            yield make_page(" ".join(["word"] * 10), page=i)
+
+    first_text, _ = next(make_chunker(chunk_size=10, overlap_size=0).iter_chunks(pages()))
+
+    assert len(first_text.split()) == 10
+    assert len(consumed) < 5